@@ -0,0 +1,464 @@
+"""Sliding-window entity counters for event context."""
+
+import calendar
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.event import Event
+
+WINDOW_1H = 60  # minutes
+WINDOW_24H = 24 * 60  # minutes
+
+# (dimension, window in minutes) pairs tracked by the engine
+COUNTER_WINDOWS = [
+    ("source_ip", WINDOW_1H),
+    ("source_ip", WINDOW_24H),
+    ("destination_ip", WINDOW_1H),
+    ("user", WINDOW_1H),
+    ("event_type", WINDOW_1H),
+]
+
+
+def _epoch_minute(dt: Optional[datetime]) -> int:
+    """Convert a naive UTC datetime to minutes since the epoch."""
+    dt = dt or datetime.utcnow()
+    return calendar.timegm(dt.utctimetuple()) // 60
+
+
+def _dimension_value(event: Event, dimension: str) -> Optional[str]:
+    """Get the entity key of an event for a dimension."""
+    value = getattr(event, dimension, None)
+    if value is None:
+        return None
+    return value.value if hasattr(value, "value") else str(value)
+
+
+class SlidingWindowCounter:
+    """Per-minute buckets over a fixed window with a running total.
+
+    Only non-empty minutes are stored, so an entity seen a few times costs a
+    few buckets rather than a full ring. Expiring old buckets is amortized
+    O(1) per bucket and reads are O(1).
+    """
+
+    __slots__ = ("window", "buckets", "total")
+
+    def __init__(self, window: int):
+        """Initialize counter with a window size in minutes."""
+        self.window = window
+        self.buckets = deque()  # [minute, count] in ascending minute order
+        self.total = 0
+
+    def add(self, minute: int, now_minute: int, count: int = 1):
+        """Count events in the bucket for ``minute``."""
+        self._expire(now_minute)
+        if minute <= now_minute - self.window:
+            return
+
+        if not self.buckets or self.buckets[-1][0] < minute:
+            self.buckets.append([minute, count])
+        elif self.buckets[-1][0] == minute:
+            self.buckets[-1][1] += count
+        else:
+            # Late event: find its bucket walking back from the newest one
+            for index in range(len(self.buckets) - 1, -1, -1):
+                bucket_minute = self.buckets[index][0]
+                if bucket_minute == minute:
+                    self.buckets[index][1] += count
+                    break
+                if bucket_minute < minute:
+                    self.buckets.insert(index + 1, [minute, count])
+                    break
+            else:
+                self.buckets.appendleft([minute, count])
+        self.total += count
+
+    def count(self, now_minute: int) -> int:
+        """Get the number of events in the window ending at ``now_minute``."""
+        self._expire(now_minute)
+        return self.total
+
+    def _expire(self, now_minute: int):
+        """Drop buckets that fell out of the window."""
+        cutoff = now_minute - self.window
+        while self.buckets and self.buckets[0][0] <= cutoff:
+            self.total -= self.buckets.popleft()[1]
+
+
+class ContextEngine:
+    """In-memory entity counters answering event context lookups in O(1).
+
+    Events are observed as they are processed and counted per source IP,
+    destination IP, user and event type in 1 hour (and 24 hours for source
+    IPs) sliding windows keyed by ``created_at``. Counts only cover events
+    observed by this process, so ``warm_start`` rebuilds them from the last
+    24 hours of events before the engine is used. Events handled by other
+    processes after that are never counted: with more than one worker
+    process the counts fall behind the database, so use the engine only with
+    a single worker process and ``RedisContextProvider`` otherwise.
+    """
+
+    def __init__(self, max_tracked_ids: int = 100000, sweep_interval: int = 10):
+        """Initialize the context engine."""
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, int], Dict[str, SlidingWindowCounter]] = {
+            key: {} for key in COUNTER_WINDOWS
+        }
+        # Recently observed ids so an event is never counted twice
+        self._seen_ids = set()
+        self._seen_order = deque()
+        self.max_tracked_ids = max_tracked_ids
+        self.sweep_interval = sweep_interval  # minutes between idle sweeps
+        self._last_sweep = _epoch_minute(None)
+        self.is_warm = False
+
+    def observe(self, event: Event) -> bool:
+        """Count an event. Returns False if it was already counted."""
+        with self._lock:
+            return self._observe(
+                event.id,
+                _epoch_minute(event.created_at),
+                {
+                    dimension: _dimension_value(event, dimension)
+                    for dimension, _ in COUNTER_WINDOWS
+                },
+            )
+
+    def get_context(self, event: Event) -> Dict[str, Any]:
+        """Get event context in the same shape as ``_get_event_context``."""
+        now_minute = _epoch_minute(None)
+        with self._lock:
+
+            def count(dimension: str, window: int) -> int:
+                value = _dimension_value(event, dimension)
+                if value is None:
+                    return 0
+                counter = self._counters[(dimension, window)].get(value)
+                return counter.count(now_minute) if counter else 0
+
+            # The event itself is in the type count if it was observed
+            # inside the last hour; similar events exclude it
+            similar = count("event_type", WINDOW_1H)
+            if (
+                event.id in self._seen_ids
+                and _epoch_minute(event.created_at) > now_minute - WINDOW_1H
+            ):
+                similar -= 1
+
+            return {
+                "source_ip_count": count("source_ip", WINDOW_1H) or 1,
+                "source_ip_count_24h": count("source_ip", WINDOW_24H) or 1,
+                "destination_ip_count": count("destination_ip", WINDOW_1H) or 1,
+                "user_count": count("user", WINDOW_1H) or 1,
+                "similar_events_count": max(similar, 0),
+            }
+
+    def lookup(self, event: Event) -> Dict[str, Any]:
+        """Count an event and return its context."""
+        self.observe(event)
+        return self.get_context(event)
+
+    def lookup_many(self, events) -> List[Dict[str, Any]]:
+        """Count events and return their contexts."""
+        for event in events:
+            self.observe(event)
+        return [self.get_context(event) for event in events]
+
+    def warm_start(self, db: Session, hours: int = 24) -> int:
+        """Rebuild the counters from recent events. Returns events loaded."""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        rows = (
+            db.query(
+                Event.id,
+                Event.created_at,
+                Event.source_ip,
+                Event.destination_ip,
+                Event.user,
+                Event.event_type,
+            )
+            .filter(Event.created_at >= since)
+            .execution_options(yield_per=5000)
+        )
+
+        loaded = 0
+        with self._lock:
+            self.reset()
+            for row in rows:
+                values = {
+                    "source_ip": row.source_ip,
+                    "destination_ip": row.destination_ip,
+                    "user": row.user,
+                    "event_type": row.event_type.value if row.event_type else None,
+                }
+                if self._observe(row.id, _epoch_minute(row.created_at), values):
+                    loaded += 1
+            self.is_warm = True
+
+        print(f"Context engine warmed with {loaded} events")
+        return loaded
+
+    def reset(self):
+        """Drop all counters."""
+        for counters in self._counters.values():
+            counters.clear()
+        self._seen_ids.clear()
+        self._seen_order.clear()
+        self.is_warm = False
+
+    def _observe(
+        self, event_id: Optional[int], minute: int, values: Dict[str, Optional[str]]
+    ) -> bool:
+        """Count one event. Caller must hold the lock."""
+        if event_id is not None:
+            if event_id in self._seen_ids:
+                return False
+            self._seen_ids.add(event_id)
+            self._seen_order.append(event_id)
+            if len(self._seen_order) > self.max_tracked_ids:
+                self._seen_ids.discard(self._seen_order.popleft())
+
+        now_minute = _epoch_minute(None)
+        for (dimension, window), counters in self._counters.items():
+            value = values.get(dimension)
+            if value is None or minute <= now_minute - window:
+                continue
+            counter = counters.get(value)
+            if counter is None:
+                counter = counters[value] = SlidingWindowCounter(window)
+            counter.add(minute, now_minute)
+
+        if now_minute - self._last_sweep >= self.sweep_interval:
+            self._sweep(now_minute)
+        return True
+
+    def _sweep(self, now_minute: int):
+        """Forget entities with no events left in their window."""
+        for counters in self._counters.values():
+            idle = [key for key, c in counters.items() if not c.count(now_minute)]
+            for key in idle:
+                del counters[key]
+        self._last_sweep = now_minute
+
+
+class RedisContextProvider:
+    """Entity counters shared by all processes through Redis.
+
+    Every minute has one hash of ``dimension:value`` counters and every hour
+    one hash of source IP counters, both expiring with their window. A lookup
+    reads the 60 minute hashes and 25 hour hashes in pipelined calls, so the
+    cost does not depend on the size of the ``events`` table. A bitmap
+    of event ids makes counting idempotent across workers. The 24 hour source
+    IP count is exact to the hour and interpolates the oldest hour.
+    """
+
+    DIMENSIONS = ["source_ip", "destination_ip", "user", "event_type"]
+    HOURS_24H = 24
+
+    def __init__(self, redis_url: Optional[str] = None, prefix: str = "csirt:ctx"):
+        """Initialize the provider."""
+        import redis
+
+        self.redis = redis.from_url(redis_url or settings.REDIS_URL)
+        self.prefix = prefix
+        self._warm = False
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether the shared counters have been backfilled."""
+        if not self._warm:
+            self._warm = bool(self.redis.exists(self._key("warm")))
+        return self._warm
+
+    def lookup(self, event: Event) -> Dict[str, Any]:
+        """Count an event and return its context."""
+        return self.lookup_many([event])[0]
+
+    def lookup_many(self, events, chunk_size: int = 200) -> List[Dict[str, Any]]:
+        """Count events and return their contexts.
+
+        The whole batch is counted before any context is read, so every
+        context includes the rest of the batch, as it does when the batch is
+        counted in the database after it was stored. Each step takes one
+        round trip per chunk of events.
+        """
+        batch = [
+            (event.id, _epoch_minute(event.created_at), self._fields(event))
+            for event in events
+            if event.id is not None
+        ]
+        for start in range(0, len(batch), chunk_size):
+            self._backfill(batch[start : start + chunk_size])
+
+        contexts = []
+        for start in range(0, len(events), chunk_size):
+            contexts.extend(self._read_chunk(events[start : start + chunk_size]))
+        return contexts
+
+    def _read_chunk(self, events) -> List[Dict[str, Any]]:
+        """Read the windows of a chunk of counted events."""
+        now = int(time.time()) // 60
+        oldest_hour = now // 60 - self.HOURS_24H
+        items = [(e, _epoch_minute(e.created_at), self._fields(e)) for e in events]
+
+        pipe = self.redis.pipeline(transaction=False)
+        for _, _, fields in items:
+            for m in range(now - WINDOW_1H + 1, now + 1):
+                pipe.hmget(
+                    self._key("m", m), [fields[d] or "-" for d in self.DIMENSIONS]
+                )
+            for h in range(oldest_hour, now // 60 + 1):
+                pipe.hget(self._key("h", h), fields["source_ip"] or "-")
+        reads = pipe.execute()
+
+        step = WINDOW_1H + self.HOURS_24H + 1
+        contexts = []
+        for index, (event, minute, fields) in enumerate(items):
+            chunk = reads[index * step : (index + 1) * step]
+            totals = dict.fromkeys(self.DIMENSIONS, 0)
+            for values in chunk[:WINDOW_1H]:
+                for dimension, value in zip(self.DIMENSIONS, values):
+                    if fields[dimension]:
+                        totals[dimension] += int(value or 0)
+
+            source_ip_24h = 0
+            if fields["source_ip"]:
+                # The oldest hour is only partly inside the window; weight it
+                # by the part that is, as in a sliding-window rate limiter
+                oldest, *hours = [int(value or 0) for value in chunk[WINDOW_1H:]]
+                source_ip_24h = sum(hours) + round(oldest * (60 - now % 60) / 60)
+
+            similar = totals["event_type"]
+            if event.id is not None and minute > now - WINDOW_1H:
+                similar -= 1
+
+            contexts.append(
+                {
+                    "source_ip_count": totals["source_ip"] or 1,
+                    "source_ip_count_24h": source_ip_24h or 1,
+                    "destination_ip_count": totals["destination_ip"] or 1,
+                    "user_count": totals["user"] or 1,
+                    "similar_events_count": max(similar, 0),
+                }
+            )
+        return contexts
+
+    def warm_start(self, db: Session, hours: int = 24) -> int:
+        """Backfill the shared counters from recent events, once per cluster."""
+        if self.is_warm:
+            return 0
+        if not self.redis.set(self._key("warm_lock"), 1, nx=True, ex=600):
+            return 0  # Another worker is backfilling
+
+        try:
+            since = datetime.utcnow() - timedelta(hours=hours)
+            rows = (
+                db.query(
+                    Event.id,
+                    Event.created_at,
+                    Event.source_ip,
+                    Event.destination_ip,
+                    Event.user,
+                    Event.event_type,
+                )
+                .filter(Event.created_at >= since)
+                .execution_options(yield_per=5000)
+            )
+
+            loaded = 0
+            batch = []
+            for row in rows:
+                batch.append((row.id, _epoch_minute(row.created_at), self._fields(row)))
+                if len(batch) >= 5000:
+                    loaded += self._backfill(batch)
+                    batch = []
+            loaded += self._backfill(batch)
+
+            self.redis.set(self._key("warm"), 1)
+            self._warm = True
+            print(f"Redis context counters warmed with {loaded} events")
+            return loaded
+        finally:
+            self.redis.delete(self._key("warm_lock"))
+
+    def _backfill(self, batch) -> int:
+        """Count a batch of (id, minute, fields) not counted yet."""
+        if not batch:
+            return 0
+        pipe = self.redis.pipeline(transaction=False)
+        for event_id, _, _ in batch:
+            pipe.setbit(self._key("seen"), event_id, 1)
+        seen = pipe.execute()
+        new = [(m, f, 1) for (_, m, f), was_seen in zip(batch, seen) if not was_seen]
+        self._increment(new)
+        return len(new)
+
+    def _increment(self, items):
+        """Add (minute, fields, count) items to the bucket hashes."""
+        now = int(time.time()) // 60
+        minute_counts = defaultdict(int)
+        hour_counts = defaultdict(int)
+        for minute, fields, count in items:
+            for dimension in self.DIMENSIONS:
+                if fields[dimension] and minute > now - WINDOW_1H:
+                    minute_counts[(minute, fields[dimension])] += count
+            if fields["source_ip"] and minute // 60 >= now // 60 - self.HOURS_24H:
+                hour_counts[(minute // 60, fields["source_ip"])] += count
+        if not minute_counts and not hour_counts:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        for (minute, field), count in minute_counts.items():
+            pipe.hincrby(self._key("m", minute), field, count)
+        for minute in {minute for minute, _ in minute_counts}:
+            pipe.expire(self._key("m", minute), (WINDOW_1H + 2) * 60)
+        for (hour, field), count in hour_counts.items():
+            pipe.hincrby(self._key("h", hour), field, count)
+        for hour in {hour for hour, _ in hour_counts}:
+            pipe.expire(self._key("h", hour), (self.HOURS_24H + 2) * 3600)
+        pipe.execute()
+
+    def _fields(self, event) -> Dict[str, Optional[str]]:
+        """Get the hash field of an event for every dimension."""
+        fields = {}
+        for dimension in self.DIMENSIONS:
+            value = _dimension_value(event, dimension)
+            fields[dimension] = f"{dimension}:{value}" if value is not None else None
+        return fields
+
+    def _key(self, *parts) -> str:
+        """Build a namespaced Redis key."""
+        return ":".join([self.prefix, *map(str, parts)])
+
+
+# Global singleton instances
+_context_engine = None
+_redis_provider = None
+
+
+def get_context_engine() -> ContextEngine:
+    """Get or create the process-wide context engine."""
+    global _context_engine
+    if _context_engine is None:
+        _context_engine = ContextEngine()
+    return _context_engine
+
+
+def get_context_provider():
+    """Get the context provider selected by ``CONTEXT_BACKEND``.
+
+    Returns None for the "database" backend.
+    """
+    global _redis_provider
+    if settings.CONTEXT_BACKEND == "memory":
+        return get_context_engine()
+    if settings.CONTEXT_BACKEND == "redis":
+        if _redis_provider is None:
+            _redis_provider = RedisContextProvider()
+        return _redis_provider
+    return None
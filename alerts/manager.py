@@ -43,23 +43,68 @@ class AlertManager:
         self, db: Session, event: Event, context: Dict[str, Any] = None
     ) -> Alert:
         """Create an alert from an event with ML-based prioritization and real-time classification."""
-        context = context or {}
+        alert = self.create_alerts_from_events(db, [event], [context])[0]
+        db.refresh(alert)
+        return alert
+
+    def create_alerts_from_events(
+        self,
+        db: Session,
+        events: List[Event],
+        contexts: List[Dict[str, Any]] = None,
+    ) -> List[Alert]:
+        """Create alerts for a batch of events, scored and committed together."""
+        if not events:
+            return []
+        contexts = [context or {} for context in (contexts or [None] * len(events))]
 
         # Real-time ML processing
-        ml_insights = None
+        insights = [None] * len(events)
         if self.ml_system:
             try:
-                ml_insights = self.ml_system.process_event(event, context)
+                insights = self.ml_system.process_events(events, contexts)
             except Exception as e:
                 print(f"Error in real-time ML processing: {e}")
+                # Retry one by one so a single bad event keeps its neighbours' insights
+                for i, (event, context) in enumerate(zip(events, contexts)):
+                    try:
+                        insights[i] = self.ml_system.process_event(event, context)
+                    except Exception as e:
+                        print(f"Error in real-time ML processing: {e}")
+
+        # Get ML-based priorities for the whole batch in one model call
+        predictions = self.prioritizer.predict_priorities(events, contexts)
+
+        alerts = []
+        for event, ml_insights, prediction in zip(events, insights, predictions):
+            # Use classification priority if available
+            if ml_insights and ml_insights["classification"]["recommended_priority"]:
+                priority = ml_insights["classification"]["recommended_priority"]
+                ml_score = ml_insights["ml_confidence"]
+            else:
+                priority, ml_score = prediction
+            alerts.append(self._build_alert(event, ml_insights, priority, ml_score))
+
+        # Imported here: the pipeline package imports this module
+        from pipeline.rollups import record_alert_counts
+
+        db.add_all(alerts)
+        db.flush()
+        record_alert_counts(
+            db, ((alert.created_at, alert.priority) for alert in alerts)
+        )
+        db.commit()
 
-        # Get ML-based priority (use classification if available)
-        if ml_insights and ml_insights["classification"]["recommended_priority"]:
-            priority = ml_insights["classification"]["recommended_priority"]
-            ml_score = ml_insights["ml_confidence"]
-        else:
-            priority, ml_score = self.prioritizer.predict_priority(event, context)
+        return alerts
 
+    def _build_alert(
+        self,
+        event: Event,
+        ml_insights: Optional[Dict[str, Any]],
+        priority: AlertPriority,
+        ml_score: float,
+    ) -> Alert:
+        """Build an alert for an event from its ML insights and priority."""
         # Generate alert title (enhanced with classification)
         title = self._generate_alert_title(event, ml_insights)
 
@@ -80,8 +125,7 @@ class AlertManager:
                     f"\nRecommended Action: {ml_insights['recommended_action']}"
                 )
 
-        # Create alert
-        alert = Alert(
+        return Alert(
             title=title,
             description=description,
             status=AlertStatus.NEW,
@@ -91,12 +135,6 @@ class AlertManager:
             event_id=event.id,
         )
 
-        db.add(alert)
-        db.commit()
-        db.refresh(alert)
-
-        return alert
-
     def _generate_alert_title(
         self, event: Event, ml_insights: Dict[str, Any] = None
     ) -> str:
@@ -1,18 +1,64 @@
 """ML-based alert prioritization system with intelligent scoring."""
 
-import os
-import pickle
 from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
+from sklearn.base import clone
 from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 
+from ml.registry import get_model_registry
 from models.alert import AlertPriority
 from models.event import Event, EventType
+from utils.keyword_matcher import get_keyword_matcher
+
+MALWARE_KEYWORDS = [
+    "malware",
+    "virus",
+    "trojan",
+    "ransomware",
+    "rootkit",
+    "backdoor",
+    "spyware",
+]
+SUSPICIOUS_PATTERNS = [
+    "unauthorized",
+    "breach",
+    "exploit",
+    "attack",
+    "intrusion",
+    "compromise",
+]
+EXPLOIT_KEYWORDS = [
+    "exploit",
+    "cve-",
+    "vulnerability",
+    "zero-day",
+    "rce",
+    "sql injection",
+]
+PRIVILEGE_KEYWORDS = [
+    "privilege",
+    "escalation",
+    "sudo",
+    "admin",
+    "root",
+    "administrator",
+]
+
+
+get_keyword_matcher().sync_groups(
+    "prioritizer:",
+    {
+        "malware": MALWARE_KEYWORDS,
+        "suspicious": SUSPICIOUS_PATTERNS,
+        "exploit": EXPLOIT_KEYWORDS,
+        "privilege": PRIVILEGE_KEYWORDS,
+    },
+)
 
 
 class AlertPrioritizer:
@@ -22,6 +68,8 @@ class AlertPrioritizer:
         """Initialize the prioritizer."""
         self.model_path = model_path
         self.model = None
+        self.compiled_model = None
+        self._model_entry = None
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
         self.feature_columns = [
@@ -42,20 +90,32 @@ class AlertPrioritizer:
 
     def _load_or_create_model(self):
         """Load existing model or create a new one."""
-        if os.path.exists(self.model_path):
-            try:
-                with open(self.model_path, "rb") as f:
-                    saved_data = pickle.load(f)
-                    self.model = saved_data.get("model")
-                    self.scaler = saved_data.get("scaler", StandardScaler())
-                    self.label_encoder = saved_data.get("label_encoder", LabelEncoder())
-                print(f"Loaded ML model from {self.model_path}")
-            except Exception as e:
-                print(f"Error loading model: {e}. Creating new model.")
-                self._create_new_model()
+        try:
+            entry = get_model_registry().get(self.model_path)
+        except Exception as e:
+            print(f"Error loading model: {e}. Creating new model.")
+            entry = None
+
+        self._model_entry = entry
+        if entry is not None:
+            saved_data = entry.data
+            self.model = saved_data.get("model")
+            self.scaler = saved_data.get("scaler", StandardScaler())
+            self.label_encoder = saved_data.get("label_encoder", LabelEncoder())
+            self.compiled_model = entry.compiled("model")
+            print(f"Loaded ML model from {self.model_path}")
         else:
             self._create_new_model()
 
+    def _sync_model(self):
+        """Switch to the shared model if the model file changed."""
+        try:
+            entry = get_model_registry().get(self.model_path)
+        except Exception:
+            return
+        if entry is not None and entry is not self._model_entry:
+            self._load_or_create_model()
+
     def _create_new_model(self):
         """Create a new ML model."""
         self.model = GradientBoostingClassifier(
@@ -65,6 +125,7 @@ class AlertPrioritizer:
             random_state=42,
             subsample=0.8,
         )
+        self.compiled_model = None
         print("Created new ML model")
 
     def _calculate_event_type_severity(self, event_type: EventType) -> float:
@@ -184,44 +245,11 @@ class AlertPrioritizer:
         title = (getattr(event, "title", "") or "").lower()
         full_text = f"{title} {description}"
 
-        malware_keywords = [
-            "malware",
-            "virus",
-            "trojan",
-            "ransomware",
-            "rootkit",
-            "backdoor",
-            "spyware",
-        ]
-        suspicious_patterns = [
-            "unauthorized",
-            "breach",
-            "exploit",
-            "attack",
-            "intrusion",
-            "compromise",
-        ]
-        exploit_keywords = [
-            "exploit",
-            "cve-",
-            "vulnerability",
-            "zero-day",
-            "rce",
-            "sql injection",
-        ]
-        privilege_keywords = [
-            "privilege",
-            "escalation",
-            "sudo",
-            "admin",
-            "root",
-            "administrator",
-        ]
-
-        has_malware = int(any(kw in full_text for kw in malware_keywords))
-        has_suspicious = int(any(kw in full_text for kw in suspicious_patterns))
-        has_exploit = int(any(kw in full_text for kw in exploit_keywords))
-        has_privilege = int(any(kw in full_text for kw in privilege_keywords))
+        keyword_hits = get_keyword_matcher().match(full_text)
+        has_malware = int(keyword_hits["prioritizer:malware"] > 0)
+        has_suspicious = int(keyword_hits["prioritizer:suspicious"] > 0)
+        has_exploit = int(keyword_hits["prioritizer:exploit"] > 0)
+        has_privilege = int(keyword_hits["prioritizer:privilege"] > 0)
 
         # Network anomaly score
         network_anomaly = self._calculate_network_anomaly_score(context)
@@ -255,110 +283,138 @@ class AlertPrioritizer:
 
         return features
 
+    def extract_features_batch(
+        self, events: List[Event], contexts: List[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """Extract features for a batch of events into one feature matrix."""
+        contexts = contexts or [None] * len(events)
+        if not events:
+            return np.empty((0, len(self.feature_columns)))
+        return np.vstack(
+            [
+                self.extract_features(event, context)
+                for event, context in zip(events, contexts)
+            ]
+        )
+
     def _calculate_intelligent_score(
         self, event: Event, context: Dict[str, Any] = None
     ) -> float:
         """Calculate intelligent ML score without requiring trained model."""
         features = self.extract_features(event, context)
-
-        event_type_severity = features[0][0]
-        severity_score_raw = features[0][1]
-        source_ip_freq = features[0][2]  # log scale
-        dest_ip_freq = features[0][3]  # log scale
-        user_freq = features[0][4]  # log scale
-        has_malware = features[0][5]
-        has_suspicious = features[0][6]
-        has_exploit = features[0][7]
-        has_privilege = features[0][8]
-        network_anomaly = features[0][9]
-        time_score = features[0][10]
-        source_reliability = features[0][11]
+        return float(self._calculate_intelligent_scores(features)[0])
+
+    def _calculate_intelligent_scores(self, features: np.ndarray) -> np.ndarray:
+        """Calculate intelligent ML scores for a feature matrix."""
+        event_type_severity = features[:, 0]
+        severity_score_raw = features[:, 1]
+        source_ip_freq = features[:, 2]  # log scale
+        dest_ip_freq = features[:, 3]  # log scale
+        user_freq = features[:, 4]  # log scale
+        has_malware = features[:, 5]
+        has_suspicious = features[:, 6]
+        has_exploit = features[:, 7]
+        has_privilege = features[:, 8]
+        network_anomaly = features[:, 9]
+        time_score = features[:, 10]
+        source_reliability = features[:, 11]
 
         # Normalize severity score to 0-1 range
-        if severity_score_raw > 1.0:
-            severity_score = min(1.0, severity_score_raw / 10.0)
-        elif severity_score_raw <= 0:
-            severity_score = event_type_severity  # Fallback to event type
-        else:
-            severity_score = severity_score_raw
+        severity_score = np.where(
+            severity_score_raw > 1.0,
+            np.minimum(1.0, severity_score_raw / 10.0),
+            np.where(
+                severity_score_raw <= 0,
+                event_type_severity,  # Fallback to event type
+                severity_score_raw,
+            ),
+        )
 
         # Start with event type as base (40% of final score)
         base_score = event_type_severity * 0.40
 
         # Add severity contribution (30% of final score)
-        base_score += severity_score * 0.30
+        base_score = base_score + severity_score * 0.30
 
         # Keyword multiplier (not additive - multiplies the risk)
-        keyword_multiplier = 1.0
-        if has_malware:
-            keyword_multiplier += 0.25  # +25% risk
-        if has_exploit:
-            keyword_multiplier += 0.20  # +20% risk
-        if has_privilege:
-            keyword_multiplier += 0.15  # +15% risk
-        if has_suspicious:
-            keyword_multiplier += 0.10  # +10% risk
+        keyword_multiplier = np.ones(len(features))
+        keyword_multiplier += np.where(has_malware > 0, 0.25, 0.0)  # +25% risk
+        keyword_multiplier += np.where(has_exploit > 0, 0.20, 0.0)  # +20% risk
+        keyword_multiplier += np.where(has_privilege > 0, 0.15, 0.0)  # +15% risk
+        keyword_multiplier += np.where(has_suspicious > 0, 0.10, 0.0)  # +10% risk
         # Cap multiplier at 1.6 (60% increase)
-        keyword_multiplier = min(1.6, keyword_multiplier)
+        keyword_multiplier = np.minimum(1.6, keyword_multiplier)
 
         # Apply keyword multiplier to base score
         base_score = base_score * keyword_multiplier
 
         # Add network anomaly (15% of range)
         # Network anomaly is already 0-0.9, scale it to contribute up to 15% of score
-        base_score += network_anomaly * 0.15
+        base_score = base_score + network_anomaly * 0.15
 
         # Frequency contribution (10% of range)
         # Convert log frequencies to risk score
         # log1p(1) ≈ 0.69, log1p(5) ≈ 1.79, log1p(10) ≈ 2.40, log1p(20) ≈ 3.04
         avg_freq_log = (source_ip_freq + dest_ip_freq + user_freq) / 3.0
-        if avg_freq_log > 2.8:  # Very high frequency (log1p(15+))
-            freq_contrib = 0.10
-        elif avg_freq_log > 2.2:  # High frequency (log1p(8+))
-            freq_contrib = 0.07
-        elif avg_freq_log > 1.5:  # Medium frequency (log1p(3+))
-            freq_contrib = 0.04
-        elif avg_freq_log > 0.7:  # Low frequency (log1p(1+))
-            freq_contrib = 0.02
-        else:
-            freq_contrib = 0.0
-        base_score += freq_contrib
+        freq_contrib = np.select(
+            [
+                avg_freq_log > 2.8,  # Very high frequency (log1p(15+))
+                avg_freq_log > 2.2,  # High frequency (log1p(8+))
+                avg_freq_log > 1.5,  # Medium frequency (log1p(3+))
+                avg_freq_log > 0.7,  # Low frequency (log1p(1+))
+            ],
+            [0.10, 0.07, 0.04, 0.02],
+            default=0.0,
+        )
+        base_score = base_score + freq_contrib
 
         # Time-based adjustment (5% of range)
         # Off-hours adds risk, business hours reduces it slightly
         time_adjustment = (time_score - 0.4) * 0.05  # -0.005 to +0.015
-        base_score += time_adjustment
+        base_score = base_score + time_adjustment
 
         # Source reliability adjustment (small)
         # More reliable sources get slight boost
         source_adjustment = (source_reliability - 0.65) * 0.02  # -0.003 to +0.004
-        base_score += source_adjustment
+        base_score = base_score + source_adjustment
 
         # Apply sigmoid-like compression to prevent scores > 0.95
         # Scores above 0.90 get compressed more aggressively
-        if base_score > 0.90:
-            excess = base_score - 0.90
-            base_score = 0.90 + (excess * 0.33)  # Compress excess by 67%
-        elif base_score > 0.85:
-            excess = base_score - 0.85
-            base_score = 0.85 + (excess * 0.50)  # Compress excess by 50%
+        base_score = np.where(
+            base_score > 0.90,
+            0.90 + (base_score - 0.90) * 0.33,  # Compress excess by 67%
+            np.where(
+                base_score > 0.85,
+                0.85 + (base_score - 0.85) * 0.50,  # Compress excess by 50%
+                base_score,
+            ),
+        )
 
         # Ensure minimum score based on event type
-        min_score = max(
+        min_score = np.maximum(
             0.10, event_type_severity * 0.5
         )  # At least 50% of base severity
-        max_score = min(0.95, event_type_severity * 1.2)  # Cap at 120% of base severity
+        max_score = np.minimum(
+            0.95, event_type_severity * 1.2
+        )  # Cap at 120% of base severity
 
         # Final normalization with event-type-based bounds
-        intelligent_score = max(min_score, min(max_score, base_score))
-
-        return intelligent_score
+        return np.maximum(min_score, np.minimum(max_score, base_score))
 
     def predict_priority(
         self, event: Event, context: Dict[str, Any] = None
     ) -> Tuple[AlertPriority, float]:
         """Predict alert priority using ML model or intelligent scoring."""
-        features = self.extract_features(event, context)
+        return self.predict_priorities([event], [context])[0]
+
+    def predict_priorities(
+        self, events: List[Event], contexts: List[Dict[str, Any]] = None
+    ) -> List[Tuple[AlertPriority, float]]:
+        """Predict priorities for a batch of events with one model call."""
+        if not events:
+            return []
+        self._sync_model()
+        features = self.extract_features_batch(events, contexts)
 
         # Try to use trained model if available
         if hasattr(self.model, "classes_") and len(self.model.classes_) > 0:
@@ -370,9 +426,12 @@ class AlertPrioritizer:
                     features_scaled = features
 
                 # Predict probability
-                probabilities = self.model.predict_proba(features_scaled)[0]
-                predicted_class_idx = np.argmax(probabilities)
-                confidence = float(probabilities[predicted_class_idx])
+                model = self.compiled_model or self.model
+                probabilities = model.predict_proba(features_scaled)
+                predicted_class_idx = np.argmax(probabilities, axis=1)
+                confidence = probabilities[
+                    np.arange(len(probabilities)), predicted_class_idx
+                ]
 
                 # Map to AlertPriority
                 priority_mapping = {
@@ -383,22 +442,22 @@ class AlertPrioritizer:
                     4: AlertPriority.INFO,
                 }
 
-                priority = priority_mapping.get(
-                    predicted_class_idx, AlertPriority.MEDIUM
-                )
-
                 # Use confidence as ML score, but ensure it's meaningful
-                ml_score = max(confidence, 0.6)  # Minimum 60% confidence
+                ml_scores = np.maximum(confidence, 0.6)  # Minimum 60% confidence
 
-                return priority, ml_score
+                return [
+                    (priority_mapping.get(int(idx), AlertPriority.MEDIUM), float(score))
+                    for idx, score in zip(predicted_class_idx, ml_scores)
+                ]
             except Exception as e:
                 print(f"Error in ML prediction: {e}. Using intelligent scoring.")
 
         # Fallback to intelligent scoring
-        intelligent_score = self._calculate_intelligent_score(event, context)
-        priority = self._intelligent_priority_mapping(intelligent_score)
-
-        return priority, intelligent_score
+        intelligent_scores = self._calculate_intelligent_scores(features)
+        return [
+            (self._intelligent_priority_mapping(score), float(score))
+            for score in intelligent_scores
+        ]
 
     def _intelligent_priority_mapping(self, score: float) -> AlertPriority:
         """Map intelligent score to priority level."""
@@ -467,11 +526,16 @@ class AlertPrioritizer:
         X = np.array(X)
         y = np.array(y)
 
+        # Fit fresh objects; the loaded ones are shared with other instances
+        model = clone(self.model)
+        scaler = StandardScaler()
+        label_encoder = LabelEncoder()
+
         # Encode labels
-        y_encoded = self.label_encoder.fit_transform(y)
+        y_encoded = label_encoder.fit_transform(y)
 
         # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        X_scaled = scaler.fit_transform(X)
 
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -479,26 +543,34 @@ class AlertPrioritizer:
         )
 
         # Train model
-        self.model.fit(X_train, y_train)
+        model.fit(X_train, y_train)
 
         # Evaluate
-        train_score = self.model.score(X_train, y_train)
-        test_score = self.model.score(X_test, y_test)
+        train_score = model.score(X_train, y_train)
+        test_score = model.score(X_test, y_test)
         print(
             f"Model training complete. Train accuracy: {train_score:.2f}, Test accuracy: {test_score:.2f}"
         )
 
+        self.model = model
+        self.scaler = scaler
+        self.label_encoder = label_encoder
+
         # Save model with scaler and encoder
-        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        with open(self.model_path, "wb") as f:
-            pickle.dump(
-                {
-                    "model": self.model,
-                    "scaler": self.scaler,
-                    "label_encoder": self.label_encoder,
-                },
-                f,
-            )
+        self._model_entry = get_model_registry().store(
+            self.model_path,
+            {
+                "model": self.model,
+                "scaler": self.scaler,
+                "label_encoder": self.label_encoder,
+            },
+            metadata={
+                "training_size": len(X),
+                "train_accuracy": float(train_score),
+                "test_accuracy": float(test_score),
+            },
+        )
+        self.compiled_model = self._model_entry.compiled("model")
         print(f"Model saved to {self.model_path}")
 
     def extract_features_from_dict(self, data: Dict[str, Any]) -> np.ndarray:
@@ -1,13 +1,17 @@
 """Main FastAPI application."""
 
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.routes import alerts, events, incidents, integrations
+from api.pagination import NEXT_CURSOR_HEADER
+from api.routes import alerts, events, incidents, integrations, stats
 from config.settings import settings
 
 try:
     from api.routes import ml
+    from ml.singleton import warm_ml_system
 
     ML_ROUTES_AVAILABLE = True
 except ImportError:
@@ -26,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -35,10 +40,18 @@ app.include_router(incidents.router, prefix="/api/v1/incidents", tags=["Incident
 app.include_router(
     integrations.router, prefix="/api/v1/integrations", tags=["Integrations"]
 )
+app.include_router(stats.router, prefix="/api/v1/stats", tags=["Statistics"])
 if ML_ROUTES_AVAILABLE:
     app.include_router(ml.router, prefix="/api/v1", tags=["ML"])
 
 
+@app.on_event("startup")
+def start_ml_warmer():
+    """Fill the ML window in the background so /ml/stats never waits on it."""
+    if ML_ROUTES_AVAILABLE:
+        threading.Thread(target=warm_ml_system, daemon=True).start()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -0,0 +1,59 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Lists are ordered by ``(created_at, id)`` descending. A cursor encodes the
+position of the last row of a page, and the next page continues strictly
+after it, so every page costs an index seek regardless of its depth.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a row position as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor, raising a 400 error if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    query: Select, model, limit: int, cursor: Optional[str] = None, skip: int = 0
+) -> Select:
+    """Order ``query`` by (created_at, id) descending and select one page.
+
+    Fetches one row more than ``limit`` so ``next_page`` can tell whether
+    another page exists. ``skip`` is still honoured for callers that page by
+    offset, but only when no cursor is given.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+
+def next_page(rows: List, limit: int, response: Response) -> List:
+    """Trim the look-ahead row and set the next-cursor header if needed."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows
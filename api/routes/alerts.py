@@ -2,13 +2,15 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from alerts.manager import AlertManager
 from alerts.tasks import process_events_to_alerts
-from config.database import get_db
+from api.pagination import next_page, paginate
+from config.database import get_async_db
 from integrations.tasks import send_alert_to_integrations
 from models.alert import Alert, AlertPriority, AlertStatus
 
@@ -40,21 +42,28 @@ class AlertUpdate(BaseModel):
 
 @router.get("/", response_model=List[AlertResponse])
 async def get_alerts(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     priority: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get alerts with filtering."""
-    query = db.query(Alert)
+    """Get alerts with filtering, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to get the
+    next page.
+    """
+    query = select(Alert)
 
     if status:
-        query = query.filter(Alert.status == AlertStatus(status))
+        query = query.where(Alert.status == AlertStatus(status))
     if priority:
-        query = query.filter(Alert.priority == AlertPriority(priority))
+        query = query.where(Alert.priority == AlertPriority(priority))
 
-    alerts = query.order_by(Alert.created_at.desc()).offset(skip).limit(limit).all()
+    alerts = await db.scalars(paginate(query, Alert, limit, cursor, skip))
+    alerts = next_page(alerts.all(), limit, response)
     return [
         AlertResponse(
             id=a.id,
@@ -71,10 +80,12 @@ async def get_alerts(
 
 
 @router.get("/critical", response_model=List[AlertResponse])
-async def get_critical_alerts(limit: int = 50, db: Session = Depends(get_db)):
+async def get_critical_alerts(
+    limit: int = 50, db: AsyncSession = Depends(get_async_db)
+):
     """Get critical alerts."""
     alert_manager = AlertManager()
-    alerts = alert_manager.get_critical_alerts(db, limit)
+    alerts = await db.run_sync(alert_manager.get_critical_alerts, limit)
     return [
         AlertResponse(
             id=a.id,
@@ -91,9 +102,9 @@ async def get_critical_alerts(limit: int = 50, db: Session = Depends(get_db)):
 
 
 @router.get("/{alert_id}", response_model=AlertResponse)
-async def get_alert(alert_id: int, db: Session = Depends(get_db)):
+async def get_alert(alert_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific alert."""
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     return AlertResponse(
@@ -110,7 +121,9 @@ async def get_alert(alert_id: int, db: Session = Depends(get_db)):
 
 @router.patch("/{alert_id}", response_model=AlertResponse)
 async def update_alert(
-    alert_id: int, alert_update: AlertUpdate, db: Session = Depends(get_db)
+    alert_id: int,
+    alert_update: AlertUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update alert status."""
     alert_manager = AlertManager()
@@ -119,7 +132,9 @@ async def update_alert(
     if alert_update.status:
         status = AlertStatus(alert_update.status)
 
-    alert = alert_manager.update_alert_status(db, alert_id, status, alert_update.notes)
+    alert = await db.run_sync(
+        alert_manager.update_alert_status, alert_id, status, alert_update.notes
+    )
 
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
@@ -137,9 +152,9 @@ async def update_alert(
 
 
 @router.post("/{alert_id}/send", response_model=dict)
-async def send_alert(alert_id: int, db: Session = Depends(get_db)):
+async def send_alert(alert_id: int, db: AsyncSession = Depends(get_async_db)):
     """Send alert to integrations."""
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
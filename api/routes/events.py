@@ -1,15 +1,23 @@
 """Events API routes."""
 
+import json
+import zlib
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from alerts.tasks import process_events_to_alerts
-from config.database import get_db
+from api.pagination import next_page, paginate
+from config.database import get_async_db
+from config.settings import settings
 from models.event import Event, EventSource, EventType
+from pipeline.processor import event_values_from_dict
+from pipeline.rollups import record_event_counts
+from pipeline.writer import EventBatchWriter, enqueue_alert_processing, insert_events
 
 router = APIRouter()
 
@@ -48,25 +56,71 @@ class EventResponse(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat() if v else None}
 
 
+class BulkEventError(BaseModel):
+    """Per-record error in a bulk ingestion request."""
+
+    index: int
+    error: str
+
+
+class BulkEventResponse(BaseModel):
+    """Bulk event ingestion response schema."""
+
+    received: int
+    inserted: int
+    event_ids: List[Optional[int]]  # Aligned with the request, None if rejected
+    errors: List[BulkEventError]
+    tasks_queued: int
+
+
+class StreamEventError(BaseModel):
+    """Per-line error in a streaming ingestion request."""
+
+    line: int
+    error: str
+
+
+class StreamEventResponse(BaseModel):
+    """Streaming event ingestion summary."""
+
+    lines: int
+    inserted: int
+    rejected: int
+    batches: int
+    tasks_queued: int
+    errors: List[StreamEventError]  # Capped at EVENT_STREAM_MAX_ERRORS
+    status: str
+
+
+def _event_values(event: EventCreate) -> Dict[str, Any]:
+    """Map an event creation payload to Event column values."""
+    return {
+        "source": EventSource(event.source),
+        "event_type": EventType(event.event_type),
+        "raw_data": event.raw_data,
+        "timestamp": event.timestamp or datetime.utcnow().isoformat(),
+        "source_ip": event.source_ip,
+        "destination_ip": event.destination_ip,
+        "user": event.user,
+        "hostname": event.hostname,
+        "description": event.description,
+        "severity_score": event.severity_score,
+    }
+
+
 @router.post("/", response_model=EventResponse)
-async def create_event(event: EventCreate, db: Session = Depends(get_db)):
+async def create_event(event: EventCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new event."""
     try:
-        db_event = Event(
-            source=EventSource(event.source),
-            event_type=EventType(event.event_type),
-            raw_data=event.raw_data,
-            timestamp=event.timestamp or datetime.utcnow().isoformat(),
-            source_ip=event.source_ip,
-            destination_ip=event.destination_ip,
-            user=event.user,
-            hostname=event.hostname,
-            description=event.description,
-            severity_score=event.severity_score,
-        )
+        db_event = Event(**_event_values(event))
         db.add(db_event)
-        db.commit()
-        db.refresh(db_event)
+        await db.flush()
+        await db.run_sync(
+            record_event_counts,
+            [(db_event.created_at, db_event.source, db_event.event_type)],
+        )
+        await db.commit()
+        await db.refresh(db_event)
 
         # Trigger alert creation asynchronously
         process_events_to_alerts.delay([db_event.id])
@@ -85,27 +139,173 @@ async def create_event(event: EventCreate, db: Session = Depends(get_db)):
             created_at=db_event.created_at.isoformat() if db_event.created_at else "",
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/bulk", response_model=BulkEventResponse)
+async def create_events_bulk(
+    records: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create many events in one request.
+
+    Records are validated individually so one bad record does not reject the
+    batch. Valid records are written with a multi-row insert in a single
+    transaction and alert processing is queued in chunks.
+    """
+    if len(records) > settings.EVENT_BULK_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many records (max {settings.EVENT_BULK_MAX_RECORDS})",
+        )
+
+    rows = []
+    row_indexes = []
+    errors = []
+    for index, record in enumerate(records):
+        try:
+            rows.append(_event_values(EventCreate.model_validate(record)))
+            row_indexes.append(index)
+        except (ValidationError, ValueError, TypeError) as e:
+            errors.append(BulkEventError(index=index, error=str(e)))
+
+    try:
+        inserted_ids = await db.run_sync(insert_events, rows)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    event_ids: List[Optional[int]] = [None] * len(records)
+    for index, event_id in zip(row_indexes, inserted_ids):
+        event_ids[index] = event_id
+
+    # Trigger alert creation asynchronously, one task per chunk
+    tasks_queued = enqueue_alert_processing(inserted_ids)
+
+    return BulkEventResponse(
+        received=len(records),
+        inserted=len(inserted_ids),
+        event_ids=event_ids,
+        errors=errors,
+        tasks_queued=tasks_queued,
+    )
+
+
+@router.post("/stream", response_model=StreamEventResponse)
+async def stream_events(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Ingest an application/x-ndjson body, optionally gzip-compressed.
+
+    The body is read chunk by chunk and parsed one line at a time, so memory
+    stays flat no matter how large the upload is. Events are written in
+    micro-batches of EVENT_BATCH_SIZE, each committed and queued for alert
+    processing on its own.
+    """
+    writer = await db.run_sync(EventBatchWriter)
+    lines = 0
+    line_number = 0
+    rejected = 0
+    errors = []
+
+    try:
+        async for line_number, line in _iter_ndjson_lines(request):
+            lines += 1
+            try:
+                values = event_values_from_dict(json.loads(line))
+                if len(writer.rows) + 1 < writer.batch_size:
+                    writer.add(values)
+                else:
+                    # Only a full batch touches the database
+                    await db.run_sync(lambda _: writer.add(values))
+            except (ValueError, TypeError, AttributeError) as e:
+                rejected += 1
+                if len(errors) < settings.EVENT_STREAM_MAX_ERRORS:
+                    errors.append(StreamEventError(line=line_number, error=str(e)))
+        await db.run_sync(lambda _: writer.flush())
+        status = "success"
+    except Exception as e:
+        # Batches flushed so far are committed; report how far we got
+        rejected += writer.failed + len(writer.rows)
+        errors.append(StreamEventError(line=line_number, error=str(e)))
+        status = "partial" if writer.inserted else "failed"
+
+    return StreamEventResponse(
+        lines=lines,
+        inserted=writer.inserted,
+        rejected=rejected,
+        batches=writer.batches,
+        tasks_queued=writer.tasks_queued,
+        errors=errors,
+        status=status,
+    )
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) pairs from a chunked, maybe gzipped body."""
+    max_line = settings.EVENT_STREAM_MAX_LINE_BYTES
+    gzipped = request.headers.get("content-encoding", "").lower() == "gzip"
+    decompressor = None
+    buffer = b""
+    line_number = 0
+    first_chunk = True
+
+    async for chunk in request.stream():
+        if first_chunk:
+            first_chunk = False
+            gzipped = gzipped or chunk[:2] == b"\x1f\x8b"
+            if gzipped:
+                decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+
+        data = chunk
+        while data:
+            if decompressor:
+                # Bound the output per step so a highly compressed body
+                # cannot inflate into a huge buffer at once
+                out = decompressor.decompress(data, max_line)
+                data = decompressor.unconsumed_tail
+            else:
+                out, data = data, b""
+
+            buffer += out
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                line_number += 1
+                if line.strip():
+                    yield line_number, line
+            if len(buffer) > max_line:
+                raise ValueError(f"Line {line_number + 1} exceeds {max_line} bytes")
+
+    if decompressor:
+        buffer += decompressor.flush()
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
 @router.get("/", response_model=List[EventResponse])
 async def get_events(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     source: Optional[str] = None,
     event_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get events with filtering."""
-    query = db.query(Event)
+    """Get events with filtering, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to get the
+    next page.
+    """
+    query = select(Event)
 
     if source:
-        query = query.filter(Event.source == EventSource(source))
+        query = query.where(Event.source == EventSource(source))
     if event_type:
-        query = query.filter(Event.event_type == EventType(event_type))
+        query = query.where(Event.event_type == EventType(event_type))
 
-    events = query.order_by(Event.created_at.desc()).offset(skip).limit(limit).all()
+    events = await db.scalars(paginate(query, Event, limit, cursor, skip))
+    events = next_page(events.all(), limit, response)
     return [
         EventResponse(
             id=e.id,
@@ -124,9 +324,9 @@ async def get_events(
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific event."""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return EventResponse(
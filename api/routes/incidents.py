@@ -2,11 +2,13 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config.database import get_db
+from api.pagination import next_page, paginate
+from config.database import get_async_db
 from integrations.tasks import create_incident_in_integrations
 from models.incident import Incident, IncidentSeverity, IncidentStatus
 
@@ -51,7 +53,9 @@ class IncidentUpdate(BaseModel):
 
 
 @router.post("/", response_model=IncidentResponse)
-async def create_incident(incident: IncidentCreate, db: Session = Depends(get_db)):
+async def create_incident(
+    incident: IncidentCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Create a new incident."""
     try:
         db_incident = Incident(
@@ -64,8 +68,8 @@ async def create_incident(incident: IncidentCreate, db: Session = Depends(get_db
             ioc=incident.ioc,
         )
         db.add(db_incident)
-        db.commit()
-        db.refresh(db_incident)
+        await db.commit()
+        await db.refresh(db_incident)
 
         # Trigger async task to create incident in SOAR systems
         create_incident_in_integrations.delay(db_incident.id)
@@ -82,29 +86,34 @@ async def create_incident(incident: IncidentCreate, db: Session = Depends(get_db
             ),
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/", response_model=List[IncidentResponse])
 async def get_incidents(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     severity: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get incidents with filtering."""
-    query = db.query(Incident)
+    """Get incidents with filtering, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to get the
+    next page.
+    """
+    query = select(Incident)
 
     if status:
-        query = query.filter(Incident.status == IncidentStatus(status))
+        query = query.where(Incident.status == IncidentStatus(status))
     if severity:
-        query = query.filter(Incident.severity == IncidentSeverity(severity))
+        query = query.where(Incident.severity == IncidentSeverity(severity))
 
-    incidents = (
-        query.order_by(Incident.created_at.desc()).offset(skip).limit(limit).all()
-    )
+    incidents = await db.scalars(paginate(query, Incident, limit, cursor, skip))
+    incidents = next_page(incidents.all(), limit, response)
     return [
         IncidentResponse(
             id=i.id,
@@ -120,9 +129,9 @@ async def get_incidents(
 
 
 @router.get("/{incident_id}", response_model=IncidentResponse)
-async def get_incident(incident_id: int, db: Session = Depends(get_db)):
+async def get_incident(incident_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific incident."""
-    incident = db.query(Incident).filter(Incident.id == incident_id).first()
+    incident = await db.get(Incident, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     return IncidentResponse(
@@ -138,10 +147,12 @@ async def get_incident(incident_id: int, db: Session = Depends(get_db)):
 
 @router.patch("/{incident_id}", response_model=IncidentResponse)
 async def update_incident(
-    incident_id: int, incident_update: IncidentUpdate, db: Session = Depends(get_db)
+    incident_id: int,
+    incident_update: IncidentUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update incident."""
-    incident = db.query(Incident).filter(Incident.id == incident_id).first()
+    incident = await db.get(Incident, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
 
@@ -158,8 +169,8 @@ async def update_incident(
     if incident_update.ioc:
         incident.ioc = incident_update.ioc
 
-    db.commit()
-    db.refresh(incident)
+    await db.commit()
+    await db.refresh(incident)
     return IncidentResponse(
         id=incident.id,
         title=incident.title,
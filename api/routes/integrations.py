@@ -3,10 +3,12 @@
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config.database import get_db
+from config.database import get_async_db
 from integrations.siem_elastic import ElasticIntegration
 from integrations.siem_splunk import SplunkIntegration
 from integrations.soar_cortex import CortexIntegration
@@ -42,7 +44,7 @@ class IntegrationResponse(BaseModel):
 
 @router.post("/", response_model=IntegrationResponse)
 async def create_integration(
-    integration: IntegrationCreate, db: Session = Depends(get_db)
+    integration: IntegrationCreate, db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new integration."""
     try:
@@ -53,34 +55,38 @@ async def create_integration(
             enabled=integration.enabled,
         )
         db.add(db_integration)
-        db.commit()
-        db.refresh(db_integration)
+        await db.commit()
+        await db.refresh(db_integration)
         return db_integration
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/", response_model=List[IntegrationResponse])
-async def get_integrations(db: Session = Depends(get_db)):
+async def get_integrations(db: AsyncSession = Depends(get_async_db)):
     """Get all integrations."""
-    integrations = db.query(Integration).all()
-    return integrations
+    integrations = await db.scalars(select(Integration))
+    return integrations.all()
 
 
 @router.get("/{integration_id}", response_model=IntegrationResponse)
-async def get_integration(integration_id: int, db: Session = Depends(get_db)):
+async def get_integration(
+    integration_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Get a specific integration."""
-    integration = db.query(Integration).filter(Integration.id == integration_id).first()
+    integration = await db.get(Integration, integration_id)
     if not integration:
         raise HTTPException(status_code=404, detail="Integration not found")
     return integration
 
 
 @router.post("/{integration_id}/test", response_model=dict)
-async def test_integration(integration_id: int, db: Session = Depends(get_db)):
+async def test_integration(
+    integration_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Test integration connection."""
-    integration = db.query(Integration).filter(Integration.id == integration_id).first()
+    integration = await db.get(Integration, integration_id)
     if not integration:
         raise HTTPException(status_code=404, detail="Integration not found")
 
@@ -89,13 +95,13 @@ async def test_integration(integration_id: int, db: Session = Depends(get_db)):
     if not integrator:
         raise HTTPException(status_code=400, detail="Unknown integration type")
 
-    # Test connection
-    connected = integrator.connect()
-    status = integrator.get_status()
+    # Test connection, in a worker thread since clients block on the network
+    connected = await run_in_threadpool(integrator.connect)
+    status = await run_in_threadpool(integrator.get_status)
 
     # Update integration status
     integration.status = "active" if connected else "error"
-    db.commit()
+    await db.commit()
 
     return {"connected": connected, "status": status}
 
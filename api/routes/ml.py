@@ -2,12 +2,18 @@
 
 from typing import Any, Dict, List
 
+from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from alerts.tasks import _get_event_context
-from config.database import get_db
+from config.celery_app import celery_app
+from config.database import get_async_db
+from config.settings import settings
 from ml.singleton import get_ml_system
+from ml.stats import get_snapshot_publisher
+from ml.tasks import MIN_TRAINING_EVENTS, train_anomaly_model
 from models.event import Event
 
 router = APIRouter(prefix="/ml", tags=["ML"])
@@ -17,14 +23,15 @@ ml_system = get_ml_system()
 
 
 @router.post("/detect/{event_id}")
-async def detect_anomaly(event_id: int, db: Session = Depends(get_db)):
+async def detect_anomaly(event_id: int, db: AsyncSession = Depends(get_async_db)):
     """Detect anomaly for a specific event."""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    context = _get_event_context(db, event)
-    result = ml_system.process_event(event, context)
+    context = await db.run_sync(_get_event_context, event)
+    # Model inference is CPU-bound; keep it off the event loop
+    result = await run_in_threadpool(ml_system.process_event, event, context)
 
     return {
         "event_id": event_id,
@@ -38,56 +45,75 @@ async def detect_anomaly(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/classify/{event_id}")
-async def classify_event(event_id: int, db: Session = Depends(get_db)):
+async def classify_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
     """Classify an event using ML."""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    context = _get_event_context(db, event)
-    classification = ml_system.classifier.classify_alert(event, context)
+    context = await db.run_sync(_get_event_context, event)
+    classification = await run_in_threadpool(
+        ml_system.classifier.classify_alert, event, context
+    )
 
     return {"event_id": event_id, "classification": classification}
 
 
 @router.get("/stats")
-async def get_ml_stats(db: Session = Depends(get_db)):
-    """Get ML system statistics."""
-    # Populate window with recent events if empty
-    if len(ml_system.event_window) == 0:
-        try:
-            from alerts.tasks import _get_event_context
-
-            recent_events = (
-                db.query(Event).order_by(Event.created_at.desc()).limit(100).all()
-            )
-            for event in recent_events:
-                context = _get_event_context(db, event)
-                ml_system.process_event(event, context)
-        except Exception as e:
-            print(f"Error populating ML window: {e}")
-
-    return {
-        "anomaly_detector_trained": ml_system.anomaly_detector.is_trained,
-        "events_in_window": len(ml_system.event_window),
-        "patterns_loaded": len(ml_system.classifier.patterns),
-    }
-
-
-@router.post("/update-models")
-async def update_models(event_ids: List[int], db: Session = Depends(get_db)):
-    """Update ML models with training data from events."""
-    events = db.query(Event).filter(Event.id.in_(event_ids)).all()
-    if len(events) < 10:
+def get_ml_stats():
+    """Get ML system statistics.
+
+    Served from the snapshots published by the alert pipeline workers,
+    merged, or from this process's own window (warmed at startup) when none
+    is available. A plain function, so the Redis call runs in the
+    threadpool instead of blocking the event loop.
+    """
+    snapshot = get_snapshot_publisher().load()
+    if snapshot is not None:
+        snapshot["source"] = "pipeline"
+        return snapshot
+
+    snapshot = ml_system.snapshot()
+    snapshot["source"] = "api"
+    return snapshot
+
+
+@router.post("/update-models", status_code=202)
+async def update_models(event_ids: List[int]):
+    """Queue a background job that trains the ML models on the given events."""
+    if settings.ML_ANOMALY_MODE == "streaming":
+        # The streaming model learns from every scored event in each process;
+        # a training job would only teach the worker's own copy
+        raise HTTPException(
+            status_code=409,
+            detail="Anomaly detection is in streaming mode; there is no model to train",
+        )
+    if len(set(event_ids)) < MIN_TRAINING_EVENTS:
         raise HTTPException(
             status_code=400, detail="Need at least 10 events for training"
         )
 
-    contexts = [_get_event_context(db, event) for event in events]
-    ml_system.update_models(events, contexts)
+    job = train_anomaly_model.delay(event_ids)
 
     return {
-        "status": "success",
-        "events_used": len(events),
-        "message": "ML models updated successfully",
+        "status": "queued",
+        "job_id": job.id,
+        "events_requested": len(set(event_ids)),
+        "message": f"Poll /api/v1/ml/jobs/{job.id} for progress",
     }
+
+
+@router.get("/jobs/{job_id}")
+async def get_training_job(job_id: str):
+    """Get progress, timings and results of a training job."""
+    job = AsyncResult(job_id, app=celery_app)
+    response: Dict[str, Any] = {"job_id": job_id, "state": job.state}
+
+    if job.state == "PROGRESS":
+        response["progress"] = job.info
+    elif job.state == "SUCCESS":
+        response["result"] = job.result
+    elif job.state == "FAILURE":
+        response["error"] = str(job.result)
+
+    return response
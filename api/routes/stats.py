@@ -0,0 +1,184 @@
+"""Aggregate statistics API routes for the dashboard."""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import get_async_db
+from config.settings import settings
+from models.alert import Alert
+from models.event import Event
+from models.incident import Incident
+from models.rollup import AlertCountHour, EventCountHour
+from pipeline.rollups import RESOLUTIONS, as_datetime, truncate_time
+
+router = APIRouter()
+
+# Histogram bucket widths
+BUCKETS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# (days, bucket) -> (expires at, overview)
+_overview_cache: Dict[Tuple[int, str], Tuple[float, Dict[str, Any]]] = {}
+
+
+@router.get("/overview")
+async def get_overview(
+    days: int = 7, bucket: str = "day", db: AsyncSession = Depends(get_async_db)
+):
+    """Get dashboard counts and histograms.
+
+    Returns counts by status, priority, severity, source and event type, and
+    alert and event histograms over the last ``days`` days. Results are
+    cached for STATS_CACHE_TTL_SECONDS.
+    """
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=400, detail=f"bucket must be one of: {', '.join(BUCKETS)}"
+        )
+    if not 1 <= days <= 90:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 90")
+
+    key = (days, bucket)
+    cached = _overview_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    overview = await _compute_overview(db, days, bucket)
+    _overview_cache[key] = (
+        time.monotonic() + settings.STATS_CACHE_TTL_SECONDS,
+        overview,
+    )
+    return overview
+
+
+async def _compute_overview(db: AsyncSession, days: int, bucket: str) -> Dict[str, Any]:
+    """Run the aggregate queries."""
+    now = datetime.utcnow()
+    step = BUCKETS[bucket]
+    n_buckets = timedelta(days=days) // step
+    since = _bucket_start(now, bucket) - (n_buckets - 1) * step
+    alert_counts = await _count_by(db, Alert.status, Alert.priority)
+    incident_counts = await _count_by(db, Incident.status, Incident.severity)
+
+    # Hourly rollups serve any histogram whose buckets are made of whole hours
+    if _use_rollups(step):
+        event_counts = await _count_by(
+            db,
+            EventCountHour.source,
+            EventCountHour.event_type,
+            count=func.sum(EventCountHour.count),
+        )
+        event_histogram = await _histogram(
+            db,
+            EventCountHour.bucket,
+            EventCountHour.source,
+            func.sum(EventCountHour.count),
+            since,
+            now,
+            bucket,
+        )
+        alert_histogram = await _histogram(
+            db,
+            AlertCountHour.bucket,
+            AlertCountHour.priority,
+            func.sum(AlertCountHour.count),
+            since,
+            now,
+            bucket,
+        )
+    else:
+        event_counts = await _count_by(db, Event.source, Event.event_type)
+        event_histogram = await _histogram(
+            db, Event.created_at, Event.source, func.count(), since, now, bucket
+        )
+        alert_histogram = await _histogram(
+            db, Alert.created_at, Alert.priority, func.count(), since, now, bucket
+        )
+
+    return {
+        "alerts": {
+            "total": sum(alert_counts["status"].values()),
+            "by_status": alert_counts["status"],
+            "by_priority": alert_counts["priority"],
+        },
+        "incidents": {
+            "total": sum(incident_counts["status"].values()),
+            "by_status": incident_counts["status"],
+            "by_severity": incident_counts["severity"],
+        },
+        "events": {
+            "total": sum(event_counts["source"].values()),
+            "by_source": event_counts["source"],
+            "by_event_type": event_counts["event_type"],
+        },
+        "histograms": {"alerts": alert_histogram, "events": event_histogram},
+        "bucket": bucket,
+        "since": since.isoformat(),
+        "generated_at": now.isoformat(),
+    }
+
+
+def _use_rollups(step: timedelta) -> bool:
+    """Whether histogram buckets of width ``step`` can be built from rollups."""
+    return settings.ANALYTICS_USE_ROLLUPS and step % RESOLUTIONS["hour"] == timedelta(0)
+
+
+async def _count_by(
+    db: AsyncSession, *columns, count=None
+) -> Dict[str, Dict[str, int]]:
+    """Counts per value of each column, one GROUP BY query per column.
+
+    ``count`` is the aggregate to use, row counts by default.
+    """
+    count = func.count() if count is None else count
+    counts = {}
+    for column in columns:
+        rows = await db.execute(select(column, count).group_by(column))
+        counts[column.key] = {value.value: int(n) for value, n in rows}
+    return counts
+
+
+async def _histogram(
+    db: AsyncSession,
+    time_column,
+    column,
+    count,
+    since: datetime,
+    now: datetime,
+    bucket: str,
+) -> List[Dict[str, Any]]:
+    """``count`` per time bucket since ``since``, split by ``column``.
+
+    Every bucket up to ``now`` is present, with zero counts if empty.
+    """
+    bucket_expr = truncate_time(db.bind.dialect.name, time_column, bucket)
+    bucket_expr = bucket_expr.label("bucket")
+    rows = await db.execute(
+        select(bucket_expr, column, count)
+        .where(time_column >= since)
+        .group_by(bucket_expr, column)
+    )
+
+    step = BUCKETS[bucket]
+    histogram = {}
+    start = since
+    while start <= now:
+        histogram[start] = {"bucket": start.isoformat(), "total": 0, "counts": {}}
+        start += step
+    for bucket_start, value, n in rows:
+        entry = histogram.get(as_datetime(bucket_start))
+        if entry is not None:
+            entry["counts"][value.value] = int(n)
+            entry["total"] += int(n)
+    return list(histogram.values())
+
+
+def _bucket_start(moment: datetime, bucket: str) -> datetime:
+    """Start of the bucket containing ``moment``."""
+    if bucket == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -12,6 +12,7 @@ celery_app = Celery(
         "pipeline.tasks",
         "alerts.tasks",
         "integrations.tasks",
+        "ml.tasks",
     ],
 )
 
@@ -33,5 +34,9 @@ celery_app.conf.update(
             "task": "pipeline.tasks.correlate_events",
             "schedule": 600.0,  # Every 10 minutes
         },
+        "prune-rollup-counts": {
+            "task": "pipeline.tasks.prune_rollup_counts",
+            "schedule": 3600.0,  # Every hour
+        },
     },
 )
@@ -1,11 +1,16 @@
 """Database configuration and session management."""
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from config.settings import settings
 from models.base import Base
 
+# Async drivers used by the API for each database backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
 engine = create_engine(
     settings.DATABASE_URL, pool_pre_ping=True, pool_size=10, max_overflow=20
 )
@@ -13,6 +18,41 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_async_database_url(database_url: str) -> str:
+    """Return ``database_url`` with the backend's async driver.
+
+    postgresql:// (or postgresql+psycopg2://) becomes postgresql+asyncpg://
+    and sqlite:// becomes sqlite+aiosqlite://.
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for database backend: {url.drivername}")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+ASYNC_DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
+
+# aiosqlite connects per checkout (NullPool), so pool sizing only applies to
+# server databases
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    **(
+        {}
+        if make_url(ASYNC_DATABASE_URL).get_backend_name() == "sqlite"
+        else {"pool_size": 10, "max_overflow": 20}
+    ),
+)
+
+# Objects stay readable after commit, since async sessions cannot lazy-load
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
 def get_db():
     """Dependency for getting database session."""
     db = SessionLocal()
@@ -20,3 +60,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
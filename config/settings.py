@@ -59,9 +59,48 @@ class Settings(BaseSettings):
     PHANTOM_PASSWORD: Optional[str] = None
     PHANTOM_VERIFY_SSL: bool = False
 
+    # Ingestion
+    EVENT_BATCH_SIZE: int = 500
+    EVENT_BULK_MAX_RECORDS: int = 10000
+    ALERT_TASK_CHUNK_SIZE: int = 500
+    EVENT_STREAM_MAX_LINE_BYTES: int = 1024 * 1024
+    EVENT_STREAM_MAX_ERRORS: int = 100
+    # Sources are collected in parallel; one still running after the timeout
+    # is abandoned so it cannot hold back the others
+    COLLECTION_MAX_WORKERS: int = 4
+    COLLECTION_SOURCE_TIMEOUT_SECONDS: float = 120.0
+    COLLECTION_STOP_GRACE_SECONDS: float = 10.0
+    # Pulls stop this long before now, so events the source indexes late are
+    # not left behind the watermark; raise it for slow forwarders
+    COLLECTION_INGEST_LAG_SECONDS: float = 120.0
+    # A page claimed longer ago than this was left by a run that died while
+    # writing it; no run outlives the 30 minute Celery task time limit
+    COLLECTION_CLAIM_TIMEOUT_SECONDS: float = 1800.0
+
+    # Event context: "database" (grouped queries per batch), "redis" (sliding
+    # windows shared by all workers) or "memory" (sliding windows in each
+    # process). "memory" only counts the events its own process handled, so
+    # use it only with a single worker process (e.g. --pool=solo)
+    CONTEXT_BACKEND: str = "database"
+
     # ML
     ML_MODEL_PATH: str = "./models/alert_prioritizer.pkl"
     ML_RETRAIN_INTERVAL_HOURS: int = 24
+    ML_MODEL_KEEP_VERSIONS: int = 5
+    ML_MODEL_CHECK_INTERVAL_SECONDS: float = 5.0
+    # Anomaly detection: "batch" (IsolationForest refits) or "streaming"
+    # (half-space trees updated from every scored event)
+    ML_ANOMALY_MODE: str = "batch"
+    ML_TRAINING_CHUNK_SIZE: int = 1000
+
+    # Dashboard statistics
+    STATS_CACHE_TTL_SECONDS: float = 15.0
+    # Read event/alert counts from the rollup tables. Off until the rollups
+    # cover the data: run scripts/backfill_rollups.py once on a database that
+    # held events before they existed, then turn it on
+    ANALYTICS_USE_ROLLUPS: bool = False
+    # Per-minute event counts only serve short correlation windows
+    ROLLUP_MINUTE_RETENTION_HOURS: int = 48
 
     class Config:
         env_file = ".env"
@@ -62,6 +62,9 @@ PHANTOM_VERIFY_SSL=false
 # ML Model Configuration
 ML_MODEL_PATH=./models/alert_prioritizer.pkl
 ML_RETRAIN_INTERVAL_HOURS=24
+ML_MODEL_KEEP_VERSIONS=5
+ML_MODEL_CHECK_INTERVAL_SECONDS=5
+ML_ANOMALY_MODE=batch
 """
 
 # Write .env file
@@ -1,7 +1,8 @@
 """Base detector class."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
 
 from models.event import Event, EventSource, EventType
 
@@ -13,6 +14,8 @@ class BaseDetector(ABC):
         """Initialize detector with configuration."""
         self.config = config
         self.source = self.get_source()
+        # Collection position after the last page of events detected
+        self.checkpoint: Optional[Dict[str, Any]] = None
 
     @abstractmethod
     def get_source(self) -> EventSource:
@@ -36,14 +39,81 @@ class BaseDetector(ABC):
         """Normalize event data to common format."""
         pass
 
-    def detect_events(
+    def fetch_event_pages(
         self, start_time: str = None, end_time: str = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch events from the source page by page, oldest first.
+
+        Sources that can page through large windows override this; by
+        default the whole fetch is a single page.
+        """
+        yield self.fetch_events(start_time, end_time)
+
+    def get_event_time(self, raw_event: Dict[str, Any]) -> Optional[str]:
+        """Return the timestamp the source orders events by."""
+        return None
+
+    def get_event_id(self, raw_event: Dict[str, Any]) -> Optional[str]:
+        """Return an id telling apart events with the same timestamp."""
+        return None
+
+    def detect_events(
+        self,
+        start_time: str = None,
+        end_time: str = None,
+        checkpoint: Optional[Dict[str, Any]] = None,
     ) -> List[Event]:
-        """Detect and normalize events."""
+        """Detect and normalize events, see ``detect_event_pages``."""
+        return [
+            event
+            for page in self.detect_event_pages(start_time, end_time, checkpoint)
+            for event in page
+        ]
+
+    def detect_event_pages(
+        self,
+        start_time: str = None,
+        end_time: str = None,
+        checkpoint: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[List[Event]]:
+        """Detect and normalize events, one page of the source at a time.
+
+        With a ``checkpoint`` ({"watermark": ..., "boundary_ids": [...]}),
+        fetching resumes at the watermark and events already collected at
+        that exact timestamp are skipped; without one it starts at
+        ``start_time`` or the ``collect_since`` config value, which allows a
+        backfill. After every page ``self.checkpoint`` is the position after
+        the newest event fetched so far.
+
+        By default fetching stops ``ingest_lag_seconds`` (config) before now:
+        sources index events some time after their timestamp, and an event
+        indexed once the watermark has passed its timestamp would never be
+        fetched.
+        """
         if not self.connect():
             raise ConnectionError(f"Failed to connect to {self.source.value}")
 
-        raw_events = self.fetch_events(start_time, end_time)
+        if end_time is None:
+            lag = timedelta(seconds=self.config.get("ingest_lag_seconds") or 0)
+            end_time = (datetime.now(timezone.utc) - lag).isoformat()
+        if checkpoint:
+            start_time = checkpoint["watermark"]
+        elif start_time is None:
+            # First pull from the source: start where configured, or 5
+            # minutes before the end of the window
+            start_time = (
+                self.config.get("collect_since")
+                or (_parse_time(end_time) - timedelta(minutes=5)).isoformat()
+            )
+        self.checkpoint = checkpoint
+        for raw_events in self.fetch_event_pages(start_time, end_time):
+            if checkpoint:
+                raw_events = self._skip_seen(raw_events, checkpoint)
+            self.checkpoint = self._advance_checkpoint(raw_events, self.checkpoint)
+            yield self._normalize_events(raw_events)
+
+    def _normalize_events(self, raw_events: List[Dict[str, Any]]) -> List[Event]:
+        """Build unsaved Event objects from raw source events."""
         normalized_events = []
 
         for raw_event in raw_events:
@@ -70,6 +140,46 @@ class BaseDetector(ABC):
 
         return normalized_events
 
+    def _skip_seen(
+        self, raw_events: List[Dict[str, Any]], checkpoint: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Drop events collected by the run that wrote ``checkpoint``."""
+        watermark = _parse_time(checkpoint["watermark"])
+        seen = set(checkpoint.get("boundary_ids") or [])
+        return [
+            raw_event
+            for raw_event in raw_events
+            if _parse_time(self.get_event_time(raw_event)) != watermark
+            or self.get_event_id(raw_event) not in seen
+        ]
+
+    def _advance_checkpoint(
+        self,
+        raw_events: List[Dict[str, Any]],
+        checkpoint: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Position after the newest of ``raw_events``."""
+        newest = _parse_time(checkpoint["watermark"]) if checkpoint else None
+        boundary_ids = (
+            set(checkpoint.get("boundary_ids") or []) if checkpoint else set()
+        )
+
+        for raw_event in raw_events:
+            event_time = _parse_time(self.get_event_time(raw_event))
+            if event_time is None:
+                continue
+            if newest is None or event_time > newest:
+                newest = event_time
+                boundary_ids = set()
+            if event_time == newest:
+                event_id = self.get_event_id(raw_event)
+                if event_id is not None:
+                    boundary_ids.add(event_id)
+
+        if newest is None:
+            return checkpoint
+        return {"watermark": newest.isoformat(), "boundary_ids": sorted(boundary_ids)}
+
     def _classify_event_type(self, normalized_data: Dict[str, Any]) -> EventType:
         """Classify event type based on normalized data."""
         event_type_str = normalized_data.get("event_type", "").lower()
@@ -91,3 +201,18 @@ class BaseDetector(ABC):
                 return event_type
 
         return EventType.OTHER
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 string or epoch seconds to an aware UTC datetime."""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, tz=timezone.utc)
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
@@ -1,13 +1,42 @@
 """Elastic Security SIEM detector."""
 
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 from elasticsearch import Elasticsearch
 
 from detection.base import BaseDetector
 from models.event import EventSource
 
+DEFAULT_PAGE_SIZE = 1000
+PIT_KEEP_ALIVE = "1m"
+
+# Document fields read by normalize_event; nothing else is fetched
+SOURCE_FIELDS = [
+    "@timestamp",
+    "timestamp",
+    "source.ip",
+    "src_ip",
+    "source_ip",
+    "destination.ip",
+    "dest_ip",
+    "destination_ip",
+    "user.name",
+    "user",
+    "username",
+    "host.name",
+    "hostname",
+    "host",
+    "message",
+    "description",
+    "event.type",
+    "event_type",
+    "action",
+    "event.severity",
+    "severity",
+    "priority",
+]
+
 
 class ElasticDetector(BaseDetector):
     """Detector for Elastic Security SIEM."""
@@ -39,13 +68,30 @@ class ElasticDetector(BaseDetector):
         self, start_time: str = None, end_time: str = None
     ) -> List[Dict[str, Any]]:
         """Fetch events from Elasticsearch."""
+        return [
+            event
+            for page in self.fetch_event_pages(start_time, end_time)
+            for event in page
+        ]
+
+    def fetch_event_pages(
+        self, start_time: str = None, end_time: str = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Page through the time range with a point in time and search_after.
+
+        Pages hold up to ``page_size`` documents, oldest first, and paging
+        stops after ``max_results`` documents if set. The point in time keeps
+        the pages consistent while new documents are being indexed.
+        """
         if not start_time:
             start_time = (datetime.utcnow() - timedelta(minutes=5)).isoformat()
         if not end_time:
             end_time = datetime.utcnow().isoformat()
 
         # Default indices - can be customized
-        indices = self.config.get("indices", "logstash-*,filebeat-*")
+        indices = self.config.get("indices") or "logstash-*,filebeat-*"
+        page_size = self.config.get("page_size") or DEFAULT_PAGE_SIZE
+        max_results = self.config.get("max_results")
 
         query = {
             "bool": {
@@ -59,24 +105,70 @@ class ElasticDetector(BaseDetector):
         if self.config.get("custom_query"):
             query["bool"]["must"].append(self.config.get("custom_query"))
 
+        pit_id = None
+        fetched = 0
+        search_after = None
         try:
-            response = self.es.search(
-                index=indices,
-                body={
-                    "query": query,
-                    "size": self.config.get("max_results", 1000),
-                    "sort": [{"@timestamp": {"order": "desc"}}],
-                },
-            )
-
-            events = []
-            for hit in response.get("hits", {}).get("hits", []):
-                events.append(hit.get("_source", {}))
-
-            return events
+            pit_id = self.es.open_point_in_time(
+                index=indices, keep_alive=PIT_KEEP_ALIVE
+            )["id"]
+
+            while True:
+                size = page_size
+                if max_results is not None:
+                    size = min(size, max_results - fetched)
+                if size <= 0:
+                    return
+
+                search_kwargs = {}
+                if search_after is not None:
+                    search_kwargs["search_after"] = search_after
+                response = self.es.search(
+                    pit={"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+                    query=query,
+                    size=size,
+                    # _shard_doc breaks @timestamp ties for search_after
+                    sort=[{"@timestamp": "asc"}, {"_shard_doc": "asc"}],
+                    source=SOURCE_FIELDS,
+                    track_total_hits=False,
+                    **search_kwargs,
+                )
+                pit_id = response.get("pit_id", pit_id)
+                hits = response.get("hits", {}).get("hits", [])
+
+                if hits:
+                    yield [
+                        {
+                            **hit.get("_source", {}),
+                            "_id": hit.get("_id"),
+                            "_index": hit.get("_index"),
+                        }
+                        for hit in hits
+                    ]
+                fetched += len(hits)
+                if len(hits) < size:
+                    return
+                search_after = hits[-1]["sort"]
         except Exception as e:
+            # Raised, so a failed fetch is not taken for the end of the events
             print(f"Error fetching Elasticsearch events: {e}")
-            return []
+            raise
+        finally:
+            if pit_id:
+                try:
+                    self.es.close_point_in_time(id=pit_id)
+                except Exception as e:
+                    print(f"Error closing Elasticsearch point in time: {e}")
+
+    def get_event_time(self, raw_event: Dict[str, Any]) -> Optional[str]:
+        """Return the document's @timestamp."""
+        return raw_event.get("@timestamp")
+
+    def get_event_id(self, raw_event: Dict[str, Any]) -> Optional[str]:
+        """Return the index and id identifying the document."""
+        if raw_event.get("_id") is None:
+            return None
+        return f"{raw_event.get('_index')}/{raw_event.get('_id')}"
 
     def normalize_event(self, raw_event: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize Elasticsearch event to common format."""
@@ -1,13 +1,44 @@
 """Splunk SIEM detector."""
 
+import json
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 from splunklib import client as splunk_client
+from splunklib import results
 
 from detection.base import BaseDetector
 from models.event import EventSource
 
+DEFAULT_PAGE_SIZE = 1000
+
+
+class StreamingJSONResultsReader(results.JSONResultsReader):
+    """JSONResultsReader that parses an export stream as it arrives.
+
+    The SDK reader calls readlines() on the stream, which holds the whole
+    response in memory before the first result is returned; this one reads
+    and parses one line at a time.
+    """
+
+    def _parse_results(self, stream):
+        """Parse results and messages out of *stream*, line by line."""
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            parsed_line = json.loads(line)
+            if "preview" in parsed_line:
+                self.is_preview = parsed_line["preview"]
+            for message in parsed_line.get("messages") or []:
+                yield results.Message(
+                    message.get("type", "Unknown Message Type"), message.get("text")
+                )
+            if "result" in parsed_line:
+                yield parsed_line["result"]
+            for result in parsed_line.get("results") or []:
+                yield result
+
 
 class SplunkDetector(BaseDetector):
     """Detector for Splunk SIEM."""
@@ -34,6 +65,21 @@ class SplunkDetector(BaseDetector):
         self, start_time: str = None, end_time: str = None
     ) -> List[Dict[str, Any]]:
         """Fetch events from Splunk."""
+        return [
+            event
+            for page in self.fetch_event_pages(start_time, end_time)
+            for event in page
+        ]
+
+    def fetch_event_pages(
+        self, start_time: str = None, end_time: str = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the search's results from the export endpoint.
+
+        Results are parsed as they arrive and yielded in pages of
+        ``page_size``, so memory stays bounded by the page size however many
+        events the search returns. ``max_results``, if set, caps the run.
+        """
         if not start_time:
             start_time = (datetime.utcnow() - timedelta(minutes=5)).strftime(
                 "%Y-%m-%dT%H:%M:%S"
@@ -41,31 +87,73 @@ class SplunkDetector(BaseDetector):
         if not end_time:
             end_time = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
 
-        # Default search query - can be customized
-        search_query = self.config.get(
-            "search_query",
-            "search index=* earliest={} latest={} | head 1000".format(
-                start_time, end_time
-            ),
+        page_size = self.config.get("page_size") or DEFAULT_PAGE_SIZE
+        max_results = self.config.get("max_results")
+
+        # Default search query - can be customized. Oldest first, so a run
+        # that stops early still ends at a point the next one can resume from.
+        # sort is a blocking command: the search head gathers and sorts every
+        # event of the window before the first result streams, so its cost
+        # grows with the window, not with max_results. After the first pull
+        # the window is the time since the last run; keep backfills
+        # (collect_since) short for the same reason
+        search_query = (
+            self.config.get("search_query") or "search index=* | sort 0 _time"
         )
+        if max_results and not self.config.get("search_query"):
+            search_query += f" | head {max_results}"
 
+        stream = None
+        fetched = 0
         try:
-            kwargs = {
-                "earliest_time": start_time,
-                "latest_time": end_time,
-                "count": self.config.get("max_results", 1000),
-            }
+            stream = self.splunk.jobs.export(
+                search_query,
+                earliest_time=start_time,
+                latest_time=end_time,
+                output_mode="json",
+                # Final results only: preview rounds would resend results
+                preview=False,
+            )
+            reader = StreamingJSONResultsReader(stream)
+            page = []
 
-            search_results = self.splunk.jobs.oneshot(search_query, **kwargs)
-            events = []
+            for result in reader:
+                if isinstance(result, results.Message):
+                    if result.type == "FATAL":
+                        raise RuntimeError(f"Splunk search FATAL: {result.message}")
+                    if result.type == "ERROR":
+                        print(f"Splunk search ERROR: {result.message}")
+                    continue
+                if reader.is_preview:
+                    continue
 
-            for result in search_results:
-                events.append(dict(result))
+                page.append(result)
+                fetched += 1
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+                if max_results and fetched >= max_results:
+                    break
 
-            return events
+            if page:
+                yield page
         except Exception as e:
+            # Raised, so a failed export is not taken for the end of the events
             print(f"Error fetching Splunk events: {e}")
-            return []
+            raise
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def get_event_time(self, raw_event: Dict[str, Any]) -> Optional[str]:
+        """Return the Splunk event time."""
+        return raw_event.get("_time")
+
+    def get_event_id(self, raw_event: Dict[str, Any]) -> Optional[str]:
+        """Return the bucket and offset identifying the event in its index."""
+        if raw_event.get("_cd") is None:
+            return None
+        return f"{raw_event.get('_bkt')}|{raw_event.get('_cd')}"
 
     def normalize_event(self, raw_event: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize Splunk event to common format."""
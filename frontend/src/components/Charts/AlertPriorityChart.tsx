@@ -1,8 +1,6 @@
 import { PieChart, Pie, Cell, ResponsiveContainer, Legend, Tooltip } from 'recharts'
-import { Alert } from '../../lib/api'
-
 interface AlertPriorityChartProps {
-  alerts: Alert[]
+  counts: Record<string, number>
 }
 
 const COLORS = {
@@ -13,13 +11,13 @@ const COLORS = {
   info: '#6b7280',
 }
 
-export default function AlertPriorityChart({ alerts }: AlertPriorityChartProps) {
+export default function AlertPriorityChart({ counts }: AlertPriorityChartProps) {
   const data = [
-    { name: 'Critical', value: alerts.filter((a) => a.priority === 'critical').length, color: COLORS.critical },
-    { name: 'High', value: alerts.filter((a) => a.priority === 'high').length, color: COLORS.high },
-    { name: 'Medium', value: alerts.filter((a) => a.priority === 'medium').length, color: COLORS.medium },
-    { name: 'Low', value: alerts.filter((a) => a.priority === 'low').length, color: COLORS.low },
-    { name: 'Info', value: alerts.filter((a) => a.priority === 'info').length, color: COLORS.info },
+    { name: 'Critical', value: counts.critical || 0, color: COLORS.critical },
+    { name: 'High', value: counts.high || 0, color: COLORS.high },
+    { name: 'Medium', value: counts.medium || 0, color: COLORS.medium },
+    { name: 'Low', value: counts.low || 0, color: COLORS.low },
+    { name: 'Info', value: counts.info || 0, color: COLORS.info },
   ].filter((item) => item.value > 0)
 
   return (
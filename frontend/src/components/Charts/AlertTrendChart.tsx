@@ -1,28 +1,20 @@
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
-import { Alert } from '../../lib/api'
-import { format, subDays, isSameDay } from 'date-fns'
+import { StatsHistogramBucket } from '../../lib/api'
+import { format } from 'date-fns'
 
 interface AlertTrendChartProps {
-  alerts: Alert[]
-  days?: number
+  histogram: StatsHistogramBucket[]
 }
 
-export default function AlertTrendChart({ alerts, days = 7 }: AlertTrendChartProps) {
-  const dates = Array.from({ length: days }, (_, i) => subDays(new Date(), days - 1 - i))
-
-  const data = dates.map((date) => {
-    const dayAlerts = alerts.filter((alert) =>
-      isSameDay(new Date(alert.created_at), date)
-    )
-    return {
-      date: format(date, 'MMM dd'),
-      Critical: dayAlerts.filter((a) => a.priority === 'critical').length,
-      High: dayAlerts.filter((a) => a.priority === 'high').length,
-      Medium: dayAlerts.filter((a) => a.priority === 'medium').length,
-      Low: dayAlerts.filter((a) => a.priority === 'low').length,
-      Total: dayAlerts.length,
-    }
-  })
+export default function AlertTrendChart({ histogram }: AlertTrendChartProps) {
+  const data = histogram.map((bucket) => ({
+    date: format(new Date(bucket.bucket), 'MMM dd'),
+    Critical: bucket.counts.critical || 0,
+    High: bucket.counts.high || 0,
+    Medium: bucket.counts.medium || 0,
+    Low: bucket.counts.low || 0,
+    Total: bucket.total,
+  }))
 
   return (
     <ResponsiveContainer width="100%" height={300}>
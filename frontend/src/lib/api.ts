@@ -87,21 +87,65 @@ export interface MLDetectionResult {
 
 export interface MLStats {
   anomaly_detector_trained: boolean
+  anomaly_mode: 'batch' | 'streaming' | string
   events_in_window: number
+  anomalies_in_window: number
+  anomaly_rate: number
+  attack_types: Record<string, number>
+  risk_levels: Record<string, number>
+  events_processed: number
   patterns_loaded: number
+  last_updated: string | null
+  source: 'pipeline' | 'api'
+}
+
+export interface MLTrainingJob {
+  job_id: string
+  state: 'PENDING' | 'STARTED' | 'PROGRESS' | 'SUCCESS' | 'FAILURE' | string
+  progress?: {
+    stage: 'loading' | 'fitting'
+    processed: number
+    total: number
+    timings: Record<string, number>
+  }
+  result?: {
+    status: string
+    events_used?: number
+    events_missing?: number
+    timings?: Record<string, number>
+    model?: Record<string, unknown> | null
+    error?: string
+  }
+  error?: string
+}
+
+export interface StatsHistogramBucket {
+  bucket: string
+  total: number
+  counts: Record<string, number>
+}
+
+export interface StatsOverview {
+  alerts: { total: number; by_status: Record<string, number>; by_priority: Record<string, number> }
+  incidents: { total: number; by_status: Record<string, number>; by_severity: Record<string, number> }
+  events: { total: number; by_source: Record<string, number>; by_event_type: Record<string, number> }
+  histograms: { alerts: StatsHistogramBucket[]; events: StatsHistogramBucket[] }
+  bucket: 'day' | 'hour'
+  since: string
+  generated_at: string
 }
 
 // Events API
 export const eventsApi = {
   create: (event: Partial<Event>) => api.post<Event>('/events/', event),
-  getAll: (params?: { skip?: number; limit?: number; source?: string; event_type?: string }) =>
+  getAll: (params?: { skip?: number; limit?: number; cursor?: string; source?: string; event_type?: string }) =>
     api.get<Event[]>('/events/', { params }),
   getById: (id: number) => api.get<Event>(`/events/${id}`),
 }
 
 // Alerts API
 export const alertsApi = {
-  getAll: (params?: { skip?: number; limit?: number; status?: string; priority?: string }) =>
+  getAll: (params?: { skip?: number; limit?: number; cursor?: string; status?: string; priority?: string }) =>
     api.get<Alert[]>('/alerts/', { params }),
   getCritical: (limit: number = 50) => api.get<Alert[]>(`/alerts/critical?limit=${limit}`),
   getById: (id: number) => api.get<Alert>(`/alerts/${id}`),
@@ -112,12 +156,18 @@ export const alertsApi = {
 // Incidents API
 export const incidentsApi = {
   create: (incident: Partial<Incident>) => api.post<Incident>('/incidents/', incident),
-  getAll: (params?: { skip?: number; limit?: number; status?: string; severity?: string }) =>
+  getAll: (params?: { skip?: number; limit?: number; cursor?: string; status?: string; severity?: string }) =>
     api.get<Incident[]>('/incidents/', { params }),
   getById: (id: number) => api.get<Incident>(`/incidents/${id}`),
   update: (id: number, update: IncidentUpdate) => api.patch<Incident>(`/incidents/${id}`, update),
 }
 
+// Stats API
+export const statsApi = {
+  getOverview: (params?: { days?: number; bucket?: 'day' | 'hour' }) =>
+    api.get<StatsOverview>('/stats/overview', { params }),
+}
+
 // Health API
 export const healthApi = {
   check: () => axios.get('http://localhost:8000/health'),
@@ -128,7 +178,8 @@ export const mlApi = {
   detect: (eventId: number) => api.post<MLDetectionResult>(`/ml/detect/${eventId}`),
   classify: (eventId: number) => api.post<{ event_id: number; classification: MLClassification }>(`/ml/classify/${eventId}`),
   getStats: () => api.get<MLStats>('/ml/stats'),
-  updateModels: (eventIds: number[]) => api.post<{ status: string; events_used: number; message: string }>('/ml/update-models', eventIds),
+  updateModels: (eventIds: number[]) => api.post<{ status: string; job_id: string; events_requested: number; message: string }>('/ml/update-models', eventIds),
+  getTrainingJob: (jobId: string) => api.get<MLTrainingJob>(`/ml/jobs/${jobId}`),
 }
 
 export default api
@@ -1,6 +1,6 @@
 import { useQuery } from '@tanstack/react-query'
 import { AlertTriangle, FileText, Activity, Plus } from 'lucide-react'
-import { alertsApi, incidentsApi, eventsApi } from '../lib/api'
+import { alertsApi, incidentsApi, statsApi } from '../lib/api'
 import StatCard from '../components/StatCard'
 import AlertCard from '../components/AlertCard'
 import AlertPriorityChart from '../components/Charts/AlertPriorityChart'
@@ -13,26 +13,24 @@ export default function Dashboard() {
     queryFn: () => alertsApi.getCritical(10).then((res) => res.data),
   })
 
-  const { data: alerts } = useQuery({
-    queryKey: ['alerts'],
-    queryFn: () => alertsApi.getAll({ limit: 100 }).then((res) => res.data),
-  })
-
   const { data: incidents } = useQuery({
-    queryKey: ['incidents'],
-    queryFn: () => incidentsApi.getAll({ limit: 100 }).then((res) => res.data),
+    queryKey: ['incidents', 'recent'],
+    queryFn: () => incidentsApi.getAll({ limit: 5 }).then((res) => res.data),
   })
 
-  const { data: events } = useQuery({
-    queryKey: ['events'],
-    queryFn: () => eventsApi.getAll({ limit: 100 }).then((res) => res.data),
+  // Counts and charts are aggregated server-side over all rows
+  const { data: overview } = useQuery({
+    queryKey: ['stats', 'overview'],
+    queryFn: () => statsApi.getOverview({ days: 7 }).then((res) => res.data),
   })
 
+  const alertStatus = overview?.alerts.by_status || {}
+  const incidentStatus = overview?.incidents.by_status || {}
   const stats = {
-    criticalAlerts: alerts?.filter((a) => a.priority === 'critical').length || 0,
-    totalAlerts: alerts?.filter((a) => a.status !== 'resolved').length || 0,
-    activeIncidents: incidents?.filter((i) => i.status !== 'closed').length || 0,
-    totalEvents: events?.length || 0,
+    criticalAlerts: overview?.alerts.by_priority.critical || 0,
+    totalAlerts: (overview?.alerts.total || 0) - (alertStatus.resolved || 0),
+    activeIncidents: (overview?.incidents.total || 0) - (incidentStatus.closed || 0),
+    totalEvents: overview?.events.total || 0,
   }
 
   return (
@@ -137,8 +135,8 @@ export default function Dashboard() {
         <div>
           <h2 className="text-xl font-bold mb-4">Alert Priority Distribution</h2>
           <div className="card">
-            {alerts && alerts.length > 0 ? (
-              <AlertPriorityChart alerts={alerts} />
+            {overview && overview.alerts.total > 0 ? (
+              <AlertPriorityChart counts={overview.alerts.by_priority} />
             ) : (
               <p className="text-slate-400 text-center py-8">No alerts data</p>
             )}
@@ -150,8 +148,8 @@ export default function Dashboard() {
       <div>
         <h2 className="text-2xl font-bold mb-4">Alert Trends (Last 7 Days)</h2>
         <div className="card">
-          {alerts && alerts.length > 0 ? (
-            <AlertTrendChart alerts={alerts} days={7} />
+          {overview && overview.alerts.total > 0 ? (
+            <AlertTrendChart histogram={overview.histograms.alerts} />
           ) : (
             <p className="text-slate-400 text-center py-8">No alerts data</p>
           )}
@@ -54,6 +54,9 @@ export default function MLStats() {
           </div>
           <p className="text-sm text-slate-400">
             Events currently in the ML processing window (last 100 events)
+            {stats?.events_in_window
+              ? `, ${stats.anomalies_in_window} anomalous (${(stats.anomaly_rate * 100).toFixed(1)}%)`
+              : ''}
           </p>
         </div>
 
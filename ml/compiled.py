@@ -0,0 +1,225 @@
+"""Flat numpy evaluators for fitted tree ensembles.
+
+scikit-learn's predict paths validate input and loop over the trees in
+Python, which dominates the cost of scoring one or a few rows. The compiled
+models flatten every tree of an ensemble into shared arrays (feature,
+threshold, left/right child, leaf value) and walk all trees for a whole
+batch with a handful of vectorized steps per tree level.
+
+The walk does per row what scikit-learn's Cython code does, only without the
+per-call overhead, so large batches are handed back to the wrapped
+scikit-learn model. ``max_batch`` sets the crossover; None always uses the
+compiled path.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+from scipy.special import expit
+from sklearn.dummy import DummyClassifier, DummyRegressor
+from sklearn.ensemble import GradientBoostingClassifier, IsolationForest
+from sklearn.ensemble._iforest import _average_path_length
+
+
+class TreeEnsemble:
+    """All nodes of a list of fitted trees stored in contiguous arrays.
+
+    Nodes are renumbered breadth-first so that the right child of every split
+    directly follows its left child; one walk step is then
+    ``node = left[node] + (x > threshold[node])``. Leaves point to themselves
+    with an infinite threshold, so the walk runs a fixed number of steps.
+    """
+
+    def __init__(
+        self,
+        trees: List,
+        leaf_values: List[np.ndarray],
+        feature_maps: Optional[List[np.ndarray]] = None,
+    ):
+        """Flatten ``trees``.
+
+        ``leaf_values[i]`` holds one value per node of tree i. ``feature_maps[i]``
+        maps the feature indices of a tree fitted on a column subset back to
+        input columns.
+        """
+        features, thresholds, lefts, values, roots = [], [], [], [], []
+        offset = 0
+        self.max_depth = 0
+        for i, (tree, node_values) in enumerate(zip(trees, leaf_values)):
+            tree_ = tree.tree_
+            order = _sibling_order(tree_.children_left, tree_.children_right)
+            new_ids = np.empty_like(order)
+            new_ids[order] = np.arange(len(order))
+
+            children_left = tree_.children_left[order]
+            is_leaf = children_left == -1
+            node_features = np.where(is_leaf, 0, tree_.feature[order])
+            if feature_maps is not None:
+                node_features = np.asarray(feature_maps[i])[node_features]
+
+            roots.append(offset)
+            features.append(node_features)
+            thresholds.append(np.where(is_leaf, np.inf, tree_.threshold[order]))
+            lefts.append(
+                np.where(is_leaf, np.arange(len(order)), new_ids[children_left])
+                + offset
+            )
+            values.append(np.asarray(node_values, dtype=np.float64)[order])
+            self.max_depth = max(self.max_depth, tree_.max_depth)
+            offset += tree_.node_count
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.intp)
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the ensemble."""
+        return len(self.roots)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Return the leaf node reached in every tree, shape (n_samples, n_trees)."""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_samples, n_features = X.shape
+        X_flat = X.ravel()
+        row_offsets = (np.arange(n_samples) * n_features)[:, np.newaxis]
+        nodes = np.repeat(self.roots[np.newaxis, :], n_samples, axis=0)
+        for _ in range(self.max_depth):
+            x = X_flat.take(row_offsets + self.feature.take(nodes))
+            nodes = self.left.take(nodes) + (x > self.threshold.take(nodes))
+        return nodes
+
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """Return the value of the reached leaf in every tree."""
+        return self.value.take(self.apply(X))
+
+
+def _sibling_order(children_left: np.ndarray, children_right: np.ndarray) -> np.ndarray:
+    """Breadth-first node order that keeps each left/right pair adjacent."""
+    order = [0]
+    for node in order:
+        if children_left[node] != -1:
+            order.append(children_left[node])
+            order.append(children_right[node])
+    return np.asarray(order, dtype=np.intp)
+
+
+class CompiledGradientBoosting:
+    """Array-based replacement for ``GradientBoostingClassifier.predict_proba``."""
+
+    def __init__(
+        self, model: GradientBoostingClassifier, max_batch: Optional[int] = 32
+    ):
+        """Compile a fitted gradient boosting classifier."""
+        if model.init_ != "zero" and not isinstance(
+            model.init_, (DummyClassifier, DummyRegressor)
+        ):
+            raise ValueError("Only constant init estimators can be compiled")
+
+        n_stages, self.n_outputs = model.estimators_.shape
+        trees = [
+            model.estimators_[i, k]
+            for i in range(n_stages)
+            for k in range(self.n_outputs)
+        ]
+        self.ensemble = TreeEnsemble(
+            trees, [tree.tree_.value[:, 0, 0] for tree in trees]
+        )
+        self.model = model
+        self.max_batch = max_batch
+        self.n_stages = n_stages
+        self.learning_rate = model.learning_rate
+        self.n_features_in_ = model.n_features_in_
+        self.classes_ = model.classes_
+        # The prior of a constant init estimator does not depend on X
+        self.init_raw = model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0]
+        # Binary exponential loss scores are half log-odds
+        self.raw_scale = 2.0 if model.loss == "exponential" else 1.0
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """Raw scores, shape (n_samples, n_outputs)."""
+        values = self.ensemble.leaf_values(X)
+        values = values.reshape(len(values), self.n_stages, self.n_outputs)
+        return self.init_raw + self.learning_rate * values.sum(axis=1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities, shape (n_samples, n_classes)."""
+        if self.max_batch is not None and len(X) > self.max_batch:
+            return self.model.predict_proba(X)
+
+        raw = self.decision_function(X)
+        if self.n_outputs == 1:
+            positive = expit(self.raw_scale * raw[:, 0])
+            return np.column_stack([1.0 - positive, positive])
+
+        proba = np.exp(raw - raw.max(axis=1, keepdims=True))
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted class labels."""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class CompiledIsolationForest:
+    """Array-based replacement for ``IsolationForest`` scoring."""
+
+    def __init__(self, model: IsolationForest, max_batch: Optional[int] = 512):
+        """Compile a fitted isolation forest."""
+        self.model = model
+        self.max_batch = max_batch
+        self.n_features_in_ = model.n_features_in_
+        self.offset_ = model.offset_
+        self.denominator = (
+            len(model.estimators_) * _average_path_length([model._max_samples])[0]
+        )
+
+        node_depths = []
+        for tree_idx in range(len(model.estimators_)):
+            # Path length to each node plus the expected remaining path length
+            node_depths.append(
+                model._decision_path_lengths[tree_idx]
+                + model._average_path_length_per_tree[tree_idx]
+                - 1.0
+            )
+        subsample_features = model._max_features != model.n_features_in_
+        self.ensemble = TreeEnsemble(
+            model.estimators_,
+            node_depths,
+            model.estimators_features_ if subsample_features else None,
+        )
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Opposite of the anomaly score; lower is more abnormal."""
+        if self.max_batch is not None and len(X) > self.max_batch:
+            return self.model.score_samples(X)
+
+        depths = self.ensemble.leaf_values(X).sum(axis=1)
+        if self.denominator == 0:
+            return -np.ones(len(depths))
+        return -(2 ** (-depths / self.denominator))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """Shifted scores; negative values are anomalies."""
+        return self.score_samples(X) - self.offset_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Return -1 for anomalies and 1 for inliers."""
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+
+def compile_model(model):
+    """Compile a fitted ensemble, or return None if it cannot be compiled."""
+    try:
+        if isinstance(model, GradientBoostingClassifier) and hasattr(
+            model, "estimators_"
+        ):
+            return CompiledGradientBoosting(model)
+        if isinstance(model, IsolationForest) and hasattr(model, "estimators_"):
+            return CompiledIsolationForest(model)
+    except Exception as e:
+        print(f"Error compiling model: {e}. Using scikit-learn inference.")
+    return None
@@ -1,53 +1,97 @@
 """Real-time anomaly detection and alert classification system."""
 
-import os
-import pickle
 from collections import deque
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+from sklearn.base import clone
 from sklearn.cluster import DBSCAN
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
+from config.settings import settings
+from ml.ioc import IGNORED_IPS, extract_iocs
+from ml.ip_encoding import IP_FEATURE_COUNT, encode_ip
+from ml.registry import get_model_registry
+from ml.stats import MLWindowStats
+from ml.streaming import StreamingAnomalyModel
 from models.alert import AlertPriority
 from models.event import Event, EventType
+from utils.keyword_matcher import get_keyword_matcher
 
 
 class RealTimeAnomalyDetector:
     """Real-time anomaly detection using Isolation Forest."""
 
+    # Nine event features plus the encoding of both IP addresses
+    N_FEATURES = 9 + 2 * IP_FEATURE_COUNT
+
     def __init__(
         self,
         model_path: str = "./models/anomaly_detector.pkl",
         contamination: float = 0.1,
+        mode: str = None,
     ):
         """Initialize the anomaly detector."""
         self.model_path = model_path
         self.contamination = contamination  # Expected proportion of anomalies
+        self.mode = mode or settings.ML_ANOMALY_MODE
         self.model = None
+        self.compiled_model = None
+        self._model_entry = None
         self.scaler = StandardScaler()
         self.feature_history = deque(maxlen=1000)  # Keep last 1000 events for training
         self.is_trained = False
-        self._load_or_create_model()
+        self.stream_model = None
+        if self.mode == "streaming":
+            # Learns per event from the feature stream instead of refitting
+            self.stream_model = StreamingAnomalyModel(
+                self.N_FEATURES,
+                contamination=contamination,
+                history_size=self.feature_history.maxlen,
+            )
+        else:
+            self._load_or_create_model()
 
     def _load_or_create_model(self):
         """Load existing model or create a new one."""
-        if os.path.exists(self.model_path):
-            try:
-                with open(self.model_path, "rb") as f:
-                    saved_data = pickle.load(f)
-                    self.model = saved_data.get("model")
-                    self.scaler = saved_data.get("scaler", StandardScaler())
-                    self.is_trained = saved_data.get("is_trained", False)
-                print(f"Loaded anomaly detection model from {self.model_path}")
-            except Exception as e:
-                print(f"Error loading model: {e}. Creating new model.")
-                self._create_new_model()
+        try:
+            entry = get_model_registry().get(self.model_path)
+        except Exception as e:
+            print(f"Error loading model: {e}. Creating new model.")
+            entry = None
+
+        self._model_entry = entry
+        if entry is not None:
+            saved_data = entry.data
+            self.model = saved_data.get("model")
+            self.scaler = saved_data.get("scaler", StandardScaler())
+            self.is_trained = saved_data.get("is_trained", False)
+            self.compiled_model = entry.compiled("model")
+            print(f"Loaded anomaly detection model from {self.model_path}")
+
+            n_features = getattr(self.model, "n_features_in_", self.N_FEATURES)
+            if self.is_trained and n_features != self.N_FEATURES:
+                # Trained on an older feature layout; retrain before use
+                print(
+                    f"Anomaly detection model expects {n_features} features, "
+                    f"current layout has {self.N_FEATURES}. Treating it as untrained."
+                )
+                self.is_trained = False
+                self.compiled_model = None
         else:
             self._create_new_model()
 
+    def _sync_model(self):
+        """Switch to the shared model if the model file changed."""
+        try:
+            entry = get_model_registry().get(self.model_path)
+        except Exception:
+            return
+        if entry is not None and entry is not self._model_entry:
+            self._load_or_create_model()
+
     def _create_new_model(self):
         """Create a new anomaly detection model."""
         self.model = IsolationForest(
@@ -56,6 +100,7 @@ class RealTimeAnomalyDetector:
             n_estimators=100,
             max_samples="auto",
         )
+        self.compiled_model = None
         self.is_trained = False
         print("Created new anomaly detection model")
 
@@ -108,9 +153,9 @@ class RealTimeAnomalyDetector:
             hour = 0.5
             day_of_week = 0.5
 
-        # IP features (hash-based encoding)
-        source_ip_hash = hash(event.source_ip or "unknown") % 1000 / 1000.0
-        dest_ip_hash = hash(event.destination_ip or "unknown") % 1000 / 1000.0
+        # IP features (network buckets and stable hash)
+        source_ip_features = encode_ip(event.source_ip)
+        dest_ip_features = encode_ip(event.destination_ip)
 
         # Description length (anomalies often have longer descriptions)
         desc_length = len(event.description or "") / 500.0  # Normalize
@@ -126,8 +171,8 @@ class RealTimeAnomalyDetector:
                     similar_events,
                     hour,
                     day_of_week,
-                    source_ip_hash,
-                    dest_ip_hash,
+                    *source_ip_features,
+                    *dest_ip_features,
                     desc_length,
                 ]
             ]
@@ -139,32 +184,90 @@ class RealTimeAnomalyDetector:
         self, event: Event, context: Dict[str, Any] = None
     ) -> Tuple[bool, float]:
         """Detect if event is an anomaly."""
-        features = self.extract_features(event, context)
+        return self.detect_anomalies([event], [context])[0]
+
+    def detect_anomalies(
+        self, events: List[Event], contexts: List[Dict[str, Any]] = None
+    ) -> List[Tuple[bool, float]]:
+        """Detect anomalies for a batch of events with one model pass."""
+        if not events:
+            return []
+        contexts = contexts or [None] * len(events)
+        if self.stream_model is not None:
+            return self._detect_anomalies_streaming(events, contexts)
+        self._sync_model()
 
         # If not trained, use simple heuristic
         if not self.is_trained or self.model is None:
-            return self._heuristic_anomaly_detection(event, context), 0.5
+            return self._heuristic_results(events, contexts)
 
         try:
+            features = self.extract_features_batch(events, contexts)
+
             # Scale features
             if hasattr(self.scaler, "mean_"):
                 features_scaled = self.scaler.transform(features)
             else:
                 features_scaled = features
 
-            # Predict anomaly (-1 for anomaly, 1 for normal)
-            prediction = self.model.predict(features_scaled)[0]
-            is_anomaly = prediction == -1
-
-            # Get anomaly score (lower = more anomalous)
-            anomaly_score = self.model.score_samples(features_scaled)[0]
-            # Normalize to 0-1 (0 = most anomalous, 1 = most normal)
-            normalized_score = 1.0 / (1.0 + np.exp(-anomaly_score))  # Sigmoid
+            # Get anomaly score (lower = more anomalous) once and derive the
+            # prediction from it like IsolationForest.predict does
+            model = self.compiled_model or self.model
+            anomaly_scores = model.score_samples(features_scaled)
+            return self._score_results(anomaly_scores, model.offset_)
+        except Exception as e:
+            print(f"Error in anomaly detection: {e}")
+            return self._heuristic_results(events, contexts)
 
-            return is_anomaly, normalized_score
+    def _detect_anomalies_streaming(
+        self, events: List[Event], contexts: List[Dict[str, Any]]
+    ) -> List[Tuple[bool, float]]:
+        """Score events with the streaming model, then learn from them."""
+        try:
+            features = self.extract_features_batch(events, contexts)
+            self.feature_history.extend(features)
+            anomaly_scores = self.stream_model.score_and_learn(features)
+            self.is_trained = self.stream_model.is_ready
+            if anomaly_scores is None or not self.is_trained:
+                return self._heuristic_results(events, contexts)
+            return self._score_results(anomaly_scores, self.stream_model.offset_)
         except Exception as e:
             print(f"Error in anomaly detection: {e}")
-            return self._heuristic_anomaly_detection(event, context), 0.5
+            return self._heuristic_results(events, contexts)
+
+    def extract_features_batch(
+        self, events: List[Event], contexts: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Stack the features of a batch of events."""
+        return np.vstack(
+            [
+                self.extract_features(event, context)
+                for event, context in zip(events, contexts)
+            ]
+        )
+
+    def _score_results(
+        self, anomaly_scores: np.ndarray, offset: float
+    ) -> List[Tuple[bool, float]]:
+        """Turn raw scores into (is_anomaly, normalized score) pairs."""
+        is_anomaly = anomaly_scores - offset < 0
+
+        # Normalize to 0-1 (0 = most anomalous, 1 = most normal)
+        normalized_scores = 1.0 / (1.0 + np.exp(-anomaly_scores))  # Sigmoid
+
+        return [
+            (bool(flag), float(score))
+            for flag, score in zip(is_anomaly, normalized_scores)
+        ]
+
+    def _heuristic_results(
+        self, events: List[Event], contexts: List[Dict[str, Any]]
+    ) -> List[Tuple[bool, float]]:
+        """Heuristic detection results for a batch."""
+        return [
+            (self._heuristic_anomaly_detection(event, context), 0.5)
+            for event, context in zip(events, contexts)
+        ]
 
     def _heuristic_anomaly_detection(
         self, event: Event, context: Dict[str, Any] = None
@@ -196,34 +299,47 @@ class RealTimeAnomalyDetector:
 
     def update_model(self, events: List[Event], contexts: List[Dict[str, Any]]):
         """Update the anomaly detection model with new data."""
-        if len(events) < 10:
+        if self.stream_model is None and len(events) < 10:
             return
 
         # Extract features for all events
-        X = []
-        for event, context in zip(events, contexts):
-            features = self.extract_features(event, context)
-            X.append(features[0])
-            self.feature_history.append(features[0])
+        self.fit_features(self.extract_features_batch(events, contexts))
+
+    def fit_features(self, X: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Train on a feature matrix and return the stored model's metadata."""
+        self.feature_history.extend(X)
+
+        if self.stream_model is not None:
+            # Streaming mode learns incrementally; no refit needed
+            self.stream_model.learn(X)
+            self.is_trained = self.stream_model.is_ready
+            print(f"Streaming anomaly model learned from {len(X)} events")
+            return None
 
-        X = np.array(X)
+        # Fit fresh objects; the loaded ones are shared with other instances
+        model = clone(self.model)
+        scaler = StandardScaler()
 
         # Fit scaler
-        self.scaler.fit(X)
-        X_scaled = self.scaler.transform(X)
+        scaler.fit(X)
+        X_scaled = scaler.transform(X)
 
         # Train model
-        self.model.fit(X_scaled)
+        model.fit(X_scaled)
+        self.model = model
+        self.scaler = scaler
         self.is_trained = True
 
         # Save model
-        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        with open(self.model_path, "wb") as f:
-            pickle.dump(
-                {"model": self.model, "scaler": self.scaler, "is_trained": True}, f
-            )
+        self._model_entry = get_model_registry().store(
+            self.model_path,
+            {"model": self.model, "scaler": self.scaler, "is_trained": True},
+            metadata={"training_size": len(X)},
+        )
+        self.compiled_model = self._model_entry.compiled("model")
 
-        print(f"Anomaly detection model updated with {len(events)} samples")
+        print(f"Anomaly detection model updated with {len(X)} samples")
+        return self._model_entry.metadata
 
 
 class AlertClassifier:
@@ -288,9 +404,11 @@ class AlertClassifier:
     ) -> Dict[str, Any]:
         """Classify alert based on patterns and context."""
         context = context or {}
-        description = (event.description or "").lower()
-        title = (getattr(event, "title", "") or "").lower()
-        full_text = f"{title} {description}"
+        description = event.description or ""
+        title = getattr(event, "title", "") or ""
+        # IOCs come from the original text, so URLs keep their case
+        original_text = f"{title} {description}"
+        full_text = original_text.lower()
 
         classification = {
             "category": "unknown",
@@ -305,6 +423,13 @@ class AlertClassifier:
         best_match = None
         best_score = 0.0
 
+        matcher = get_keyword_matcher()
+        matcher.sync_groups(
+            "classifier:",
+            {name: pattern["keywords"] for name, pattern in self.patterns.items()},
+        )
+        keyword_hits = matcher.match(full_text)
+
         for pattern_name, pattern in self.patterns.items():
             score = 0.0
 
@@ -313,7 +438,7 @@ class AlertClassifier:
                 score += 0.4
 
             # Check keyword matches
-            keyword_matches = sum(1 for kw in pattern["keywords"] if kw in full_text)
+            keyword_matches = keyword_hits[f"classifier:{pattern_name}"]
             if keyword_matches > 0:
                 score += (keyword_matches / len(pattern["keywords"])) * 0.6
 
@@ -330,7 +455,7 @@ class AlertClassifier:
             classification["recommended_priority"] = pattern["priority"]
 
         # Extract IOCs (Indicators of Compromise)
-        iocs = self._extract_iocs(event, full_text)
+        iocs = self._extract_iocs(event, original_text)
         classification["ioc"] = iocs
 
         # Add frequency-based tags
@@ -343,51 +468,14 @@ class AlertClassifier:
 
     def _extract_iocs(self, event: Event, text: str) -> List[Dict[str, str]]:
         """Extract Indicators of Compromise from event."""
-        import re
-
-        iocs = []
-
-        # IP addresses
-        ip_pattern = r"\b(?:\d{1,3}\.){3}\d{1,3}\b"
-        ips = re.findall(ip_pattern, text)
-        for ip in set(ips):
-            if ip not in ["127.0.0.1", "0.0.0.0"]:
-                iocs.append({"type": "ip", "value": ip})
+        iocs = extract_iocs(text)
 
         # Add event IPs
-        if event.source_ip and event.source_ip not in ["127.0.0.1", "0.0.0.0"]:
-            iocs.append({"type": "ip", "value": event.source_ip})
-        if event.destination_ip and event.destination_ip not in [
-            "127.0.0.1",
-            "0.0.0.0",
-        ]:
-            iocs.append({"type": "ip", "value": event.destination_ip})
-
-        # Domains (simple pattern)
-        domain_pattern = r"\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,}\b"
-        domains = re.findall(domain_pattern, text.lower())
-        for domain in set(domains[:5]):  # Limit to 5
-            if not domain.endswith(
-                (".com", ".org", ".net", ".gov")
-            ):  # Skip common TLDs
-                iocs.append({"type": "domain", "value": domain})
-
-        # Hashes (MD5, SHA1, SHA256)
-        hash_patterns = {
-            "md5": r"\b[a-f0-9]{32}\b",
-            "sha1": r"\b[a-f0-9]{40}\b",
-            "sha256": r"\b[a-f0-9]{64}\b",
-        }
-        for hash_type, pattern in hash_patterns.items():
-            hashes = re.findall(pattern, text.lower())
-            for h in set(hashes[:3]):  # Limit to 3 per type
-                iocs.append({"type": hash_type, "value": h})
-
-        # URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
-        for url in set(urls[:3]):  # Limit to 3
-            iocs.append({"type": "url", "value": url})
+        seen_ips = {ioc["value"] for ioc in iocs if ioc["type"] == "ip"}
+        for ip in (event.source_ip, event.destination_ip):
+            if ip and ip not in IGNORED_IPS and ip not in seen_ips:
+                seen_ips.add(ip)
+                iocs.append({"type": "ip", "value": ip})
 
         return iocs
 
@@ -401,35 +489,68 @@ class RealTimeMLSystem:
         self.classifier = AlertClassifier()
         self.event_window = deque(maxlen=100)  # Last 100 events for context
         self.context_cache = {}  # Cache context for recent events
+        self.stats = MLWindowStats(window_size=self.event_window.maxlen)
 
     def process_event(
         self, event: Event, context: Dict[str, Any] = None
     ) -> Dict[str, Any]:
         """Process event in real-time and return ML insights."""
-        context = context or {}
+        return self.process_events([event], [context])[0]
 
-        # Store event in window
-        self.event_window.append((event, context))
+    def process_events(
+        self, events: List[Event], contexts: List[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Process a micro-batch of events and return ML insights for each."""
+        contexts = [context or {} for context in (contexts or [None] * len(events))]
 
         # Anomaly detection
-        is_anomaly, anomaly_score = self.anomaly_detector.detect_anomaly(event, context)
-
-        # Alert classification
-        classification = self.classifier.classify_alert(event, context)
-
-        # Combine results
-        result = {
-            "is_anomaly": is_anomaly,
-            "anomaly_score": float(anomaly_score),
-            "classification": classification,
-            "ml_confidence": max(anomaly_score, classification["confidence"]),
-            "recommended_action": self._recommend_action(is_anomaly, classification),
-            "risk_level": self._calculate_risk_level(
-                is_anomaly, anomaly_score, classification
-            ),
-        }
+        detections = self.anomaly_detector.detect_anomalies(events, contexts)
+
+        results = []
+        for event, context, (is_anomaly, anomaly_score) in zip(
+            events, contexts, detections
+        ):
+            # Alert classification
+            classification = self.classifier.classify_alert(event, context)
+
+            # Combine results
+            results.append(
+                {
+                    "is_anomaly": is_anomaly,
+                    "anomaly_score": float(anomaly_score),
+                    "classification": classification,
+                    "ml_confidence": max(anomaly_score, classification["confidence"]),
+                    "recommended_action": self._recommend_action(
+                        is_anomaly, classification
+                    ),
+                    "risk_level": self._calculate_risk_level(
+                        is_anomaly, anomaly_score, classification
+                    ),
+                }
+            )
 
-        return result
+        # Store events in window once they are processed, so a batch that
+        # fails and is retried event by event is not counted twice
+        self.event_window.extend(zip(events, contexts))
+        self.stats.record(results)
+        return results
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Window statistics and model state, without touching the database."""
+        detector = self.anomaly_detector
+        snapshot = self.stats.snapshot()
+        snapshot.update(
+            {
+                "anomaly_detector_trained": (
+                    detector.stream_model.is_ready
+                    if detector.stream_model is not None
+                    else detector.is_trained
+                ),
+                "anomaly_mode": detector.mode,
+                "patterns_loaded": len(self.classifier.patterns),
+            }
+        )
+        return snapshot
 
     def _recommend_action(
         self, is_anomaly: bool, classification: Dict[str, Any]
@@ -0,0 +1,104 @@
+"""Indicator of Compromise (IOC) extraction from free text."""
+
+import re
+from typing import Dict, Iterable, List
+
+# Maximum number of distinct values kept per IOC type
+IOC_LIMITS = {
+    "ip": 25,
+    "domain": 5,
+    "md5": 3,
+    "sha1": 3,
+    "sha256": 3,
+    "url": 3,
+}
+
+# Output order of IOC types
+IOC_TYPES = ("ip", "domain", "md5", "sha1", "sha256", "url")
+
+IGNORED_IPS = frozenset({"127.0.0.1", "0.0.0.0"})
+COMMON_TLDS = (".com", ".org", ".net", ".gov")
+
+HASH_TYPES = {32: "md5", 40: "sha1", 64: "sha256"}
+
+_HASH_PATTERN = r"\b(?i:[a-f0-9]{64}|[a-f0-9]{40}|[a-f0-9]{32})\b"
+
+# One scanner for all IOC types, run on the original text so URLs keep their
+# case; the other types match either case and are lowercased. Alternatives
+# are tried in order at each position, so URLs win over the hosts and hashes
+# they contain, and domains over the hashes they start with (a file name
+# such as <md5>.exe); those are picked up by rescanning the match.
+_IOC_SCANNER = re.compile(
+    r"(?P<url>https?://)[^\s<>\"{}|\\^`\[\]]+"
+    r"|(?P<ip>\b(?:\d{1,3}\.){3}\d{1,3}\b)"
+    r"|(?P<domain>\b(?i:(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,})\b)"
+    rf"|(?P<hash>{_HASH_PATTERN})"
+)
+_HASH_SCANNER = re.compile(_HASH_PATTERN)
+
+
+def extract_iocs(text: str) -> List[Dict[str, str]]:
+    """Extract IPs, domains, file hashes and URLs from text."""
+    collector = _IOCCollector()
+    if text:
+        collector.scan(text, 0, len(text))
+    return collector.results()
+
+
+def extract_iocs_batch(texts: Iterable[str]) -> List[List[Dict[str, str]]]:
+    """Extract IOCs from each text of a batch."""
+    return [extract_iocs(text) for text in texts]
+
+
+class _IOCCollector:
+    """Deduplicated, capped IOC values for one text."""
+
+    def __init__(self):
+        self.found = {ioc_type: {} for ioc_type in IOC_TYPES}
+        self.open_types = len(IOC_TYPES)
+
+    def scan(self, text: str, pos: int, endpos: int):
+        """Collect IOCs from text[pos:endpos] until every type is full."""
+        for match in _IOC_SCANNER.finditer(text, pos, endpos):
+            ioc_type = match.lastgroup
+            value = match.group()
+            if ioc_type == "url":
+                self.add("url", value)
+                # Hosts and hashes inside the URL are IOCs too
+                self.scan(text, match.end("url"), match.end())
+            elif ioc_type == "ip":
+                if value not in IGNORED_IPS:
+                    self.add("ip", value)
+            elif ioc_type == "hash":
+                self.add(HASH_TYPES[len(value)], value.lower())
+            else:
+                value = value.lower()
+                if not value.endswith(COMMON_TLDS):
+                    self.add("domain", value)
+                # Hashes inside the domain are IOCs too
+                for hash_match in _HASH_SCANNER.finditer(
+                    text, match.start(), match.end()
+                ):
+                    self.add(
+                        HASH_TYPES[len(hash_match.group())], hash_match.group().lower()
+                    )
+
+            if not self.open_types:
+                return
+
+    def add(self, ioc_type: str, value: str):
+        """Record a value unless its type is already full."""
+        values = self.found[ioc_type]
+        limit = IOC_LIMITS[ioc_type]
+        if len(values) < limit and value not in values:
+            values[value] = None
+            if len(values) == limit:
+                self.open_types -= 1
+
+    def results(self) -> List[Dict[str, str]]:
+        """Return IOCs grouped by type in first-seen order."""
+        return [
+            {"type": ioc_type, "value": value}
+            for ioc_type in IOC_TYPES
+            for value in self.found[ioc_type]
+        ]
@@ -0,0 +1,49 @@
+"""Stable numeric encoding of IP addresses for ML features."""
+
+import hashlib
+import ipaddress
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Prefix lengths used for IPv4 and IPv6 network buckets
+IPV4_PREFIXES = (8, 16, 24)
+IPV6_PREFIXES = (32, 48, 64)
+
+# Number of features produced per IP address
+IP_FEATURE_COUNT = len(IPV4_PREFIXES) + 1
+
+# Fixed key so hashes agree across processes, restarts and hosts, unlike the
+# built-in hash() which is randomized per process
+_HASH_KEY = b"csirt-ip-features"
+
+
+def encode_ip(ip: Optional[str]) -> Tuple[float, ...]:
+    """Encode an IP address as features in [0, 1].
+
+    Returns the address's network buckets (/8, /16, /24 for IPv4; /32, /48,
+    /64 for IPv6) each scaled to [0, 1], followed by a keyed hash of the
+    address. Values that are not IP addresses get zero buckets and the hash
+    of the raw string, so they still separate from each other.
+    """
+    return _encode_ip(ip or "unknown")
+
+
+@lru_cache(maxsize=65536)
+def _encode_ip(ip: str) -> Tuple[float, ...]:
+    """Cached encoder keyed on the IP string."""
+    ip = ip.strip()
+    digest = hashlib.blake2b(ip.encode(), digest_size=8, key=_HASH_KEY).digest()
+    ip_hash = int.from_bytes(digest, "big") / 2**64
+
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return (0.0,) * len(IPV4_PREFIXES) + (ip_hash,)
+
+    prefixes = IPV4_PREFIXES if address.version == 4 else IPV6_PREFIXES
+    value = int(address)
+    buckets = tuple(
+        (value >> (address.max_prefixlen - prefix)) / ((1 << prefix) - 1)
+        for prefix in prefixes
+    )
+    return buckets + (ip_hash,)
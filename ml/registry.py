@@ -0,0 +1,308 @@
+"""Process-wide cache and versioned store of pickled ML models."""
+
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from ml.compiled import compile_model
+
+
+class ModelEntry:
+    """A loaded model file and the file version it was read from."""
+
+    def __init__(
+        self,
+        path: str,
+        version: Tuple[int, int],
+        data: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize the entry."""
+        self.path = path
+        self.version = version
+        self.data = data
+        self.metadata = metadata
+        self._compiled: Dict[str, Any] = {}
+
+    def compiled(self, key: str = "model"):
+        """Return the compiled evaluator for ``data[key]``, building it once."""
+        if key not in self._compiled:
+            self._compiled[key] = compile_model(self.data.get(key))
+        return self._compiled[key]
+
+
+class ModelRegistry:
+    """Loads each model file once per process and shares the result.
+
+    Entries are keyed by path and file version (mtime and size), so a file is
+    unpickled again only after it changes on disk. Stat calls are throttled to
+    one per ``check_interval`` seconds per path. When a newer file appears it
+    is loaded in a background thread while callers keep scoring with the
+    previous model, then swapped in. A loaded file that matches a stored
+    version gets that version's metadata.
+
+    ``store`` writes every trained model to ``versions/<name>/`` next to the
+    canonical file with a JSON metadata sidecar, keeps the last
+    ``keep_versions`` of them, and atomically replaces the canonical file so
+    that other processes never read a partial pickle.
+
+    Loaded models are shared by every caller and must be treated as read-only;
+    training code builds new model objects and publishes them with ``store``.
+    """
+
+    def __init__(self, check_interval: float = 5.0, keep_versions: int = 5):
+        """Initialize the registry."""
+        self.check_interval = check_interval
+        self.keep_versions = keep_versions
+        self._entries: Dict[str, Optional[ModelEntry]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._reloading = set()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[ModelEntry]:
+        """Return the current entry for a model file, or None if it is missing.
+
+        Raises the underlying error if the first load of the file fails.
+        """
+        path = os.path.abspath(path)
+        now = time.monotonic()
+        with self._lock:
+            if (
+                path in self._entries
+                and now - self._checked_at.get(path, 0.0) < self.check_interval
+            ):
+                return self._entries[path]
+
+            self._checked_at[path] = now
+            entry = self._entries.get(path)
+            version = self._file_version(path)
+            if version is None:
+                if entry is None:
+                    self._entries[path] = None
+                return entry
+            if entry is not None:
+                if entry.version != version:
+                    self._schedule_reload(path, entry.version)
+                return entry
+
+            try:
+                entry = self._load(path)
+            except Exception:
+                self._entries[path] = None
+                raise
+            self._entries[path] = entry
+            return entry
+
+    def store(
+        self, path: str, data: Dict[str, Any], metadata: Dict[str, Any] = None
+    ) -> ModelEntry:
+        """Save a new model version and make it the current one."""
+        path = os.path.abspath(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        versions_dir = self._versions_dir(path)
+        os.makedirs(versions_dir, exist_ok=True)
+
+        created_at = datetime.now(timezone.utc)
+        version_id = created_at.strftime("%Y%m%dT%H%M%S%fZ")
+        payload = pickle.dumps(data)
+        metadata = {
+            **(metadata or {}),
+            "name": name,
+            "version": version_id,
+            "created_at": created_at.isoformat(),
+            "size_bytes": len(payload),
+        }
+
+        version_path = os.path.join(versions_dir, f"{version_id}.pkl")
+        _atomic_write(version_path, payload)
+        _atomic_write(
+            os.path.join(versions_dir, f"{version_id}.json"),
+            json.dumps(metadata, indent=2).encode(),
+        )
+        self._prune_versions(versions_dir)
+
+        with self._lock:
+            _atomic_write(path, payload)
+            entry = ModelEntry(path, self._file_version(path), data, metadata)
+            self._entries[path] = entry
+            self._checked_at[path] = time.monotonic()
+        print(f"Stored model version {version_id} for {name}")
+        return entry
+
+    def list_versions(self, path: str) -> List[Dict[str, Any]]:
+        """Return metadata of the stored versions of a model, newest first."""
+        versions_dir = self._versions_dir(os.path.abspath(path))
+        if not os.path.isdir(versions_dir):
+            return []
+
+        versions = []
+        for filename in sorted(os.listdir(versions_dir), reverse=True):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(versions_dir, filename)) as f:
+                    versions.append(json.load(f))
+            except Exception as e:
+                print(f"Error reading model metadata {filename}: {e}")
+        return versions
+
+    def invalidate(self, path: Optional[str] = None):
+        """Forget one cached model, or all of them."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._checked_at.clear()
+            else:
+                path = os.path.abspath(path)
+                self._entries.pop(path, None)
+                self._checked_at.pop(path, None)
+
+    def _schedule_reload(self, path: str, seen_version: Tuple[int, int]):
+        """Load a changed file in the background. Caller must hold the lock."""
+        if path in self._reloading:
+            return
+        self._reloading.add(path)
+        threading.Thread(
+            target=self._reload,
+            args=(path, seen_version),
+            name="model-reload",
+            daemon=True,
+        ).start()
+
+    def _reload(self, path: str, seen_version: Tuple[int, int]):
+        """Replace the cached entry with a fresh load of the file.
+
+        The entry is only replaced if it is still the one at
+        ``seen_version`` that the reload was scheduled for, so a model
+        stored in the meantime is not overwritten by an older load.
+        """
+        try:
+            entry = self._load(path)
+            with self._lock:
+                current = self._entries.get(path)
+                if current is None or current.version == seen_version:
+                    self._entries[path] = entry
+            print(f"Reloaded model from {path}")
+        except Exception as e:
+            print(f"Error reloading model {path}: {e}")
+        finally:
+            with self._lock:
+                self._reloading.discard(path)
+
+    def _prune_versions(self, versions_dir: str):
+        """Delete all but the newest ``keep_versions`` versions."""
+        version_ids = sorted(
+            filename[: -len(".pkl")]
+            for filename in os.listdir(versions_dir)
+            if filename.endswith(".pkl")
+        )
+        excess = len(version_ids) - max(self.keep_versions, 1)
+        for version_id in version_ids[: max(excess, 0)]:
+            for ext in (".pkl", ".json"):
+                try:
+                    os.remove(os.path.join(versions_dir, version_id + ext))
+                except OSError:
+                    pass
+
+    def _load(self, path: str) -> ModelEntry:
+        """Unpickle a model file, with the metadata of its stored version."""
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            payload = f.read()
+        data = pickle.loads(payload)
+        return ModelEntry(
+            path,
+            (stat.st_mtime_ns, stat.st_size),
+            data,
+            self._find_metadata(path, payload),
+        )
+
+    def _find_metadata(self, path: str, payload: bytes) -> Optional[Dict[str, Any]]:
+        """Metadata of the stored version with the same content, if any."""
+        versions_dir = self._versions_dir(path)
+        try:
+            filenames = sorted(os.listdir(versions_dir), reverse=True)
+        except OSError:
+            return None
+
+        for filename in filenames:
+            if not filename.endswith(".pkl"):
+                continue
+            version_path = os.path.join(versions_dir, filename)
+            try:
+                if os.path.getsize(version_path) != len(payload):
+                    continue
+                with open(version_path, "rb") as f:
+                    if f.read() != payload:
+                        continue
+                with open(version_path[: -len(".pkl")] + ".json") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                continue
+        return None
+
+    @staticmethod
+    def _versions_dir(path: str) -> str:
+        """Directory holding the stored versions of a model file."""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(os.path.dirname(path), "versions", name)
+
+    @staticmethod
+    def _file_version(path: str) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) for a file, or None if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+def _read_umask() -> int:
+    """Return the process umask (reading it means setting it)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once: changing the umask to read it is not thread-safe
+_UMASK = _read_umask()
+
+
+def _atomic_write(path: str, payload: bytes):
+    """Write a file via a temp file and rename so readers never see it partial."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".tmp-", suffix=".part"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file readable by its owner only; give it the
+        # mode of a normally written file so other users can load the model
+        os.chmod(tmp_path, 0o644 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Global registry instance
+_model_registry = ModelRegistry(
+    check_interval=settings.ML_MODEL_CHECK_INTERVAL_SECONDS,
+    keep_versions=settings.ML_MODEL_KEEP_VERSIONS,
+)
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    return _model_registry
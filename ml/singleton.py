@@ -14,6 +14,32 @@ def get_ml_system() -> RealTimeMLSystem:
     return _ml_system_instance
 
 
+def warm_ml_system(limit: int = 100):
+    """Fill the ML window with the most recent events.
+
+    Meant to run in a background thread at startup so statistics are
+    available without any request having to wait for the window.
+    """
+    # Imported here: alerts.manager imports this module
+    from alerts.tasks import get_event_contexts
+    from config.database import SessionLocal
+    from models.event import Event
+
+    ml_system = get_ml_system()
+    if ml_system.event_window:
+        return
+
+    db = SessionLocal()
+    try:
+        events = db.query(Event).order_by(Event.created_at.desc()).limit(limit).all()
+        events.reverse()  # Oldest first, as the pipeline would have seen them
+        ml_system.process_events(events, get_event_contexts(db, events))
+    except Exception as e:
+        print(f"Error warming ML window: {e}")
+    finally:
+        db.close()
+
+
 def reset_ml_system():
     """Reset the ML system instance (for testing)."""
     global _ml_system_instance
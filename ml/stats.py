@@ -0,0 +1,193 @@
+"""Incrementally maintained statistics of the real-time ML window."""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+
+# Hash of the latest snapshot of every worker process, by worker id
+SNAPSHOTS_KEY = "csirt:ml:snapshots"
+SNAPSHOT_TTL_SECONDS = 300
+PUBLISH_INTERVAL_SECONDS = 2.0
+RETRY_AFTER_SECONDS = 30.0
+
+
+class MLWindowStats:
+    """Counts over the most recent ML results, updated as results arrive.
+
+    Recording a result and evicting the oldest one adjust running counters,
+    so a snapshot costs the same no matter how many events were processed.
+    """
+
+    def __init__(self, window_size: int = 100):
+        """Initialize the statistics."""
+        self.window_size = window_size
+        self.events_processed = 0
+        self.last_updated: Optional[str] = None
+        self._window = deque()
+        self._anomalies = 0
+        self._attack_types: Counter = Counter()
+        self._risk_levels: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, results: List[Dict[str, Any]]):
+        """Add ML results to the window."""
+        with self._lock:
+            for result in results:
+                item = (
+                    bool(result["is_anomaly"]),
+                    result["classification"].get("attack_type") or "unknown",
+                    result["risk_level"],
+                )
+                self._window.append(item)
+                self._add(item, 1)
+                if len(self._window) > self.window_size:
+                    self._add(self._window.popleft(), -1)
+            self.events_processed += len(results)
+            self.last_updated = datetime.utcnow().isoformat()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current statistics."""
+        with self._lock:
+            events_in_window = len(self._window)
+            return {
+                "events_in_window": events_in_window,
+                "anomalies_in_window": self._anomalies,
+                "anomaly_rate": (
+                    self._anomalies / events_in_window if events_in_window else 0.0
+                ),
+                "attack_types": dict(self._attack_types),
+                "risk_levels": dict(self._risk_levels),
+                "events_processed": self.events_processed,
+                "last_updated": self.last_updated,
+            }
+
+    def _add(self, item, sign: int):
+        """Apply an item's counts to the running totals."""
+        is_anomaly, attack_type, risk_level = item
+        self._anomalies += sign * is_anomaly
+        for counter, key in (
+            (self._attack_types, attack_type),
+            (self._risk_levels, risk_level),
+        ):
+            counter[key] += sign
+            if not counter[key]:
+                del counter[key]
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the snapshots of several workers into one.
+
+    Window counts are summed, so the merged window holds the recent results
+    of every worker. Other fields come from the most recently updated one.
+    """
+    merged = dict(max(snapshots, key=lambda s: s.get("last_updated") or ""))
+    merged.pop("published_at", None)
+    for key in ("events_in_window", "anomalies_in_window", "events_processed"):
+        merged[key] = sum(s.get(key, 0) for s in snapshots)
+    for key in ("attack_types", "risk_levels"):
+        counts: Counter = Counter()
+        for snapshot in snapshots:
+            counts.update(snapshot.get(key, {}))
+        merged[key] = dict(counts)
+    merged["anomaly_rate"] = (
+        merged["anomalies_in_window"] / merged["events_in_window"]
+        if merged["events_in_window"]
+        else 0.0
+    )
+    merged["workers"] = len(snapshots)
+    return merged
+
+
+class SnapshotPublisher:
+    """Shares the pipeline's ML snapshots with API processes through Redis.
+
+    Every worker process keeps its own window, so each publishes its
+    snapshot under its own id and ``load`` merges those published in the
+    last ``SNAPSHOT_TTL_SECONDS``.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """Initialize the publisher."""
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._redis = None
+        self._published_at = 0.0
+        # After a Redis error, skip calls for a while instead of waiting on
+        # connection timeouts every time
+        self._retry_at = 0.0
+
+    @property
+    def redis(self):
+        """Redis client, created on first use."""
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.from_url(
+                self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        return self._redis
+
+    def publish(self, snapshot: Dict[str, Any], force: bool = False):
+        """Store a snapshot, at most once per ``PUBLISH_INTERVAL_SECONDS``."""
+        now = time.monotonic()
+        if now < self._retry_at or (
+            not force and now - self._published_at < PUBLISH_INTERVAL_SECONDS
+        ):
+            return
+        self._published_at = now
+        # Read at every call: the pid changes when worker processes fork
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(
+                SNAPSHOTS_KEY,
+                worker_id,
+                json.dumps({**snapshot, "published_at": time.time()}, default=str),
+            )
+            pipe.expire(SNAPSHOTS_KEY, SNAPSHOT_TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            self._retry_at = now + RETRY_AFTER_SECONDS
+            print(f"Error publishing ML snapshot: {e}")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the merged snapshot of the live workers, or None."""
+        now = time.monotonic()
+        if now < self._retry_at:
+            return None
+        try:
+            published = self.redis.hgetall(SNAPSHOTS_KEY)
+            # Workers that stopped publishing (restarted or gone) drop out
+            cutoff = time.time() - SNAPSHOT_TTL_SECONDS
+            snapshots, stale = [], []
+            for worker_id, data in published.items():
+                snapshot = json.loads(data)
+                if snapshot.get("published_at", 0) < cutoff:
+                    stale.append(worker_id)
+                else:
+                    snapshots.append(snapshot)
+            if stale:
+                self.redis.hdel(SNAPSHOTS_KEY, *stale)
+        except Exception as e:
+            self._retry_at = now + RETRY_AFTER_SECONDS
+            print(f"Error loading ML snapshot: {e}")
+            return None
+        return merge_snapshots(snapshots) if snapshots else None
+
+
+# Global publisher instance
+_snapshot_publisher = None
+
+
+def get_snapshot_publisher() -> SnapshotPublisher:
+    """Get the process-wide snapshot publisher."""
+    global _snapshot_publisher
+    if _snapshot_publisher is None:
+        _snapshot_publisher = SnapshotPublisher()
+    return _snapshot_publisher
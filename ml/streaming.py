@@ -0,0 +1,234 @@
+"""Incremental anomaly detection that learns from the event stream."""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class RunningScaler:
+    """Standard scaling from a running mean and variance (Welford's method)."""
+
+    def __init__(self, n_features: int):
+        """Initialize the scaler."""
+        self.n_samples = 0
+        self.mean_ = np.zeros(n_features)
+        self._m2 = np.zeros(n_features)
+
+    @property
+    def scale_(self) -> np.ndarray:
+        """Running standard deviation, with 1.0 for constant features."""
+        if self.n_samples < 2:
+            return np.ones_like(self.mean_)
+        std = np.sqrt(self._m2 / self.n_samples)
+        return np.where(std > 0, std, 1.0)
+
+    def partial_fit(self, X: np.ndarray) -> "RunningScaler":
+        """Fold a batch of rows into the running statistics."""
+        X = np.atleast_2d(X)
+        if not len(X):
+            return self
+        # Chan et al. parallel update: merge the batch's moments in one step
+        batch_n = len(X)
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        total = self.n_samples + batch_n
+        delta = batch_mean - self.mean_
+        self.mean_ = self.mean_ + delta * batch_n / total
+        self._m2 = self._m2 + batch_m2 + delta**2 * self.n_samples * batch_n / total
+        self.n_samples = total
+        return self
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Scale rows with the current statistics."""
+        return (np.atleast_2d(X) - self.mean_) / self.scale_
+
+
+class HalfSpaceTrees:
+    """Streaming Half-Space Trees (Tan, Ting & Liu, 2011).
+
+    Each tree splits a randomly perturbed work space in half along random
+    features down to a fixed depth. Mass (points per node) is counted in two
+    tumbling windows: scores use the completed reference window while the
+    latest window is being filled, then the windows swap. Learning and scoring
+    cost O(n_trees * depth) per event regardless of how much data was seen,
+    and the model follows drift one window at a time.
+
+    Inputs are expected to be standardized; they are squashed into (0, 1)
+    before use. ``score_samples`` follows the IsolationForest convention:
+    values in [-1, 0] where lower is more anomalous.
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        n_trees: int = 25,
+        depth: int = 8,
+        window_size: int = 250,
+        random_state: int = 42,
+    ):
+        """Build the random tree structure."""
+        self.n_features = n_features
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window_size = window_size
+        self.size_limit = 0.1 * window_size
+
+        rng = np.random.RandomState(random_state)
+        n_internal = 2**depth - 1
+        n_nodes = 2 ** (depth + 1) - 1
+        self.split_feature = np.zeros((n_trees, n_internal), dtype=np.intp)
+        self.split_value = np.zeros((n_trees, n_internal))
+        for tree in range(n_trees):
+            # Work space: a random box that contains [0, 1] in every dimension
+            center = rng.uniform(size=n_features)
+            half_width = 2 * np.maximum(center, 1 - center)
+            lows = [center - half_width]
+            highs = [center + half_width]
+            for node in range(n_internal):
+                low, high = lows[node], highs[node]
+                feature = rng.randint(n_features)
+                split = (low[feature] + high[feature]) / 2
+                self.split_feature[tree, node] = feature
+                self.split_value[tree, node] = split
+                left_high = high.copy()
+                left_high[feature] = split
+                right_low = low.copy()
+                right_low[feature] = split
+                lows += [low, right_low]
+                highs += [left_high, high]
+
+        self.reference_mass = np.zeros((n_trees, n_nodes))
+        self.latest_mass = np.zeros((n_trees, n_nodes))
+        self.level_weight = 2.0 ** np.arange(depth + 1)
+        self.log_max_mass = np.log1p(window_size * 2.0**depth)
+        self.window_count = 0
+        self.windows_seen = 0
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether a full reference window has been collected."""
+        return self.windows_seen > 0
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Score rows against the reference window; lower is more anomalous."""
+        paths = self._paths(X)
+        masses = self.reference_mass[np.arange(self.n_trees), paths]
+        # Stop at the first node with too little mass, or at the leaf
+        stop = masses < self.size_limit
+        stop[-1] = True
+        level = np.argmax(stop, axis=0)
+        node_mass = np.take_along_axis(masses, level[np.newaxis], axis=0)[0]
+        mass = (node_mass * self.level_weight[level]).mean(axis=1)
+        # Log mass relative to the largest possible, mapped onto [-1, 0]
+        return np.log1p(mass) / self.log_max_mass - 1.0
+
+    def learn(self, X: np.ndarray):
+        """Count rows into the latest window, swapping windows when full."""
+        X = np.atleast_2d(X)
+        start = 0
+        while start < len(X):
+            end = min(len(X), start + self.window_size - self.window_count)
+            paths = self._paths(X[start:end])
+            trees = np.broadcast_to(np.arange(self.n_trees), paths.shape)
+            np.add.at(self.latest_mass, (trees.ravel(), paths.ravel()), 1)
+            self.window_count += end - start
+            start = end
+            if self.window_count >= self.window_size:
+                self.reference_mass, self.latest_mass = (
+                    self.latest_mass,
+                    np.zeros_like(self.latest_mass),
+                )
+                self.window_count = 0
+                self.windows_seen += 1
+
+    def _paths(self, X: np.ndarray) -> np.ndarray:
+        """Node visited at every level, shape (depth + 1, n_samples, n_trees)."""
+        # Squash standardized values into (0, 1), the span the work spaces cover
+        X = 1.0 / (1.0 + np.exp(-np.atleast_2d(X)))
+        trees = np.arange(self.n_trees)
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.zeros((len(X), self.n_trees), dtype=np.intp)
+        paths = [nodes]
+        for _ in range(self.depth):
+            features = self.split_feature[trees, nodes]
+            go_right = X[rows, features] > self.split_value[trees, nodes]
+            nodes = 2 * nodes + 1 + go_right
+            paths.append(nodes)
+        return np.stack(paths)
+
+
+class StreamingAnomalyModel:
+    """Running scaler plus Half-Space Trees with an adaptive threshold.
+
+    ``offset_`` is the ``contamination`` quantile of recent scores, fitted
+    once enough scores exist and refreshed on every window swap, so
+    ``score - offset_ < 0`` flags roughly that share of events like
+    IsolationForest does.
+    """
+
+    MIN_THRESHOLD_SCORES = 100
+
+    def __init__(
+        self,
+        n_features: int,
+        contamination: float = 0.1,
+        window_size: int = 250,
+        history_size: int = 1000,
+        random_state: int = 42,
+    ):
+        """Initialize the model."""
+        self.contamination = contamination
+        self.scaler = RunningScaler(n_features)
+        self.trees = HalfSpaceTrees(
+            n_features, window_size=window_size, random_state=random_state
+        )
+        self.recent_scores = deque(maxlen=history_size)
+        self.offset_ = -1.0
+        self._offset_fitted = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether scores and the anomaly threshold can be trusted."""
+        return self.trees.is_ready and self._offset_fitted
+
+    def score_and_learn(self, X: np.ndarray) -> np.ndarray:
+        """Score rows, then learn from them.
+
+        Returns scores (lower = anomalous), or None before the first window.
+        """
+        with self._lock:
+            self.scaler.partial_fit(X)
+            X_scaled = self.scaler.transform(X)
+            scores = None
+            if self.trees.is_ready:
+                scores = self.trees.score_samples(X_scaled)
+                self.recent_scores.extend(scores)
+                if (
+                    not self._offset_fitted
+                    and len(self.recent_scores) >= self.MIN_THRESHOLD_SCORES
+                ):
+                    self._fit_offset()
+            self._learn_scaled(X_scaled)
+            return scores
+
+    def learn(self, X: np.ndarray):
+        """Learn from rows without scoring them."""
+        with self._lock:
+            self.scaler.partial_fit(X)
+            self._learn_scaled(self.scaler.transform(X))
+
+    def _learn_scaled(self, X_scaled: np.ndarray):
+        """Feed scaled rows to the trees and refresh the threshold on swaps."""
+        windows_seen = self.trees.windows_seen
+        self.trees.learn(X_scaled)
+        if self.trees.windows_seen != windows_seen and self.recent_scores:
+            self._fit_offset()
+
+    def _fit_offset(self):
+        """Set the threshold to the contamination quantile of recent scores."""
+        self.offset_ = float(
+            np.quantile(np.fromiter(self.recent_scores, float), self.contamination)
+        )
+        self._offset_fitted = True
@@ -0,0 +1,110 @@
+"""Celery tasks for ML model training."""
+
+import time
+from typing import List
+
+import numpy as np
+
+from alerts.tasks import get_event_contexts
+from config.celery_app import celery_app
+from config.database import SessionLocal
+from config.settings import settings
+from ml.singleton import get_ml_system
+from models.event import Event
+
+MIN_TRAINING_EVENTS = 10
+
+
+@celery_app.task(bind=True)
+def train_anomaly_model(self, event_ids: List[int]):
+    """Train the anomaly detection model on the given events.
+
+    Events are loaded and turned into features one chunk at a time; progress
+    is reported through the task state so the API can poll it.
+    """
+    db = SessionLocal()
+    detector = get_ml_system().anomaly_detector
+    started = time.perf_counter()
+    timings = {"load_seconds": 0.0, "context_seconds": 0.0, "feature_seconds": 0.0}
+
+    try:
+        if detector.stream_model is not None:
+            return {
+                "error": "Anomaly detection is in streaming mode; nothing was trained",
+                "status": "failed",
+                "events_used": 0,
+            }
+
+        ids = sorted(set(event_ids))
+        chunk_size = settings.ML_TRAINING_CHUNK_SIZE
+        feature_chunks = []
+        processed = 0
+
+        for start in range(0, len(ids), chunk_size):
+            step = time.perf_counter()
+            events = (
+                db.query(Event)
+                .filter(Event.id.in_(ids[start : start + chunk_size]))
+                .all()
+            )
+            timings["load_seconds"] += time.perf_counter() - step
+
+            step = time.perf_counter()
+            contexts = get_event_contexts(db, events)
+            timings["context_seconds"] += time.perf_counter() - step
+
+            step = time.perf_counter()
+            if events:
+                feature_chunks.append(detector.extract_features_batch(events, contexts))
+            timings["feature_seconds"] += time.perf_counter() - step
+
+            processed += len(events)
+            # Keep memory flat across chunks
+            db.expunge_all()
+            self.update_state(
+                state="PROGRESS",
+                meta={
+                    "stage": "loading",
+                    "processed": processed,
+                    "total": len(ids),
+                    "timings": _rounded(timings),
+                },
+            )
+
+        if processed < MIN_TRAINING_EVENTS:
+            return {
+                "error": f"Need at least {MIN_TRAINING_EVENTS} events for training",
+                "status": "failed",
+                "events_used": processed,
+            }
+
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "stage": "fitting",
+                "processed": processed,
+                "total": len(ids),
+                "timings": _rounded(timings),
+            },
+        )
+        step = time.perf_counter()
+        model_metadata = detector.fit_features(np.vstack(feature_chunks))
+        timings["fit_seconds"] = time.perf_counter() - step
+        timings["total_seconds"] = time.perf_counter() - started
+
+        return {
+            "status": "success",
+            "events_used": processed,
+            "events_missing": len(ids) - processed,
+            "timings": _rounded(timings),
+            "model": model_metadata,
+        }
+    except Exception as e:
+        return {"error": str(e), "status": "failed"}
+    finally:
+        db.close()
+
+
+def _rounded(timings):
+    """Round timings for reporting."""
+    return {name: round(seconds, 3) for name, seconds in timings.items()}
@@ -1,9 +1,11 @@
 """Database models."""
 
 from models.alert import Alert, AlertPriority, AlertStatus
+from models.checkpoint import CollectionCheckpoint
 from models.event import Event, EventSource, EventType
 from models.incident import Incident, IncidentSeverity, IncidentStatus
 from models.integration import Integration, IntegrationType
+from models.rollup import AlertCountHour, EventCountHour, EventCountMinute
 
 __all__ = [
     "Incident",
@@ -17,4 +19,8 @@ __all__ = [
     "EventType",
     "Integration",
     "IntegrationType",
+    "CollectionCheckpoint",
+    "EventCountMinute",
+    "EventCountHour",
+    "AlertCountHour",
 ]
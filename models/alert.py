@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import Column, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Enum, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from models.base import BaseModel
@@ -32,6 +32,12 @@ class Alert(BaseModel):
     """Alert model."""
 
     __tablename__ = "alerts"
+    # Keyset pagination: newest first, optionally within one filter value
+    __table_args__ = (
+        Index("ix_alerts_created_at_id", "created_at", "id"),
+        Index("ix_alerts_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_alerts_priority_created_at_id", "priority", "created_at", "id"),
+    )
 
     title = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=True)
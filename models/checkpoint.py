@@ -0,0 +1,32 @@
+"""Collection checkpoint model for incremental pulls from SIEM sources."""
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+
+from models.base import BaseModel
+
+
+class CollectionCheckpoint(BaseModel):
+    """Position in a source's event stream up to which events were collected.
+
+    ``watermark`` is the timestamp of the newest event fetched so far and
+    ``boundary_ids`` are the ids of the fetched events carrying exactly that
+    timestamp, so the next pull can start at the watermark inclusively and
+    skip only what it has already seen.
+
+    ``claimed_at`` is set while a run writes the page after the watermark; a
+    claim older than COLLECTION_CLAIM_TIMEOUT_SECONDS was left by a run that
+    died mid-page. The watermark is null until the first page is written.
+    """
+
+    __tablename__ = "collection_checkpoints"
+
+    integration_id = Column(
+        Integer,
+        ForeignKey("integrations.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    watermark = Column(String, nullable=True)  # ISO 8601 timestamp (UTC)
+    boundary_ids = Column(JSON, nullable=False, default=list)
+    claimed_at = Column(DateTime, nullable=True)
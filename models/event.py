@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import JSON, Column, Enum, ForeignKey, String, Text
+from sqlalchemy import JSON, Column, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import relationship
 
 from models.base import BaseModel
@@ -39,6 +39,12 @@ class Event(BaseModel):
     """Security event model."""
 
     __tablename__ = "events"
+    # Keyset pagination: newest first, optionally within one filter value
+    __table_args__ = (
+        Index("ix_events_created_at_id", "created_at", "id"),
+        Index("ix_events_source_created_at_id", "source", "created_at", "id"),
+        Index("ix_events_event_type_created_at_id", "event_type", "created_at", "id"),
+    )
 
     source = Column(Enum(EventSource), nullable=False, index=True)
     event_type = Column(Enum(EventType), nullable=False, index=True)
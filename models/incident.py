@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import JSON, Column, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from models.base import BaseModel
@@ -31,6 +31,12 @@ class Incident(BaseModel):
     """Incident model."""
 
     __tablename__ = "incidents"
+    # Keyset pagination: newest first, optionally within one filter value
+    __table_args__ = (
+        Index("ix_incidents_created_at_id", "created_at", "id"),
+        Index("ix_incidents_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_incidents_severity_created_at_id", "severity", "created_at", "id"),
+    )
 
     title = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=True)
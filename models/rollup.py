@@ -0,0 +1,39 @@
+"""Rollup tables with pre-aggregated event and alert counts."""
+
+from sqlalchemy import Column, DateTime, Enum, Integer
+
+from models.alert import AlertPriority
+from models.base import Base
+from models.event import EventSource, EventType
+
+
+class EventCountMinute(Base):
+    """Number of events per minute, source and event type."""
+
+    __tablename__ = "event_counts_minute"
+
+    bucket = Column(DateTime, primary_key=True)  # Start of the minute (UTC)
+    source = Column(Enum(EventSource), primary_key=True)
+    event_type = Column(Enum(EventType), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class EventCountHour(Base):
+    """Number of events per hour, source and event type."""
+
+    __tablename__ = "event_counts_hour"
+
+    bucket = Column(DateTime, primary_key=True)  # Start of the hour (UTC)
+    source = Column(Enum(EventSource), primary_key=True)
+    event_type = Column(Enum(EventType), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AlertCountHour(Base):
+    """Number of alerts per hour and priority."""
+
+    __tablename__ = "alert_counts_hour"
+
+    bucket = Column(DateTime, primary_key=True)  # Start of the hour (UTC)
+    priority = Column(Enum(AlertPriority), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,120 @@
+"""Per-source collection checkpoints.
+
+Every change to a checkpoint is a compare-and-set on the row's
+``updated_at``. A run claims the checkpoint before writing the page after
+it and moves it past the page only once the page is written, so of two
+overlapping collection runs only one writes each page, and a page is never
+skipped: if the run dies in between, the claim expires and the next run
+fetches the page again, skipping the events that were already written.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.checkpoint import CollectionCheckpoint
+from models.event import Event, EventSource
+
+
+def load_checkpoints(
+    db: Session, integration_ids: List[int]
+) -> Dict[int, CollectionCheckpoint]:
+    """Checkpoints of the given integrations, by integration id."""
+    if not integration_ids:
+        return {}
+    rows = db.scalars(
+        select(CollectionCheckpoint).where(
+            CollectionCheckpoint.integration_id.in_(integration_ids)
+        )
+    )
+    return {row.integration_id: row for row in rows}
+
+
+def checkpoint_state(
+    checkpoint: Optional[CollectionCheckpoint],
+) -> Optional[Dict[str, Any]]:
+    """The position stored in a checkpoint, as passed to detectors."""
+    if checkpoint is None or checkpoint.watermark is None:
+        return None
+    return {
+        "watermark": checkpoint.watermark,
+        "boundary_ids": list(checkpoint.boundary_ids or []),
+    }
+
+
+def save_checkpoint(
+    db: Session,
+    integration_id: int,
+    state: Optional[Dict[str, Any]],
+    expected: Optional[datetime],
+    claim: bool = False,
+) -> Optional[datetime]:
+    """Move an integration's checkpoint to ``state`` if nobody moved it first.
+
+    ``expected`` is the ``updated_at`` the checkpoint must still have, or
+    None if it must not exist yet. With ``claim`` the checkpoint is marked as
+    claimed, otherwise any claim is released; an unclaimed ``state`` of None
+    removes it. Returns the checkpoint's new ``updated_at``, to be passed as
+    ``expected`` by the next move, or None if another run moved it meanwhile.
+    The caller commits.
+    """
+    version = datetime.utcnow()
+    values = {
+        "watermark": state and state["watermark"],
+        "boundary_ids": state["boundary_ids"] if state else [],
+        "claimed_at": version if claim else None,
+        "updated_at": version,
+    }
+
+    if expected is None:
+        if state is None and not claim:
+            return version
+        try:
+            with db.begin_nested():
+                db.add(CollectionCheckpoint(integration_id=integration_id, **values))
+        except IntegrityError:
+            return None
+        return version
+
+    match = (CollectionCheckpoint.integration_id == integration_id) & (
+        CollectionCheckpoint.updated_at == expected
+    )
+    if state is None and not claim:
+        result = db.execute(delete(CollectionCheckpoint).where(match))
+    else:
+        result = db.execute(update(CollectionCheckpoint).where(match).values(values))
+    return version if result.rowcount == 1 else None
+
+
+def claim_expired(claimed_at: datetime, now: Optional[datetime] = None) -> bool:
+    """Whether a claim is old enough that the run holding it must have died."""
+    timeout = timedelta(seconds=settings.COLLECTION_CLAIM_TIMEOUT_SECONDS)
+    return (now or datetime.utcnow()) - claimed_at >= timeout
+
+
+def written_event_ids(
+    db: Session,
+    source: EventSource,
+    claimed_at: datetime,
+    get_event_id: Callable[[Dict[str, Any]], Optional[str]],
+) -> Set[str]:
+    """Source ids of the events written under an expired claim.
+
+    These are the events of ``source`` stored while the claim could still be
+    held; ``get_event_id`` reads the id from an event's raw data.
+    """
+    until = claimed_at + timedelta(seconds=settings.COLLECTION_CLAIM_TIMEOUT_SECONDS)
+    rows = db.scalars(
+        select(Event.raw_data).where(
+            Event.source == source,
+            Event.created_at >= claimed_at,
+            Event.created_at < until,
+        )
+    )
+    event_ids = {get_event_id(raw_data) for raw_data in rows}
+    event_ids.discard(None)
+    return event_ids
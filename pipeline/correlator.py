@@ -3,12 +3,17 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from config.database import SessionLocal
+from config.settings import settings
 from models.alert import Alert
 from models.event import Event
+from pipeline.rollups import event_type_counts
+
+# Events of one type within the window that make an event flood
+EVENT_FLOOD_THRESHOLD = 20
 
 
 class EventCorrelator:
@@ -22,9 +27,14 @@ class EventCorrelator:
             # Get events from time window
             start_time = datetime.utcnow() - timedelta(minutes=time_window_minutes)
 
+            # Only the columns the IP and user correlations read, of the
+            # events that have either
             events = (
-                db.query(Event)
-                .filter(Event.created_at >= start_time)
+                db.query(Event.id, Event.event_type, Event.source_ip, Event.user)
+                .filter(
+                    Event.created_at >= start_time,
+                    or_(Event.source_ip.isnot(None), Event.user.isnot(None)),
+                )
                 .order_by(Event.created_at.desc())
                 .all()
             )
@@ -41,9 +51,7 @@ class EventCorrelator:
             correlations.extend(user_correlation)
 
             # Correlate by event type
-            event_type_correlation = self._correlate_by_event_type(
-                db, events, start_time
-            )
+            event_type_correlation = self._correlate_by_event_type(db, start_time)
             correlations.extend(event_type_correlation)
 
             return correlations
@@ -132,28 +140,42 @@ class EventCorrelator:
         return correlations
 
     def _correlate_by_event_type(
-        self, db: Session, events: List[Event], start_time: datetime
+        self, db: Session, start_time: datetime
     ) -> List[Dict[str, Any]]:
         """Correlate events by event type."""
         correlations = []
+        query = db.query(Event.event_type, Event.id).filter(
+            Event.created_at >= start_time
+        )
 
-        # Group events by type
+        # Rollup counts are upper bounds, so only types that reach the
+        # threshold there can flood, and only their event ids are read
+        if settings.ANALYTICS_USE_ROLLUPS:
+            candidates = [
+                event_type
+                for event_type, count in event_type_counts(db, start_time).items()
+                if count >= EVENT_FLOOD_THRESHOLD
+            ]
+            if not candidates:
+                return correlations
+            query = query.filter(Event.event_type.in_(candidates))
+
+        # Group event ids by type
         event_types = {}
-        for event in events:
-            event_type = event.event_type.value
-            if event_type not in event_types:
-                event_types[event_type] = []
-            event_types[event_type].append(event)
+        for event_type, event_id in query.order_by(Event.created_at.desc()):
+            if event_type.value not in event_types:
+                event_types[event_type.value] = []
+            event_types[event_type.value].append(event_id)
 
         # Identify patterns
-        for event_type, type_events in event_types.items():
-            if len(type_events) >= 20:  # Threshold for correlation
+        for event_type, event_ids in event_types.items():
+            if len(event_ids) >= EVENT_FLOOD_THRESHOLD:
                 correlations.append(
                     {
                         "type": "event_flood",
                         "event_type": event_type,
-                        "event_count": len(type_events),
-                        "events": [e.id for e in type_events],
+                        "event_count": len(event_ids),
+                        "events": event_ids,
                         "severity": "medium",
                     }
                 )
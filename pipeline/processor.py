@@ -1,14 +1,45 @@
 """Event processing pipeline."""
 
 from datetime import datetime
-from typing import Any, Dict, List
-
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
 
 from alerts.manager import AlertManager
-from alerts.tasks import process_events_to_alerts
 from config.database import SessionLocal
-from models.event import Event
+from models.event import Event, EventSource, EventType
+from pipeline.writer import EventBatchWriter
+
+# Event columns set by the detectors and written by the pipeline
+EVENT_FIELDS = (
+    "source",
+    "event_type",
+    "raw_data",
+    "normalized_data",
+    "timestamp",
+    "source_ip",
+    "destination_ip",
+    "user",
+    "hostname",
+    "description",
+    "severity_score",
+)
+
+
+def event_values_from_dict(event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a raw event dictionary to Event column values."""
+    # This is a simplified version - in production, you'd have proper mapping
+    return {
+        "source": EventSource(event_dict.get("source", "custom")),
+        "event_type": EventType(event_dict.get("event_type", "other")),
+        "raw_data": event_dict,
+        "normalized_data": event_dict.get("normalized_data"),
+        "timestamp": event_dict.get("timestamp", datetime.utcnow().isoformat()),
+        "source_ip": event_dict.get("source_ip"),
+        "destination_ip": event_dict.get("destination_ip"),
+        "user": event_dict.get("user"),
+        "hostname": event_dict.get("hostname"),
+        "description": event_dict.get("description"),
+        "severity_score": event_dict.get("severity_score"),
+    }
 
 
 class EventProcessor:
@@ -18,29 +49,50 @@ class EventProcessor:
         """Initialize event processor."""
         self.alert_manager = AlertManager()
 
-    def process_events(self, events: List[Event]) -> Dict[str, Any]:
-        """Process a batch of events."""
+    def process_events(
+        self, events: List[Event], batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process a batch of events.
+
+        Events are inserted in chunks of ``batch_size`` (EVENT_BATCH_SIZE by
+        default), each chunk in its own transaction followed by one alert
+        processing task. A chunk that fails is rolled back and reported
+        while the remaining chunks are still written.
+        """
         db = SessionLocal()
 
         try:
+            writer = EventBatchWriter(db, batch_size=batch_size)
             processed_events = []
-            created_alerts = []
+            errors = []
 
             for event in events:
-                # Save event to database
-                db.add(event)
-                db.commit()
-                db.refresh(event)
-                processed_events.append(event.id)
-
-                # Create alert asynchronously
-                # We'll trigger Celery task for alert creation
-                process_events_to_alerts.delay([event.id])
+                try:
+                    processed_events.extend(writer.add(self._event_values(event)))
+                except Exception as e:
+                    print(f"Error writing event batch: {e}")
+                    errors.append(str(e))
+            try:
+                processed_events.extend(writer.flush())
+            except Exception as e:
+                print(f"Error writing event batch: {e}")
+                errors.append(str(e))
+
+            if not errors:
+                status = "success"
+            elif processed_events:
+                status = "partial"
+            else:
+                status = "failed"
 
             return {
                 "processed": len(processed_events),
+                "failed": writer.failed,
                 "event_ids": processed_events,
-                "status": "success",
+                "batches": writer.batches,
+                "tasks_queued": writer.tasks_queued,
+                "errors": errors,
+                "status": status,
             }
         except Exception as e:
             db.rollback()
@@ -71,19 +123,8 @@ class EventProcessor:
 
     def _create_event_from_dict(self, event_dict: Dict[str, Any]) -> Event:
         """Create Event object from dictionary."""
-        # This is a simplified version - in production, you'd have proper mapping
-        from models.event import EventSource, EventType
-
-        return Event(
-            source=EventSource(event_dict.get("source", "custom")),
-            event_type=EventType(event_dict.get("event_type", "other")),
-            raw_data=event_dict,
-            normalized_data=event_dict.get("normalized_data"),
-            timestamp=event_dict.get("timestamp", datetime.utcnow().isoformat()),
-            source_ip=event_dict.get("source_ip"),
-            destination_ip=event_dict.get("destination_ip"),
-            user=event_dict.get("user"),
-            hostname=event_dict.get("hostname"),
-            description=event_dict.get("description"),
-            severity_score=event_dict.get("severity_score"),
-        )
+        return Event(**event_values_from_dict(event_dict))
+
+    def _event_values(self, event: Event) -> Dict[str, Any]:
+        """Column values of an unsaved Event for a bulk insert."""
+        return {field: getattr(event, field) for field in EVENT_FIELDS}
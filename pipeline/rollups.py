@@ -0,0 +1,189 @@
+"""Incrementally maintained rollups of event and alert counts.
+
+Writers add their rows' counts to the rollup tables in the same transaction
+as the rows themselves, with an upsert per (bucket, key). Readers then
+aggregate a bounded number of rollup rows per time bucket instead of
+scanning raw events and alerts: per-minute counts serve short correlation
+windows, per-hour counts serve dashboards over days or weeks.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.alert import Alert, AlertPriority
+from models.event import Event, EventSource, EventType
+from models.rollup import AlertCountHour, EventCountHour, EventCountMinute
+
+# Bucket width per truncation unit
+RESOLUTIONS = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1)}
+
+# Event rollup tables and the unit of their buckets
+EVENT_ROLLUPS = ((EventCountMinute, "minute"), (EventCountHour, "hour"))
+
+# SQLite strftime formats that truncate a timestamp to a unit
+_SQLITE_TRUNCATE_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+}
+
+
+def truncate_time(dialect_name: str, column, unit: str):
+    """SQL expression truncating ``column`` to a minute, hour or day."""
+    if dialect_name == "postgresql":
+        return func.date_trunc(unit, column)
+    return func.strftime(_SQLITE_TRUNCATE_FORMATS[unit], column)
+
+
+def as_datetime(value) -> datetime:
+    """Normalize a truncated timestamp (a string on SQLite) to a datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=None)
+
+
+def floor_time(moment: datetime, resolution: timedelta) -> datetime:
+    """Start of the ``resolution``-wide bucket containing ``moment``."""
+    return moment - (moment - datetime.min) % resolution
+
+
+def record_event_counts(
+    db: Session, keys: Iterable[Tuple[datetime, EventSource, EventType]]
+):
+    """Add events, given as (created_at, source, event_type), to the rollups.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    keys = list(keys)
+    for table, unit in EVENT_ROLLUPS:
+        counts = Counter(
+            (floor_time(created_at, RESOLUTIONS[unit]), source, event_type)
+            for created_at, source, event_type in keys
+        )
+        _upsert_counts(
+            db,
+            table,
+            [
+                {
+                    "bucket": bucket,
+                    "source": source,
+                    "event_type": event_type,
+                    "count": n,
+                }
+                for (bucket, source, event_type), n in counts.items()
+            ],
+        )
+
+
+def record_alert_counts(db: Session, keys: Iterable[Tuple[datetime, AlertPriority]]):
+    """Add alerts, given as (created_at, priority), to the rollup.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    counts = Counter(
+        (floor_time(created_at, RESOLUTIONS["hour"]), priority)
+        for created_at, priority in keys
+    )
+    _upsert_counts(
+        db,
+        AlertCountHour,
+        [
+            {"bucket": bucket, "priority": priority, "count": n}
+            for (bucket, priority), n in counts.items()
+        ],
+    )
+
+
+def event_type_counts(db: Session, since: datetime) -> Dict[EventType, int]:
+    """Events per type from the start of the minute containing ``since``.
+
+    Whole minutes are counted, so the result is an upper bound of the number
+    of events created at or after ``since``.
+    """
+    rows = db.execute(
+        select(EventCountMinute.event_type, func.sum(EventCountMinute.count))
+        .where(EventCountMinute.bucket >= floor_time(since, RESOLUTIONS["minute"]))
+        .group_by(EventCountMinute.event_type)
+    )
+    return {event_type: int(n) for event_type, n in rows}
+
+
+def prune_rollups(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete per-minute event counts older than the retention period.
+
+    Returns the number of rows deleted. The caller commits.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(
+        hours=settings.ROLLUP_MINUTE_RETENTION_HOURS
+    )
+    result = db.execute(
+        delete(EventCountMinute).where(
+            EventCountMinute.bucket < floor_time(cutoff, RESOLUTIONS["minute"])
+        )
+    )
+    return result.rowcount
+
+
+def backfill_rollups(db: Session, since: Optional[datetime] = None) -> Dict[str, int]:
+    """Rebuild the rollups from the raw tables, from ``since`` or entirely.
+
+    Existing rollup rows in the range are replaced. Returns the number of
+    rollup rows written per table. The caller commits; run it while no
+    events are being ingested, or counts written meanwhile may be lost.
+    """
+    dialect_name = db.get_bind().dialect.name
+    written = {}
+    rollups = [
+        (table, unit, Event, (Event.source, Event.event_type))
+        for table, unit in EVENT_ROLLUPS
+    ]
+    rollups.append((AlertCountHour, "hour", Alert, (Alert.priority,)))
+
+    for table, unit, model, keys in rollups:
+        bucket = truncate_time(dialect_name, model.created_at, unit)
+        query = select(bucket, *keys, func.count()).group_by(bucket, *keys)
+        clear = delete(table)
+        if since is not None:
+            start = floor_time(since, RESOLUTIONS[unit])
+            query = query.where(model.created_at >= start)
+            clear = clear.where(table.bucket >= start)
+
+        db.execute(clear)
+        rows = [
+            {
+                "bucket": as_datetime(row[0]),
+                **{key.key: value for key, value in zip(keys, row[1:-1])},
+                "count": row[-1],
+            }
+            for row in db.execute(query)
+        ]
+        _upsert_counts(db, table, rows)
+        written[table.__tablename__] = len(rows)
+    return written
+
+
+def _upsert_counts(db: Session, table, rows: List[Dict]):
+    """Insert rollup rows, adding to the counts of rows that already exist."""
+    if not rows:
+        return
+
+    dialect_insert = (
+        postgresql.insert
+        if db.get_bind().dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    key_names = [column.name for column in table.__table__.primary_key]
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=key_names,
+        set_={"count": table.count + statement.excluded["count"]},
+    )
+    # A fixed row order keeps concurrent upserts from deadlocking
+    rows = sorted(rows, key=lambda row: tuple(str(row[name]) for name in key_names))
+    db.execute(statement, rows)
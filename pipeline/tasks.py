@@ -1,6 +1,13 @@
 """Celery tasks for pipeline processing."""
 
-from typing import Any, Dict
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Optional
 
 from config.celery_app import celery_app
 from config.database import SessionLocal
@@ -10,37 +17,86 @@ from detection.endpoint_detector import EndpointDetector
 from detection.network_detector import NetworkDetector
 from detection.splunk_detector import SplunkDetector
 from models.integration import Integration, IntegrationType
+from pipeline.checkpoints import (
+    checkpoint_state,
+    claim_expired,
+    load_checkpoints,
+    save_checkpoint,
+    written_event_ids,
+)
 from pipeline.correlator import EventCorrelator
 from pipeline.processor import EventProcessor
+from pipeline.rollups import prune_rollups
+
+# Source statuses that leave the integration healthy
+SOURCE_OK = ("success", "superseded")
 
 
 @celery_app.task
 def collect_events_from_sources():
-    """Collect events from all configured sources."""
+    """Collect events from all configured sources.
+
+    Sources are collected in parallel, see ``_collect_in_parallel``. Each
+    one streams its events from its collection checkpoint into the event
+    processor a page at a time, see ``_collect_source``, so memory stays
+    bounded however far behind a source is. The result reports the status,
+    event count and duration of every source.
+    """
     db = SessionLocal()
     processor = EventProcessor()
 
     try:
         # Get enabled integrations
         integrations = db.query(Integration).filter(Integration.enabled == True).all()
-        all_events = []
+        checkpoints = load_checkpoints(db, [i.id for i in integrations])
+        collectors = {}
+        by_name = {}
 
         for integration in integrations:
             try:
                 detector = _get_detector(integration)
                 if detector:
-                    events = detector.detect_events()
-                    all_events.extend(events)
+                    checkpoint = checkpoints.get(integration.id)
+                    collectors[integration.name] = partial(
+                        _collect_source,
+                        processor,
+                        integration.id,
+                        detector,
+                        checkpoint_state(checkpoint),
+                        checkpoint and checkpoint.updated_at,
+                        checkpoint and checkpoint.claimed_at,
+                    )
+                    by_name[integration.name] = integration
             except Exception as e:
                 print(f"Error collecting events from {integration.name}: {e}")
                 continue
 
-        # Process all collected events
-        if all_events:
-            result = processor.process_events(all_events)
-            return result
+        sources = _collect_in_parallel(collectors)
+
+        synced_at = datetime.utcnow().isoformat()
+        for name, report in sources.items():
+            if report["status"] in SOURCE_OK:
+                by_name[name].status = "active"
+                by_name[name].last_sync = synced_at
+            elif report["status"] != "timeout":
+                # A source that timed out is slow, not broken, and may still
+                # be writing its last page
+                by_name[name].status = "error"
+        db.commit()
+
+        failed = [r for r in sources.values() if r["status"] not in SOURCE_OK]
+        if not failed:
+            status = "success"
+        elif len(failed) == len(sources):
+            status = "failed"
+        else:
+            status = "partial"
 
-        return {"status": "success", "events_collected": 0}
+        return {
+            "status": status,
+            "events_collected": sum(r["events"] for r in sources.values()),
+            "sources": sources,
+        }
     except Exception as e:
         return {"error": str(e), "status": "failed"}
     finally:
@@ -76,6 +132,247 @@ def correlate_events():
         db.close()
 
 
+@celery_app.task
+def prune_rollup_counts():
+    """Delete per-minute event counts past their retention period."""
+    db = SessionLocal()
+
+    try:
+        deleted = prune_rollups(db)
+        db.commit()
+        return {"status": "success", "rows_deleted": deleted}
+    except Exception as e:
+        db.rollback()
+        return {"error": str(e), "status": "failed"}
+    finally:
+        db.close()
+
+
+def _collect_source(
+    processor: EventProcessor,
+    integration_id: int,
+    detector,
+    state: Optional[Dict[str, Any]],
+    version: Optional[datetime],
+    claimed_at: Optional[datetime],
+    stop: threading.Event,
+    report: Dict[str, Any],
+):
+    """Stream one source's events into ``processor`` a page at a time.
+
+    The checkpoint (``state`` at ``version``) is claimed with a
+    compare-and-set before a page is written and moved past the page once it
+    is written, so of two overlapping runs only one writes each page and the
+    other stops as "superseded". If any chunk of a page could not be written
+    the claim is released without moving the checkpoint and collection stops,
+    so the next run fetches the whole page again.
+
+    A claim left by a run that died mid-page (``claimed_at``) blocks
+    collection until it expires; the page is then fetched again and events
+    already written under the claim are skipped by their source id. Events
+    without one may be written twice. Collection also stops between pages
+    once ``stop`` is set. Progress is kept in ``report``.
+    """
+    db = SessionLocal()
+
+    try:
+        written = set()
+        if claimed_at is not None:
+            if not claim_expired(claimed_at):
+                # Another run is writing a page
+                report["status"] = "superseded"
+                return
+            written = written_event_ids(
+                db, detector.source, claimed_at, detector.get_event_id
+            )
+
+        with closing(detector.detect_event_pages(checkpoint=state)) as pages:
+            for events in pages:
+                if events:
+                    version = save_checkpoint(
+                        db, integration_id, state, version, claim=True
+                    )
+                    db.commit()
+                    if version is None:
+                        # Another run collected these events
+                        report["status"] = "superseded"
+                        return
+
+                    if written:
+                        events = [
+                            event
+                            for event in events
+                            if detector.get_event_id(event.raw_data) not in written
+                        ]
+                    try:
+                        result = processor.process_events(events)
+                    except Exception:
+                        _release_claim(db, integration_id, state, version)
+                        raise
+                    report["events"] += result.get("processed", 0)
+                    report["events_failed"] += result.get("failed", 0)
+                    if result["status"] != "success":
+                        # The next run fetches the page again; the chunks of
+                        # a partial page that were written are written again
+                        _release_claim(db, integration_id, state, version)
+                        report["status"] = result["status"]
+                        report["error"] = result.get("error") or "; ".join(
+                            result.get("errors", [])
+                        )
+                        return
+                elif detector.checkpoint == state:
+                    continue
+
+                version = save_checkpoint(
+                    db, integration_id, detector.checkpoint, version
+                )
+                db.commit()
+                if version is None:
+                    # The claim expired and another run took over
+                    report["status"] = "superseded"
+                    return
+                state = detector.checkpoint
+
+                if stop.is_set():
+                    return
+    finally:
+        db.close()
+
+
+def _release_claim(
+    db, integration_id: int, state: Optional[Dict[str, Any]], version: datetime
+):
+    """Release a claimed checkpoint without moving it."""
+    try:
+        save_checkpoint(db, integration_id, state, version)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error releasing checkpoint of integration {integration_id}: {e}")
+
+
+def _collect_in_parallel(
+    collectors: Dict[str, Callable[[threading.Event, Dict[str, Any]], None]],
+) -> Dict[str, Dict[str, Any]]:
+    """Run every source's collector on a bounded thread pool.
+
+    Collectors are called with a stop flag and the report they fill in. A
+    source still running COLLECTION_SOURCE_TIMEOUT_SECONDS after it started
+    is told to stop at its next page, so the other sources are not held
+    back, and is reported as "timeout". Once the others are done it is
+    given COLLECTION_STOP_GRACE_SECONDS to finish its page before it is
+    left running. Sources still queued once every round of workers could
+    have timed out are skipped. Returns the report of every source, by
+    source name.
+    """
+    if not collectors:
+        return {}
+
+    timeout = settings.COLLECTION_SOURCE_TIMEOUT_SECONDS
+    max_workers = min(settings.COLLECTION_MAX_WORKERS, len(collectors))
+    started: Dict[str, float] = {}
+    finished: Dict[str, float] = {}
+    stops = {name: threading.Event() for name in collectors}
+    reports = {
+        name: {"status": "success", "events": 0, "events_failed": 0}
+        for name in collectors
+    }
+
+    def collect(name: str, collector):
+        started[name] = time.monotonic()
+        try:
+            collector(stops[name], reports[name])
+        finally:
+            finished[name] = time.monotonic()
+
+    sources = {}
+    run_deadline = time.monotonic() + timeout * math.ceil(len(collectors) / max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect")
+    futures = {
+        executor.submit(collect, name, collector): name
+        for name, collector in collectors.items()
+    }
+    pending = set(futures)
+    stopped = set()
+
+    try:
+        while pending:
+            deadlines = [
+                started[futures[future]] + timeout
+                for future in pending
+                if futures[future] in started
+            ]
+            if len(deadlines) < len(pending):
+                # Sources still queued are skipped at the run deadline
+                deadlines.append(run_deadline)
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, min(deadlines) - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                name = futures[future]
+                report = reports[name]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error collecting events from {name}: {e}")
+                    report["status"] = "failed"
+                    report["error"] = str(e)
+                sources[name] = {
+                    **report,
+                    "duration_seconds": round(finished[name] - started[name], 3),
+                }
+
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if name in started:
+                    if now - started[name] < timeout:
+                        continue
+                    print(f"Timed out collecting events from {name}")
+                    status = "timeout"
+                    stopped.add(future)
+                elif now >= run_deadline:
+                    future.cancel()
+                    status = "skipped"
+                else:
+                    continue
+                pending.discard(future)
+                stops[name].set()
+                sources[name] = {
+                    **reports[name],
+                    "status": status,
+                    "duration_seconds": round(now - started.get(name, now), 3),
+                }
+
+        # Give timed out sources a moment to finish the page in flight, so
+        # their reports count what they wrote
+        done, _ = wait(stopped, timeout=settings.COLLECTION_STOP_GRACE_SECONDS)
+        for future in done:
+            name = futures[future]
+            report = reports[name]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error collecting events from {name}: {e}")
+                report["status"] = "failed"
+                report["error"] = str(e)
+            sources[name] = {
+                **report,
+                "status": (
+                    "timeout" if report["status"] == "success" else report["status"]
+                ),
+                "duration_seconds": round(finished[name] - started[name], 3),
+            }
+    finally:
+        # Do not wait for sources that were told to stop
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return sources
+
+
 def _get_detector(integration: Integration):
     """Get detector instance from integration model."""
     config = integration.config
@@ -98,7 +395,12 @@ def _get_detector(integration: Integration):
             "password": config.get("password") or settings.SPLUNK_PASSWORD,
             "verify_ssl": config.get("verify_ssl", settings.SPLUNK_VERIFY_SSL),
             "search_query": config.get("search_query"),
-            "max_results": config.get("max_results", 1000),
+            "page_size": config.get("page_size"),
+            "max_results": config.get("max_results"),
+            "collect_since": config.get("collect_since"),
+            "ingest_lag_seconds": config.get(
+                "ingest_lag_seconds", settings.COLLECTION_INGEST_LAG_SECONDS
+            ),
         }
     elif integration.integration_type == IntegrationType.SIEM_ELASTIC:
         detector_config = {
@@ -108,7 +410,12 @@ def _get_detector(integration: Integration):
             "password": config.get("password") or settings.ELASTIC_PASSWORD,
             "verify_ssl": config.get("verify_ssl", settings.ELASTIC_VERIFY_SSL),
             "indices": config.get("indices"),
-            "max_results": config.get("max_results", 1000),
+            "page_size": config.get("page_size"),
+            "max_results": config.get("max_results"),
+            "collect_since": config.get("collect_since"),
+            "ingest_lag_seconds": config.get(
+                "ingest_lag_seconds", settings.COLLECTION_INGEST_LAG_SECONDS
+            ),
         }
     else:
         return None
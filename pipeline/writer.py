@@ -0,0 +1,104 @@
+"""Batched event persistence for the ingestion pipeline."""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from alerts.tasks import process_events_to_alerts
+from config.settings import settings
+from models.event import Event
+from pipeline.rollups import record_event_counts
+
+
+def insert_events(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert event rows with multi-row INSERT ... RETURNING and return their ids.
+
+    Ids are returned in the same order as ``rows``. The event count rollup is
+    updated in the same transaction. The caller owns the transaction and is
+    responsible for committing it.
+    """
+    if not rows:
+        return []
+
+    result = db.execute(
+        insert(Event).returning(
+            Event.id, Event.created_at, sort_by_parameter_order=True
+        ),
+        rows,
+    ).all()
+    record_event_counts(
+        db,
+        (
+            (created_at, row["source"], row["event_type"])
+            for (_, created_at), row in zip(result, rows)
+        ),
+    )
+    return [row[0] for row in result]
+
+
+def enqueue_alert_processing(
+    event_ids: List[int], chunk_size: Optional[int] = None
+) -> int:
+    """Queue alert processing for events as a few chunked tasks.
+
+    Returns the number of tasks queued.
+    """
+    chunk_size = chunk_size or settings.ALERT_TASK_CHUNK_SIZE
+    tasks = 0
+    for start in range(0, len(event_ids), chunk_size):
+        process_events_to_alerts.delay(event_ids[start : start + chunk_size])
+        tasks += 1
+    return tasks
+
+
+class EventBatchWriter:
+    """Buffers event rows and flushes them to the database in micro-batches.
+
+    Every flush is its own transaction followed by one alert processing task,
+    so memory stays bounded by ``batch_size`` regardless of how many events
+    pass through the writer. Only counters are kept across flushes.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: Optional[int] = None,
+        enqueue_alerts: bool = True,
+    ):
+        """Initialize the writer."""
+        self.db = db
+        self.batch_size = batch_size or settings.EVENT_BATCH_SIZE
+        self.enqueue_alerts = enqueue_alerts
+        self.rows: List[Dict[str, Any]] = []
+        self.inserted = 0
+        self.failed = 0
+        self.batches = 0
+        self.tasks_queued = 0
+
+    def add(self, values: Dict[str, Any]) -> List[int]:
+        """Buffer one event row, flushing when the batch is full."""
+        self.rows.append(values)
+        if len(self.rows) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> List[int]:
+        """Insert buffered rows, commit and queue alert processing."""
+        if not self.rows:
+            return []
+
+        rows, self.rows = self.rows, []
+        try:
+            event_ids = insert_events(self.db, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.failed += len(rows)
+            raise
+
+        self.inserted += len(event_ids)
+        self.batches += 1
+        if self.enqueue_alerts:
+            self.tasks_queued += enqueue_alert_processing(event_ids)
+        return event_ids
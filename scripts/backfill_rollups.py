@@ -0,0 +1,53 @@
+"""Rebuild the event and alert count rollups from the raw tables.
+
+Run once after upgrading to fill the rollups for data ingested before they
+existed, or with --since to repair a recent range.
+
+Usage:
+    python scripts/backfill_rollups.py
+    python scripts/backfill_rollups.py --since 2024-01-01T00:00:00
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.database import Base, SessionLocal, engine
+from models import *  # Import all models
+from pipeline.rollups import backfill_rollups
+
+
+def main():
+    """Parse arguments and rebuild the rollups."""
+    parser = argparse.ArgumentParser(description="Rebuild the count rollups")
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only rebuild buckets from this UTC time (default: everything)",
+    )
+    args = parser.parse_args()
+
+    # Create the rollup tables if they do not exist yet
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        written = backfill_rollups(db, since=args.since)
+        db.commit()
+        for table, rows in written.items():
+            print(f"✅ {table}: {rows} rows")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error backfilling rollups: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""API routers on their own app over a temporary database, for tests."""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from api.routes import events as events_routes
+from config.database import get_async_db
+from models.base import Base
+from pipeline import writer
+
+
+def routes_client(routers, rows=(), create_tables=True) -> TestClient:
+    """Client for ``routers`` (prefix -> router) over a database holding ``rows``.
+
+    The database is a temporary file, so the async sessions of the app get
+    their own connections. Without ``create_tables`` it has no tables, so
+    every write fails.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "events.db")
+    engine = create_engine(f"sqlite:///{path}")
+    if create_tables:
+        Base.metadata.create_all(engine)
+        with Session(engine, expire_on_commit=False) as db:
+            db.add_all(rows)
+            db.commit()
+    engine.dispose()
+
+    sessions = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    )
+
+    async def get_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    for prefix, router in routers.items():
+        app.include_router(router, prefix=prefix)
+    app.dependency_overrides[get_async_db] = get_db
+    return TestClient(app)
+
+
+def events_client(events=(), create_tables=True) -> TestClient:
+    """Client for the events routes over a database holding ``events``."""
+    return routes_client({"/events": events_routes.router}, events, create_tables)
+
+
+@contextmanager
+def queued_alert_tasks():
+    """Record alert processing tasks instead of sending them to the broker.
+
+    Yields the list of event id chunks the tasks were queued with.
+    """
+    queued = []
+    saved = writer.process_events_to_alerts
+    writer.process_events_to_alerts = SimpleNamespace(delay=queued.append)
+    try:
+        yield queued
+    finally:
+        writer.process_events_to_alerts = saved
@@ -0,0 +1,118 @@
+"""Concurrency load test for the API.
+
+Keeps a number of clients busy with deep-page list queries, whose time goes
+into sorting and skipping rows in the database, and meanwhile measures how
+long cheap requests take. When handlers block the event loop, the cheap
+requests queue behind the heavy ones and their latency grows with the load;
+with non-blocking handlers it stays low.
+
+Usage:
+    uvicorn api.main:app --port 8000 &
+    python scripts/load_test_api.py --url http://localhost:8000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+HEAVY_PATHS = [
+    "/api/v1/events/?skip=10000&limit=50",
+    "/api/v1/events/?skip=20000&limit=50&source=splunk",
+    "/api/v1/alerts/?skip=1000&limit=50",
+]
+PROBE_PATH = "/api/v1/incidents/?limit=10"
+
+
+def _percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers."""
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+async def _heavy_client(session, base_url, stop_at, latencies, errors):
+    """Issue heavy requests back to back until the deadline."""
+    i = 0
+    while time.perf_counter() < stop_at:
+        path = HEAVY_PATHS[i % len(HEAVY_PATHS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            async with session.get(base_url + path) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+        except aiohttp.ClientError as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+
+
+async def _probe_client(session, base_url, stop_at, interval, latencies, errors):
+    """Issue a cheap request every ``interval`` seconds until the deadline."""
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        try:
+            async with session.get(base_url + PROBE_PATH) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+        except aiohttp.ClientError as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+def _report(name, latencies, duration):
+    """Print latency percentiles and throughput."""
+    if not latencies:
+        print(f"{name:<8} no requests completed")
+        return
+    print(
+        f"{name:<8} {len(latencies):>6} req {len(latencies) / duration:>8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1e3:>8.1f}ms  "
+        f"p95 {_percentile(latencies, 95) * 1e3:>8.1f}ms  "
+        f"max {max(latencies) * 1e3:>8.1f}ms"
+    )
+
+
+async def run(base_url, concurrency, duration, probe_interval):
+    """Run the load test and print the results."""
+    base_url = base_url.rstrip("/")
+    heavy_latencies, probe_latencies, errors = [], [], []
+    connector = aiohttp.TCPConnector(limit=concurrency + 1)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        stop_at = time.perf_counter() + duration
+        await asyncio.gather(
+            _probe_client(
+                session, base_url, stop_at, probe_interval, probe_latencies, errors
+            ),
+            *(
+                _heavy_client(session, base_url, stop_at, heavy_latencies, errors)
+                for _ in range(concurrency)
+            ),
+        )
+
+    print(f"\n{base_url}: {concurrency} heavy clients for {duration:.0f}s")
+    print("-" * 80)
+    _report("heavy", heavy_latencies, duration)
+    _report("probe", probe_latencies, duration)
+    if errors:
+        print(f"errors: {len(errors)} (first: {errors[0]})")
+
+
+def main():
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="API concurrency load test")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.duration, args.probe_interval))
+
+
+if __name__ == "__main__":
+    main()
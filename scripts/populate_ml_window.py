@@ -5,7 +5,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from alerts.tasks import _get_event_context
+from alerts.tasks import get_event_contexts
 from config.database import SessionLocal
 from ml.singleton import get_ml_system
 from models.event import Event
@@ -24,9 +24,9 @@ def populate_ml_window():
         print(f"Found {len(events)} events")
 
         # Process each event to add to window
+        contexts = get_event_contexts(db, events)
         processed = 0
-        for event in events:
-            context = _get_event_context(db, event)
+        for event, context in zip(events, contexts):
             ml_system.process_event(event, context)
             processed += 1
             if processed % 20 == 0:
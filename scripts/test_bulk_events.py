@@ -0,0 +1,130 @@
+"""Tests for bulk event ingestion through POST /events/bulk.
+
+The events router runs on its own app against a temporary database; alert
+processing tasks are recorded instead of queued.
+
+Run directly or with pytest:
+    python scripts/test_bulk_events.py
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.settings import settings
+from pipeline.writer import enqueue_alert_processing
+from scripts.events_app import events_client, queued_alert_tasks
+
+
+@contextmanager
+def _settings(**values):
+    """Override settings for the duration of a test."""
+    saved = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def _record(i, **fields):
+    """A valid bulk record."""
+    return {
+        "source": "custom",
+        "event_type": "login_failure",
+        "raw_data": {"n": i},
+        "source_ip": f"10.0.0.{i}",
+        "description": f"event {i}",
+        **fields,
+    }
+
+
+def test_rejected_records_keep_their_positions():
+    """Bad records are reported by index; event_ids follow the input."""
+    records = [
+        _record(0),
+        _record(1, source="mainframe"),
+        _record(2),
+        {"source": "custom", "raw_data": {}},  # no event_type
+        _record(4),
+    ]
+    with queued_alert_tasks(), events_client() as client:
+        response = client.post("/events/bulk", json=records)
+    result = response.json()
+    assert response.status_code == 200
+    assert result["received"] == 5
+    assert result["inserted"] == 3
+    assert result["event_ids"] == [1, None, 2, None, 3]
+    assert [error["index"] for error in result["errors"]] == [1, 3]
+    assert "mainframe" in result["errors"][0]["error"]
+    assert "event_type" in result["errors"][1]["error"]
+
+
+def test_stored_events_match_records():
+    """Each returned id is the event stored from its record."""
+    records = [_record(i) for i in range(3)]
+    with queued_alert_tasks(), events_client() as client:
+        result = client.post("/events/bulk", json=records).json()
+        for i, event_id in enumerate(result["event_ids"]):
+            stored = client.get(f"/events/{event_id}").json()
+            assert stored["description"] == f"event {i}"
+            assert stored["source_ip"] == f"10.0.0.{i}"
+
+
+def test_too_many_records():
+    """More than EVENT_BULK_MAX_RECORDS records is rejected with 413."""
+    with _settings(EVENT_BULK_MAX_RECORDS=3), queued_alert_tasks() as queued:
+        with events_client() as client:
+            assert client.post("/events/bulk", json=[_record(0)] * 3).status_code == 200
+            response = client.post("/events/bulk", json=[_record(0)] * 4)
+    assert response.status_code == 413
+    assert len(queued) == 1
+
+
+def test_alert_tasks_are_chunked():
+    """Alert processing is queued in chunks of ALERT_TASK_CHUNK_SIZE ids."""
+    records = [_record(i) for i in range(5)]
+    with _settings(ALERT_TASK_CHUNK_SIZE=2), queued_alert_tasks() as queued:
+        with events_client() as client:
+            result = client.post("/events/bulk", json=records).json()
+    assert result["tasks_queued"] == 3
+    assert queued == [[1, 2], [3, 4], [5]]
+
+    with queued_alert_tasks() as queued:
+        assert enqueue_alert_processing([], chunk_size=2) == 0
+        assert enqueue_alert_processing(list(range(6)), chunk_size=3) == 2
+    assert queued == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_failed_insert_queues_nothing():
+    """A failing insert rejects the request and queues no alert task."""
+    with queued_alert_tasks() as queued:
+        with events_client(create_tables=False) as client:
+            response = client.post("/events/bulk", json=[_record(0)])
+    assert response.status_code == 400
+    assert queued == []
+
+
+if __name__ == "__main__":
+    tests = [
+        test_rejected_records_keep_their_positions,
+        test_stored_events_match_records,
+        test_too_many_records,
+        test_alert_tasks_are_chunked,
+        test_failed_insert_queues_nothing,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,213 @@
+"""Tests for collection checkpoints: the store and the detector side.
+
+Run directly or with pytest:
+    python scripts/test_collection_checkpoints.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from detection.base import BaseDetector
+from models.base import Base
+from models.checkpoint import CollectionCheckpoint
+from models.event import EventSource
+from models.integration import Integration, IntegrationType
+from pipeline.checkpoints import (
+    checkpoint_state,
+    claim_expired,
+    load_checkpoints,
+    save_checkpoint,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _session():
+    """Session on a fresh in-memory database with one integration."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[Integration.__table__, CollectionCheckpoint.__table__]
+    )
+    db = sessionmaker(bind=engine)()
+    db.add(
+        Integration(
+            id=1, name="es", integration_type=IntegrationType.SIEM_ELASTIC, config={}
+        )
+    )
+    db.commit()
+    return db
+
+
+def _state(seconds, *ids):
+    """Checkpoint state at START + ``seconds``."""
+    return {
+        "watermark": (START + timedelta(seconds=seconds)).isoformat(),
+        "boundary_ids": list(ids),
+    }
+
+
+class ListDetector(BaseDetector):
+    """Detector over a list of (timestamp, id) pairs, recording its fetches."""
+
+    def __init__(self, rows, **config):
+        super().__init__(config)
+        self.rows = rows
+        self.fetches = []
+
+    def get_source(self):
+        return EventSource.CUSTOM
+
+    def connect(self):
+        return True
+
+    def fetch_events(self, start_time=None, end_time=None):
+        self.fetches.append((start_time, end_time))
+        return [{"time": time, "id": event_id} for time, event_id in self.rows]
+
+    def normalize_event(self, raw_event):
+        return {"timestamp": raw_event["time"], "description": raw_event["id"]}
+
+    def get_event_time(self, raw_event):
+        return raw_event["time"]
+
+    def get_event_id(self, raw_event):
+        return raw_event["id"]
+
+
+def test_save_checkpoint_compare_and_set():
+    """Only the holder of the current version can move the checkpoint."""
+    db = _session()
+    first = save_checkpoint(db, 1, _state(1, "a"), None)
+    db.commit()
+    assert first is not None
+    assert save_checkpoint(db, 1, _state(9, "z"), None) is None  # already exists
+    db.commit()
+
+    second = save_checkpoint(db, 1, _state(2, "b"), first)
+    db.commit()
+    assert second is not None
+    assert save_checkpoint(db, 1, _state(3, "c"), first) is None  # stale version
+    db.commit()
+    db.expire_all()
+    assert checkpoint_state(load_checkpoints(db, [1])[1]) == _state(2, "b")
+
+
+def test_save_checkpoint_rewind():
+    """Moving back with the new version restores or removes the checkpoint."""
+    db = _session()
+    created = save_checkpoint(db, 1, _state(1, "a"), None)
+    moved = save_checkpoint(db, 1, _state(5, "e"), created)
+    db.commit()
+
+    rewound = save_checkpoint(db, 1, _state(1, "a"), moved)
+    db.commit()
+    db.expire_all()
+    assert rewound is not None
+    assert checkpoint_state(load_checkpoints(db, [1])[1]) == _state(1, "a")
+
+    assert save_checkpoint(db, 1, None, rewound) is not None
+    db.commit()
+    assert load_checkpoints(db, [1]) == {}
+
+
+def test_claim_and_release():
+    """A claim keeps the position and is released by the next move."""
+    db = _session()
+    claimed = save_checkpoint(db, 1, None, None, claim=True)
+    db.commit()
+    checkpoint = load_checkpoints(db, [1])[1]
+    assert checkpoint.claimed_at == claimed
+    assert checkpoint_state(checkpoint) is None  # nothing written yet
+    assert not claim_expired(claimed)
+    assert claim_expired(claimed, now=claimed + timedelta(hours=1))
+
+    moved = save_checkpoint(db, 1, _state(1, "a"), claimed)
+    db.commit()
+    db.expire_all()
+    checkpoint = load_checkpoints(db, [1])[1]
+    assert checkpoint.claimed_at is None
+    assert checkpoint_state(checkpoint) == _state(1, "a")
+
+    # Released without moving: a claim on the same position, then no claim
+    claimed = save_checkpoint(db, 1, _state(1, "a"), moved, claim=True)
+    assert save_checkpoint(db, 1, _state(1, "a"), claimed) is not None
+    db.commit()
+    db.expire_all()
+    assert load_checkpoints(db, [1])[1].claimed_at is None
+
+
+def test_skip_seen_and_advance():
+    """Seen events at the watermark are skipped; ties extend the boundary."""
+    rows = [
+        ((START + timedelta(seconds=1)).isoformat(), "a"),
+        ("2024-01-01T00:00:02Z", "b"),  # same instant as the watermark
+        ("2024-01-01T00:00:02+00:00", "c"),
+        ("2024-01-01T00:00:02.000+00:00", "d"),
+        (None, "no-time"),
+    ]
+    detector = ListDetector(rows)
+    events = detector.detect_events(end_time="x", checkpoint=_state(2, "b"))
+
+    # a is before the watermark only in this fake; the source filters it out
+    assert [event.description for event in events] == ["a", "c", "d", "no-time"]
+    assert detector.checkpoint == _state(2, "b", "c", "d")
+
+
+def test_advance_moves_to_newest():
+    """A newer event replaces the watermark and resets the boundary."""
+    rows = [
+        ("2024-01-01T00:00:05Z", "x"),
+        ("2024-01-01T00:00:07Z", "y"),
+        ("2024-01-01T00:00:07Z", "z"),
+        ("2024-01-01T00:00:06Z", "w"),
+    ]
+    detector = ListDetector(rows)
+    detector.detect_events(end_time="x", checkpoint=_state(2, "b"))
+    assert detector.checkpoint == _state(7, "y", "z")
+
+    empty = ListDetector([])
+    empty.detect_events(end_time="x", checkpoint=_state(2, "b"))
+    assert empty.checkpoint == _state(2, "b")
+
+
+def test_window_stops_before_ingest_lag():
+    """Pulls end ingest_lag_seconds before now and start 5 minutes earlier."""
+    detector = ListDetector([], ingest_lag_seconds=120)
+    before = datetime.now(timezone.utc)
+    detector.detect_events()
+    start_time, end_time = detector.fetches[0]
+
+    end = datetime.fromisoformat(end_time)
+    assert before - timedelta(seconds=121) < end <= before - timedelta(seconds=119)
+    assert datetime.fromisoformat(start_time) == end - timedelta(minutes=5)
+
+    detector.detect_events(checkpoint=_state(2, "b"))
+    assert detector.fetches[1][0] == _state(2)["watermark"]
+
+
+if __name__ == "__main__":
+    tests = [
+        test_save_checkpoint_compare_and_set,
+        test_save_checkpoint_rewind,
+        test_claim_and_release,
+        test_skip_seen_and_advance,
+        test_advance_moves_to_newest,
+        test_window_stops_before_ingest_lag,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
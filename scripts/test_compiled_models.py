@@ -0,0 +1,164 @@
+"""Parity tests for the compiled numpy tree evaluators.
+
+Run directly or with pytest:
+    python scripts/test_compiled_models.py
+"""
+
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier, IsolationForest
+
+from ml.compiled import CompiledGradientBoosting, CompiledIsolationForest, compile_model
+
+TOLERANCE = 1e-9
+
+
+def _make_data(n_samples=600, n_features=12, n_classes=5, seed=0):
+    """Random features with labels that depend on a few of them."""
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(n_samples, n_features))
+    # Repeated values exercise the <= threshold comparison
+    X[:, 3] = rng.randint(0, 3, size=n_samples)
+    signal = X[:, 0] + 0.5 * X[:, 1] - X[:, 2] + rng.normal(scale=0.3, size=n_samples)
+    y = np.digitize(signal, np.quantile(signal, np.linspace(0, 1, n_classes + 1)[1:-1]))
+    return X, y
+
+
+def _test_rows(n_features=12, seed=1):
+    """Rows to score: random, all-zero and out-of-range values."""
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(300, n_features))
+    X[:5] *= 100
+    X[5] = 0.0
+    return X
+
+
+def test_gradient_boosting_multiclass_parity():
+    """Multiclass predict_proba matches scikit-learn."""
+    X, y = _make_data()
+    model = GradientBoostingClassifier(
+        n_estimators=60, max_depth=5, learning_rate=0.1, subsample=0.8, random_state=42
+    ).fit(X, y)
+    compiled = CompiledGradientBoosting(model, max_batch=None)
+    X_test = _test_rows()
+
+    assert np.allclose(
+        compiled.predict_proba(X_test), model.predict_proba(X_test), atol=TOLERANCE
+    )
+    assert np.array_equal(compiled.predict(X_test), model.predict(X_test))
+    assert np.allclose(
+        compiled.predict_proba(X_test[:1]),
+        model.predict_proba(X_test[:1]),
+        atol=TOLERANCE,
+    )
+
+
+def test_gradient_boosting_binary_parity():
+    """Binary predict_proba matches scikit-learn for both losses."""
+    X, y = _make_data(n_classes=2)
+    X_test = _test_rows()
+    for loss in ("log_loss", "exponential"):
+        model = GradientBoostingClassifier(
+            loss=loss, n_estimators=40, max_depth=3, random_state=0
+        ).fit(X, y)
+        compiled = CompiledGradientBoosting(model, max_batch=None)
+        assert np.allclose(
+            compiled.predict_proba(X_test), model.predict_proba(X_test), atol=TOLERANCE
+        )
+
+
+def test_gradient_boosting_zero_init_parity():
+    """Models fitted with init="zero" compile too."""
+    X, y = _make_data(n_classes=3)
+    model = GradientBoostingClassifier(
+        init="zero", n_estimators=20, random_state=0
+    ).fit(X, y)
+    X_test = _test_rows()
+    assert np.allclose(
+        CompiledGradientBoosting(model, max_batch=None).predict_proba(X_test),
+        model.predict_proba(X_test),
+        atol=TOLERANCE,
+    )
+
+
+def test_isolation_forest_parity():
+    """score_samples, decision_function and predict match scikit-learn."""
+    X, _ = _make_data()
+    X_test = _test_rows()
+    for kwargs in (
+        {},
+        {"max_features": 0.5},
+        {"max_features": 0.5, "bootstrap": True, "max_samples": 64},
+        {"contamination": 0.1},
+    ):
+        model = IsolationForest(n_estimators=50, random_state=42, **kwargs).fit(X)
+        compiled = CompiledIsolationForest(model, max_batch=None)
+        assert np.allclose(
+            compiled.score_samples(X_test), model.score_samples(X_test), atol=TOLERANCE
+        ), kwargs
+        assert np.allclose(
+            compiled.decision_function(X_test),
+            model.decision_function(X_test),
+            atol=TOLERANCE,
+        ), kwargs
+        assert np.array_equal(compiled.predict(X_test), model.predict(X_test)), kwargs
+
+
+def test_large_batches_use_sklearn():
+    """Batches above max_batch give the same results via scikit-learn."""
+    X, y = _make_data()
+    X_test = _test_rows()
+    model = GradientBoostingClassifier(n_estimators=20, random_state=0).fit(X, y)
+    assert np.allclose(
+        CompiledGradientBoosting(model, max_batch=10).predict_proba(X_test),
+        CompiledGradientBoosting(model, max_batch=None).predict_proba(X_test),
+        atol=TOLERANCE,
+    )
+    forest = IsolationForest(n_estimators=20, random_state=0).fit(X)
+    assert np.allclose(
+        CompiledIsolationForest(forest, max_batch=10).score_samples(X_test),
+        CompiledIsolationForest(forest, max_batch=None).score_samples(X_test),
+        atol=TOLERANCE,
+    )
+
+
+def test_compile_model_dispatch():
+    """compile_model picks the right evaluator and skips unfitted models."""
+    X, y = _make_data(n_classes=3)
+    assert compile_model(GradientBoostingClassifier()) is None
+    assert compile_model(IsolationForest()) is None
+    assert compile_model(None) is None
+    assert isinstance(
+        compile_model(GradientBoostingClassifier(n_estimators=5).fit(X, y)),
+        CompiledGradientBoosting,
+    )
+    assert isinstance(
+        compile_model(IsolationForest(n_estimators=5).fit(X)),
+        CompiledIsolationForest,
+    )
+
+
+if __name__ == "__main__":
+    tests = [
+        test_gradient_boosting_multiclass_parity,
+        test_gradient_boosting_binary_parity,
+        test_gradient_boosting_zero_init_parity,
+        test_isolation_forest_parity,
+        test_large_batches_use_sklearn,
+        test_compile_model_dispatch,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,285 @@
+"""Tests for point-in-time paging in ElasticDetector against a fake server.
+
+The fake server implements the few Elasticsearch endpoints the detector
+uses (ping, open/close point in time and search with search_after) over
+an in-memory list of documents.
+
+Run directly or with pytest:
+    python scripts/test_elastic_paging.py
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from detection.elastic_detector import SOURCE_FIELDS, ElasticDetector
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse(value):
+    """Parse an ISO 8601 timestamp as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class FakeElasticsearch:
+    """In-memory documents plus a log of the requests received."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.searches = []
+        self.open_pits = set()
+        self.pit_counter = 0
+        # Searches from this one on are rejected, if set
+        self.fail_from_search = None
+
+    def search(self, body):
+        """Run a point-in-time search with range, sort and search_after."""
+        self.searches.append(body)
+        assert body["pit"]["id"] in self.open_pits
+        time_range = body["query"]["bool"]["must"][0]["range"]["@timestamp"]
+        gte, lte = _parse(time_range["gte"]), _parse(time_range["lte"])
+
+        # Sort values are (epoch millis, position), like @timestamp + _shard_doc
+        hits = []
+        for position, document in enumerate(self.documents):
+            timestamp = _parse(document["@timestamp"])
+            if gte <= timestamp <= lte:
+                key = [int(timestamp.timestamp() * 1000), position]
+                hits.append((key, position, document))
+        hits.sort(key=lambda hit: hit[0])
+        if body.get("search_after"):
+            hits = [hit for hit in hits if hit[0] > body["search_after"]]
+
+        includes = body.get("_source")
+        return {
+            "pit_id": body["pit"]["id"],
+            "hits": {
+                "hits": [
+                    {
+                        "_index": "logs",
+                        "_id": f"doc-{position}",
+                        "_source": {
+                            field: value
+                            for field, value in document.items()
+                            if includes is None or field in includes
+                        },
+                        "sort": key,
+                    }
+                    for key, position, document in hits[: body["size"]]
+                ]
+            },
+        }
+
+
+def _make_handler(fake):
+    """Request handler class serving ``fake``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, payload=None, status=200):
+            data = json.dumps(payload or {}).encode()
+            self.send_response(status)
+            self.send_header("X-Elastic-Product", "Elasticsearch")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_HEAD(self):
+            self._reply()
+
+        def do_POST(self):
+            if "/_pit" in self.path:
+                fake.pit_counter += 1
+                pit_id = f"pit-{fake.pit_counter}"
+                fake.open_pits.add(pit_id)
+                self._reply({"id": pit_id})
+            elif (
+                fake.fail_from_search is not None
+                and len(fake.searches) + 1 >= fake.fail_from_search
+            ):
+                fake.searches.append(self._body())
+                error = {"type": "search_phase_execution_exception"}
+                self._reply({"error": error, "status": 400}, status=400)
+            else:
+                self._reply(fake.search(self._body()))
+
+        def do_DELETE(self):
+            fake.open_pits.discard(self._body()["id"])
+            self._reply({"succeeded": True, "num_freed": 1})
+
+    return Handler
+
+
+def _run(documents, **config):
+    """Start a fake server and return it with a connected detector."""
+    fake = FakeElasticsearch(documents)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(fake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    detector = ElasticDetector(
+        {"host": "http://127.0.0.1", "port": server.server_address[1], **config}
+    )
+    assert detector.connect()
+    return fake, server, detector
+
+
+def _documents(n, seconds_apart=1):
+    """``n`` documents, ``seconds_apart`` seconds apart (0: all tied)."""
+    return [
+        {
+            "@timestamp": (START + timedelta(seconds=i * seconds_apart)).isoformat(),
+            "message": f"event {i}",
+            "event_type": "login_failure",
+            "payload": "x" * 100,
+        }
+        for i in range(n)
+    ]
+
+
+WINDOW = {
+    "start_time": START.isoformat(),
+    "end_time": (START + timedelta(days=1)).isoformat(),
+}
+
+
+def test_pages_in_ascending_order():
+    """Every document comes back once, oldest first, in bounded pages."""
+    fake, server, detector = _run(_documents(2500), page_size=1000)
+    try:
+        pages = list(detector.fetch_event_pages(**WINDOW))
+        assert [len(page) for page in pages] == [1000, 1000, 500]
+        messages = [event["message"] for page in pages for event in page]
+        assert messages == [f"event {i}" for i in range(2500)]
+        assert not fake.open_pits, "point in time was not closed"
+        assert all(s["sort"][0] == {"@timestamp": "asc"} for s in fake.searches)
+    finally:
+        server.shutdown()
+
+
+def test_ties_across_pages():
+    """Documents sharing one timestamp are neither lost nor repeated."""
+    fake, server, detector = _run(_documents(250, seconds_apart=0), page_size=100)
+    try:
+        events = detector.fetch_events(**WINDOW)
+        assert len(events) == 250
+        assert len({event["_id"] for event in events}) == 250
+    finally:
+        server.shutdown()
+
+
+def test_source_filtering():
+    """Only the fields normalize_event reads are requested."""
+    fake, server, detector = _run(_documents(5))
+    try:
+        events = detector.fetch_events(**WINDOW)
+        assert fake.searches[0]["_source"] == SOURCE_FIELDS
+        assert "payload" not in events[0]
+        assert detector.normalize_event(events[0])["description"] == "event 0"
+    finally:
+        server.shutdown()
+
+
+def test_max_results():
+    """Paging stops after max_results documents."""
+    fake, server, detector = _run(_documents(50), page_size=20, max_results=45)
+    try:
+        pages = list(detector.fetch_event_pages(**WINDOW))
+        assert [len(page) for page in pages] == [20, 20, 5]
+        assert not fake.open_pits
+    finally:
+        server.shutdown()
+
+
+def test_resume_from_checkpoint():
+    """A checkpoint skips what was collected and advances page by page."""
+    documents = _documents(30, seconds_apart=0) + _documents(30)[1:]
+    fake, server, detector = _run(documents, page_size=7)
+    try:
+        first = detector.detect_events(end_time=WINDOW["end_time"], checkpoint=None)
+        assert first == []  # default window is the last 5 minutes
+
+        checkpoint = {"watermark": START.isoformat(), "boundary_ids": []}
+        pages = detector.detect_event_pages(
+            end_time=WINDOW["end_time"], checkpoint=checkpoint
+        )
+        events = next(pages)
+        assert len(events) == 7
+        assert detector.checkpoint["watermark"] == START.isoformat()
+        assert len(detector.checkpoint["boundary_ids"]) == 7
+        events += [event for page in pages for event in page]
+        assert len(events) == 59
+        assert detector.checkpoint == {
+            "watermark": (START + timedelta(seconds=29)).isoformat(),
+            "boundary_ids": ["logs/doc-58"],
+        }
+
+        # Nothing new: only the boundary document is fetched again, and skipped
+        assert (
+            detector.detect_events(
+                end_time=WINDOW["end_time"], checkpoint=detector.checkpoint
+            )
+            == []
+        )
+        assert not fake.open_pits
+    finally:
+        server.shutdown()
+
+
+def test_failed_search_is_raised():
+    """A failed search raises instead of ending the pages, and frees the PIT."""
+    fake, server, detector = _run(_documents(50), page_size=20)
+    fake.fail_from_search = 2
+    try:
+        pages = detector.fetch_event_pages(**WINDOW)
+        assert len(next(pages)) == 20
+        error = None
+        try:
+            next(pages)
+        except StopIteration:
+            pass
+        except Exception as e:
+            error = e
+        assert error is not None, "the failed search ended the pages quietly"
+        assert "search_phase_execution_exception" in str(error)
+        assert len(fake.searches) == 2
+        assert not fake.open_pits
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    tests = [
+        test_pages_in_ascending_order,
+        test_ties_across_pages,
+        test_source_filtering,
+        test_max_results,
+        test_resume_from_checkpoint,
+        test_failed_search_is_raised,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,285 @@
+"""Tests that the context providers count like the database context query.
+
+Events are stored in an in-memory database at fixed offsets from now, away
+from the window edges where minute buckets and exact timestamps differ.
+The Redis provider runs against fakeredis, or the configured Redis server
+under a throwaway key prefix; its tests are skipped if neither is there.
+
+Run directly or with pytest:
+    python scripts/test_event_context.py
+"""
+
+import os
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from alerts.context import WINDOW_1H, ContextEngine, RedisContextProvider
+from alerts.tasks import _query_event_context, get_event_contexts
+from config.settings import settings
+from models.base import Base
+from models.event import Event, EventSource, EventType
+
+# Minutes before now: inside 1 hour, inside 24 hours, older than 24 hours
+AGES = [0, 2, 5, 15, 30, 45, 55, 65, 90, 180, 600, 1200, 1400, 1500, 3000]
+EVENT_TYPES = [EventType.LOGIN_FAILURE, EventType.BRUTE_FORCE, EventType.PHISHING]
+
+
+def _events(n=300, seed=0, ages=AGES):
+    """``n`` unsaved random events, created ``ages`` minutes ago."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        Event(
+            source=EventSource.CUSTOM,
+            event_type=rng.choice(EVENT_TYPES),
+            raw_data={},
+            timestamp=now.isoformat(),
+            source_ip=rng.choice(["10.0.0.1", "10.0.0.2", "10.0.0.3", None]),
+            destination_ip=rng.choice(["192.168.1.1", "192.168.1.2", None]),
+            user=rng.choice(["alice", "bob", None]),
+            created_at=now - timedelta(minutes=rng.choice(ages), seconds=10),
+        )
+        for _ in range(n)
+    ]
+
+
+def _database(events):
+    """Session on an in-memory database holding ``events``."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Event.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add_all(events)
+    db.commit()
+    return db
+
+
+def _expected(db, events):
+    """Context of every event, counted in the database one by one."""
+    return [_query_event_context(db, event) for event in events]
+
+
+def test_engine_matches_database_after_warm_start():
+    """A warmed engine gives every stored event its database context."""
+    events = _events()
+    db = _database(events)
+    engine = ContextEngine()
+    assert engine.warm_start(db) == sum(
+        event.created_at >= datetime.utcnow() - timedelta(hours=24) for event in events
+    )
+    assert engine.lookup_many(events) == _expected(db, events)
+
+
+def test_engine_matches_database_as_events_arrive():
+    """Events observed after the warm start are counted like stored ones."""
+    events = _events()
+    old, new = events[::2], events[1::2]
+    db = _database(old)
+    engine = ContextEngine()
+    engine.warm_start(db)
+    db.add_all(new)
+    db.commit()
+
+    assert engine.lookup_many(new) == _expected(db, new)
+    assert [engine.get_context(event) for event in old] == _expected(db, old)
+
+
+def test_engine_counts_only_its_own_process():
+    """Events another process stored are missing from an engine's counts."""
+    db = _database(_events())
+    engine = ContextEngine()
+    engine.warm_start(db)
+
+    other_process = Event(
+        source=EventSource.CUSTOM,
+        event_type=EventType.PHISHING,
+        raw_data={},
+        timestamp=datetime.utcnow().isoformat(),
+        source_ip="10.0.0.1",
+    )
+    db.add(other_process)
+    db.commit()
+    probe = db.query(Event).filter(Event.source_ip == "10.0.0.1").first()
+    assert (
+        engine.get_context(probe)["source_ip_count"]
+        == _query_event_context(db, probe)["source_ip_count"] - 1
+    )
+
+
+def test_grouped_queries_match_database():
+    """Batch contexts from grouped queries equal the per-event queries."""
+    events = _events()
+    db = _database(events)
+    with _backend("database"):
+        assert get_event_contexts(db, events) == _expected(db, events)
+        assert get_event_contexts(db, []) == []
+
+
+def test_grouped_queries_over_many_values():
+    """Batches with more distinct values than one IN list are counted too."""
+    events = _events(2500)
+    for i, event in enumerate(events):
+        event.source_ip = f"10.1.{i % 1200 // 250}.{i % 250}"
+        event.user = f"user-{i % 1100}"
+    db = _database(events)
+    with _backend("database"):
+        assert get_event_contexts(db, events) == _expected(db, events)
+
+
+@contextmanager
+def _backend(name):
+    """Select a CONTEXT_BACKEND for the duration of a test."""
+    saved = settings.CONTEXT_BACKEND
+    settings.CONTEXT_BACKEND = name
+    try:
+        yield
+    finally:
+        settings.CONTEXT_BACKEND = saved
+
+
+def _redis():
+    """fakeredis, else the configured Redis server if it answers, else None."""
+    try:
+        import fakeredis
+
+        return fakeredis.FakeRedis()
+    except ImportError:
+        pass
+
+    import redis
+
+    client = redis.from_url(settings.REDIS_URL)
+    try:
+        client.ping()
+    except redis.RedisError:
+        return None
+    return client
+
+
+REDIS = _redis()
+needs_redis = pytest.mark.skipif(REDIS is None, reason="no fakeredis or Redis")
+
+
+def _provider():
+    """Provider on REDIS under a fresh key prefix."""
+    provider = RedisContextProvider(prefix=f"csirt:test:{uuid.uuid4().hex}")
+    provider.redis = REDIS
+    return provider
+
+
+def _keys(provider, *parts):
+    """Keys of the provider matching a pattern under its prefix."""
+    return [key.decode() for key in REDIS.scan_iter(provider._key(*parts))]
+
+
+# The provider counts the oldest of the 24 hours pro rata; no event here
+# falls in it, so its 24 hour counts are exact too
+REDIS_AGES = [age for age in AGES if not 23 * 60 <= age <= 25 * 60]
+
+
+@needs_redis
+def test_redis_matches_database_after_warm_start():
+    """Warmed shared counters give every stored event its database context."""
+    events = _events(120, ages=REDIS_AGES)
+    db = _database(events)
+    provider = _provider()
+    assert not provider.is_warm
+    provider.warm_start(db)
+    assert provider.is_warm
+    assert provider.lookup_many(events, chunk_size=32) == _expected(db, events)
+
+
+@needs_redis
+def test_redis_matches_database_as_events_arrive():
+    """Events counted by a lookup are seen by the same and later lookups."""
+    events = _events(120, ages=REDIS_AGES)
+    old, new = events[::2], events[1::2]
+    db = _database(old)
+    provider = _provider()
+    provider.warm_start(db)
+    db.add_all(new)
+    db.commit()
+
+    assert provider.lookup_many(new, chunk_size=32) == _expected(db, new)
+    assert provider.lookup_many(old, chunk_size=32) == _expected(db, old)
+
+
+@needs_redis
+def test_redis_counts_each_event_once():
+    """The seen bitmap keeps other workers and backfills from recounting."""
+    events = _events(120, ages=REDIS_AGES)
+    db = _database(events)
+    expected = _expected(db, events)
+
+    provider = _provider()
+    assert provider.lookup_many(events) == expected
+    # A second worker sharing the counters, and a backfill after the fact
+    other = _provider()
+    other.prefix = provider.prefix
+    assert other.lookup_many(events) == expected
+    assert other.warm_start(db) == 0
+    assert provider.lookup_many(events) == expected
+
+    assert REDIS.bitcount(provider._key("seen")) == len(events)
+
+
+@needs_redis
+def test_redis_buckets_expire_with_their_window():
+    """Bucket hashes expire after their window; older ones are not read."""
+    events = _events(120, ages=REDIS_AGES)
+    db = _database(events)
+    provider = _provider()
+    provider.warm_start(db)
+
+    now = int(time.time()) // 60
+    minute_keys = _keys(provider, "m", "*")
+    hour_keys = _keys(provider, "h", "*")
+    assert minute_keys and hour_keys
+    for key in minute_keys:
+        assert now - WINDOW_1H < int(key.rsplit(":", 1)[1]) <= now
+        assert 0 < REDIS.ttl(key) <= (WINDOW_1H + 2) * 60
+    for key in hour_keys:
+        assert now // 60 - 24 <= int(key.rsplit(":", 1)[1]) <= now // 60
+        assert 0 < REDIS.ttl(key) <= 26 * 3600
+
+    # A bucket just outside the hour, not expired yet, is not counted
+    REDIS.hincrby(provider._key("m", now - WINDOW_1H), "source_ip:10.0.0.1", 50)
+    assert provider.lookup_many(events) == _expected(db, events)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_engine_matches_database_after_warm_start,
+        test_engine_matches_database_as_events_arrive,
+        test_engine_counts_only_its_own_process,
+        test_grouped_queries_match_database,
+        test_grouped_queries_over_many_values,
+    ]
+    if REDIS is not None:
+        tests += [
+            test_redis_matches_database_after_warm_start,
+            test_redis_matches_database_as_events_arrive,
+            test_redis_counts_each_event_once,
+            test_redis_buckets_expire_with_their_window,
+        ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,125 @@
+"""Tests for writing events in micro-batches with EventProcessor.
+
+Events go to a temporary database; alert processing tasks are recorded
+instead of queued.
+
+Run directly or with pytest:
+    python scripts/test_event_processor.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.event import Event, EventSource, EventType
+from pipeline import processor
+from pipeline.processor import EventProcessor
+from scripts.events_app import queued_alert_tasks
+
+
+def _database():
+    """Point the processor at a fresh database and return a session on it."""
+    path = os.path.join(tempfile.mkdtemp(), "events.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    processor.SessionLocal = sessionmaker(bind=engine)
+    return processor.SessionLocal()
+
+
+def _events(n, broken=()):
+    """``n`` unsaved events; those at ``broken`` positions cannot be inserted."""
+    return [
+        Event(
+            source=None if i in broken else EventSource.CUSTOM,
+            event_type=EventType.LOGIN_FAILURE,
+            raw_data={"n": i},
+            timestamp="2024-01-01T00:00:00",
+            description=f"event {i}",
+        )
+        for i in range(n)
+    ]
+
+
+def _stored(db):
+    """Descriptions of the stored events by id."""
+    return dict(db.execute(select(Event.id, Event.description)).all())
+
+
+def test_all_chunks_written():
+    """Every chunk is inserted and queues one alert task."""
+    db = _database()
+    with queued_alert_tasks() as queued:
+        result = EventProcessor().process_events(_events(10), batch_size=4)
+    assert result["status"] == "success"
+    assert (result["processed"], result["failed"]) == (10, 0)
+    assert (result["batches"], result["tasks_queued"]) == (3, 3)
+    assert result["errors"] == []
+    assert queued == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+    assert sorted(_stored(db)) == result["event_ids"]
+
+
+def test_failing_chunk_is_partial():
+    """A chunk that fails is rolled back; the others are still written."""
+    db = _database()
+    with queued_alert_tasks() as queued:
+        result = EventProcessor().process_events(_events(10, broken={4}), batch_size=3)
+    assert result["status"] == "partial"
+    assert (result["processed"], result["failed"]) == (7, 3)
+    assert (result["batches"], result["tasks_queued"]) == (3, 3)
+    assert len(result["errors"]) == 1
+    assert len(queued) == 3 and sum(queued, []) == result["event_ids"]
+
+    stored = _stored(db)
+    assert sorted(stored) == result["event_ids"]
+    assert sorted(stored.values()) == sorted(
+        f"event {i}" for i in [0, 1, 2, 6, 7, 8, 9]
+    )
+
+
+def test_failing_last_chunk_is_partial():
+    """The final, short chunk failing is counted like any other."""
+    db = _database()
+    with queued_alert_tasks():
+        result = EventProcessor().process_events(_events(7, broken={6}), batch_size=3)
+    assert result["status"] == "partial"
+    assert (result["processed"], result["failed"]) == (6, 1)
+    assert len(_stored(db)) == 6
+
+
+def test_every_chunk_failing_is_failed():
+    """Nothing written and nothing queued when every chunk fails."""
+    db = _database()
+    with queued_alert_tasks() as queued:
+        result = EventProcessor().process_events(
+            _events(5, broken={0, 3}), batch_size=3
+        )
+    assert result["status"] == "failed"
+    assert (result["processed"], result["failed"]) == (0, 5)
+    assert len(result["errors"]) == 2
+    assert queued == [] and _stored(db) == {}
+
+
+if __name__ == "__main__":
+    tests = [
+        test_all_chunks_written,
+        test_failing_chunk_is_partial,
+        test_failing_last_chunk_is_partial,
+        test_every_chunk_failing_is_failed,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
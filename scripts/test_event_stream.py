@@ -0,0 +1,65 @@
+"""Tests for NDJSON event ingestion through POST /events/stream.
+
+The events router runs on its own app against a temporary database.
+
+Run directly or with pytest:
+    python scripts/test_event_stream.py
+"""
+
+import gzip
+import json
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.events_app import events_client, queued_alert_tasks
+
+EVENT = json.dumps({"event_type": "login_success", "description": "user login"})
+
+
+def test_invalid_lines_report_their_line_number():
+    """Rejected lines are reported by line number, blank lines included."""
+    body = "\n".join([EVENT, "", "not json", EVENT, "", ""]).encode()
+    with queued_alert_tasks() as queued, events_client() as client:
+        response = client.post("/events/stream", content=gzip.compress(body))
+    result = response.json()
+    assert response.status_code == 200
+    assert result["lines"] == 3
+    assert result["inserted"] == 2
+    assert result["rejected"] == 1
+    assert [error["line"] for error in result["errors"]] == [3]
+    assert result["status"] == "success"
+    assert result["tasks_queued"] == 1
+    assert queued == [[1, 2]]
+
+
+def test_failed_batch_reports_last_line_read():
+    """A failing write is reported at the line reached, not the line count."""
+    body = "\n".join([EVENT, "", "", EVENT]).encode()
+    with events_client(create_tables=False) as client:
+        response = client.post("/events/stream", content=body)
+    result = response.json()
+    assert result["lines"] == 2
+    assert result["inserted"] == 0
+    assert result["rejected"] == 2
+    assert [error["line"] for error in result["errors"]] == [4]
+    assert result["status"] == "failed"
+
+
+if __name__ == "__main__":
+    tests = [
+        test_invalid_lines_report_their_line_number,
+        test_failed_batch_reports_last_line_read,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,67 @@
+"""Tests for IOC extraction in ml.ioc.
+
+Run directly or with pytest:
+    python scripts/test_ioc.py
+"""
+
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ml.ioc import extract_iocs
+
+MD5 = "d41d8cd98f00b204e9800998ecf8427e"
+
+
+def _values(text, ioc_type):
+    return [ioc["value"] for ioc in extract_iocs(text) if ioc["type"] == ioc_type]
+
+
+def test_url_keeps_case():
+    """URLs are reported as written; their hosts are lowercased."""
+    text = "Beacon to http://Evil.xyz/PayLoad.bin from 10.0.0.5"
+    assert _values(text, "url") == ["http://Evil.xyz/PayLoad.bin"]
+    assert "evil.xyz" in _values(text, "domain")
+    assert _values(text, "ip") == ["10.0.0.5"]
+
+
+def test_hash_file_name():
+    """A file named after its hash yields both the hash and the name."""
+    text = f"dropped {MD5.upper()}.exe"
+    assert _values(text, "md5") == [MD5]
+    assert _values(text, "domain") == [f"{MD5}.exe"]
+
+
+def test_types_and_limits():
+    """Hashes are typed by length, values deduplicated and capped."""
+    sha1 = "da39a3ee5e6b4b0d3255bfef95601890afd80709"
+    text = " ".join(
+        [MD5, MD5, sha1, "127.0.0.1", "Bad-Domain.IO", "google.com"]
+        + [f"host{i}.evil.ru" for i in range(10)]
+    )
+    assert _values(text, "md5") == [MD5]
+    assert _values(text, "sha1") == [sha1]
+    assert _values(text, "ip") == []
+    domains = _values(text, "domain")
+    assert domains[0] == "bad-domain.io"
+    assert len(domains) == 5 and "google.com" not in domains
+
+
+if __name__ == "__main__":
+    tests = [
+        test_url_keeps_case,
+        test_hash_file_name,
+        test_types_and_limits,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,110 @@
+"""Tests for the IP address features in ml.ip_encoding.
+
+Run directly or with pytest:
+    python scripts/test_ip_encoding.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ml.ip_encoding import IP_FEATURE_COUNT, encode_ip
+
+SAMPLES = [
+    "10.0.0.1",
+    "192.168.1.20",
+    "255.255.255.255",
+    "0.0.0.0",
+    "2001:db8::1",
+    "fe80::1:2:3:4",
+    "::ffff:10.0.0.1",
+    "not-an-ip",
+    "10.0.0.256",
+    "",
+    None,
+]
+
+
+def test_ipv4_buckets():
+    """IPv4 addresses map to their /8, /16 and /24 networks scaled to [0, 1]."""
+    *buckets, _ = encode_ip("10.20.30.40")
+    assert buckets == [10 / 255, (10 * 256 + 20) / 65535, 0x0A141E / (2**24 - 1)]
+    assert encode_ip("0.0.0.0")[:3] == (0.0, 0.0, 0.0)
+    assert encode_ip("255.255.255.255")[:3] == (1.0, 1.0, 1.0)
+
+    # Hosts of one /24 share every bucket but not the hash
+    first, second = encode_ip("10.20.30.40"), encode_ip("10.20.30.41")
+    assert first[:3] == second[:3] and first[3] != second[3]
+    assert encode_ip("10.20.31.40")[:2] == first[:2]
+    assert encode_ip("10.20.31.40")[2] != first[2]
+
+
+def test_ipv6_buckets():
+    """IPv6 addresses map to their /32, /48 and /64 networks."""
+    *buckets, _ = encode_ip("2001:db8:1234:5678::1")
+    assert buckets == [
+        0x20010DB8 / (2**32 - 1),
+        0x20010DB81234 / (2**48 - 1),
+        0x20010DB812345678 / (2**64 - 1),
+    ]
+    assert encode_ip("ffff:ffff:ffff:ffff::")[:3] == (1.0, 1.0, 1.0)
+
+
+def test_invalid_values_get_zero_buckets():
+    """Non-addresses keep zero buckets and a hash that tells them apart."""
+    for value in ["not-an-ip", "10.0.0.256", "", None, "1.2.3"]:
+        assert encode_ip(value)[:3] == (0.0, 0.0, 0.0)
+    assert encode_ip("not-an-ip")[3] != encode_ip("10.0.0.256")[3]
+    assert encode_ip(None) == encode_ip("") == encode_ip("unknown")
+    assert encode_ip(" 10.0.0.1 ") == encode_ip("10.0.0.1")
+
+
+def test_features_in_range():
+    """Every value has IP_FEATURE_COUNT features in [0, 1]."""
+    for value in SAMPLES:
+        features = encode_ip(value)
+        assert len(features) == IP_FEATURE_COUNT
+        assert all(0.0 <= feature <= 1.0 for feature in features)
+
+
+def test_stable_across_processes():
+    """Other processes, with other hash seeds, compute the same features."""
+    script = (
+        "import json, sys; sys.path.insert(0, sys.argv[1]);"
+        "from ml.ip_encoding import encode_ip;"
+        "print(json.dumps([encode_ip(ip) for ip in json.loads(sys.argv[2])]))"
+    )
+    expected = [list(encode_ip(ip)) for ip in SAMPLES]
+    for seed in ["1", "2"]:
+        output = subprocess.run(
+            [sys.executable, "-c", script, project_root, json.dumps(SAMPLES)],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert json.loads(output) == expected
+
+
+if __name__ == "__main__":
+    tests = [
+        test_ipv4_buckets,
+        test_ipv6_buckets,
+        test_invalid_values_get_zero_buckets,
+        test_features_in_range,
+        test_stable_across_processes,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
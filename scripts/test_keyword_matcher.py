@@ -0,0 +1,147 @@
+"""Tests that KeywordMatcher counts like the substring scan it replaced.
+
+The old code counted ``sum(1 for kw in keywords if kw in text)`` per keyword
+list. Every test runs with pyahocorasick, when installed, and with the plain
+``in`` fallback.
+
+Run directly or with pytest:
+    python scripts/test_keyword_matcher.py
+"""
+
+import os
+import random
+import sys
+from contextlib import contextmanager
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import utils.keyword_matcher as keyword_matcher
+from alerts.prioritizer import (
+    EXPLOIT_KEYWORDS,
+    MALWARE_KEYWORDS,
+    PRIVILEGE_KEYWORDS,
+    SUSPICIOUS_PATTERNS,
+)
+from ml.detector import AlertClassifier
+from utils.keyword_matcher import KeywordMatcher
+
+# Keywords inside, overlapping and repeating each other
+OVERLAPPING = {
+    "a": ["admin", "administrator", "min", "ad"],
+    "b": ["administrator", "strat", "rat", "rat"],
+    "c": ["sql injection", "injection", "sql", "on", "n"],
+    "d": [],
+}
+WORDS = ["admin", "administrator", "strategy", "sql", "injection", "rat", "on"]
+
+
+def _reference(groups, text):
+    """Distinct keywords of each group found in ``text`` by substring."""
+    return {
+        name: sum(1 for kw in dict.fromkeys(keywords) if kw in text)
+        for name, keywords in groups.items()
+    }
+
+
+def _texts(n=300, seed=0):
+    """Random texts built from keyword fragments, joined with and without gaps."""
+    rng = random.Random(seed)
+    fragments = WORDS + ["x", " ", "", "sqlinjection", "ADMIN"]
+    return ["", "nothing here"] + [
+        rng.choice(["", " "]).join(rng.choices(fragments, k=rng.randint(1, 8)))
+        for _ in range(n)
+    ]
+
+
+@contextmanager
+def _backend(use_automaton):
+    """Run with or without the Aho-Corasick automaton."""
+    saved = keyword_matcher.AHOCORASICK_AVAILABLE
+    keyword_matcher.AHOCORASICK_AVAILABLE = saved and use_automaton
+    try:
+        yield
+    finally:
+        keyword_matcher.AHOCORASICK_AVAILABLE = saved
+
+
+def _backends():
+    """The matching backends available here."""
+    return [True, False] if keyword_matcher.AHOCORASICK_AVAILABLE else [False]
+
+
+def test_overlapping_keywords_match_substring_scan():
+    """Nested, overlapping and shared keywords count like ``in``."""
+    for use_automaton in _backends():
+        with _backend(use_automaton):
+            matcher = KeywordMatcher()
+            for name, keywords in OVERLAPPING.items():
+                matcher.set_group(name, keywords)
+            for text in _texts():
+                assert matcher.match(text) == _reference(OVERLAPPING, text), text
+
+
+def test_prioritizer_and_classifier_keywords_match_old_counts():
+    """The real keyword lists give the counts of the old per-keyword loops."""
+    patterns = AlertClassifier().patterns
+    groups = {
+        "malware": MALWARE_KEYWORDS,
+        "suspicious": SUSPICIOUS_PATTERNS,
+        "exploit": EXPLOIT_KEYWORDS,
+        "privilege": PRIVILEGE_KEYWORDS,
+        **{name: pattern["keywords"] for name, pattern in patterns.items()},
+    }
+    vocabulary = sorted({kw for keywords in groups.values() for kw in keywords})
+    rng = random.Random(1)
+    texts = [
+        " ".join(rng.choices(vocabulary + ["benign", "login"], k=rng.randint(0, 6)))
+        for _ in range(300)
+    ]
+    for use_automaton in _backends():
+        with _backend(use_automaton):
+            matcher = KeywordMatcher()
+            for name, keywords in groups.items():
+                matcher.set_group(name, keywords)
+            for text in texts:
+                hits = matcher.match(text)
+                for name, keywords in groups.items():
+                    assert hits[name] == sum(1 for kw in keywords if kw in text)
+
+
+def test_group_changes_invalidate_cached_results():
+    """Changed and removed groups are reflected in the next match."""
+    for use_automaton in _backends():
+        with _backend(use_automaton):
+            matcher = KeywordMatcher(cache_size=2)
+            matcher.sync_groups("p:", {"x": ["root"], "y": ["sudo"]})
+            text = "sudo to root"
+            assert matcher.match(text) == {"p:x": 1, "p:y": 1}
+
+            matcher.set_group("p:x", ["root", "to"])
+            assert matcher.match(text) == {"p:x": 2, "p:y": 1}
+
+            matcher.set_group("q:z", ["o"])
+            matcher.sync_groups("p:", {"y": ["sudo", "missing"]})
+            assert matcher.match(text) == {"q:z": 1, "p:y": 1}
+
+            # Results handed out are copies, not the cached dict
+            matcher.match(text)["q:z"] = 99
+            assert matcher.match(text)["q:z"] == 1
+
+
+if __name__ == "__main__":
+    tests = [
+        test_overlapping_keywords_match_substring_scan,
+        test_prioritizer_and_classifier_keywords_match_old_counts,
+        test_group_changes_invalidate_cached_results,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
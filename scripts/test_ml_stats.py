@@ -0,0 +1,126 @@
+"""Tests for the ML window statistics and their sharing between workers.
+
+Run directly or with pytest:
+    python scripts/test_ml_stats.py
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ml.stats import (
+    SNAPSHOT_TTL_SECONDS,
+    SNAPSHOTS_KEY,
+    MLWindowStats,
+    SnapshotPublisher,
+)
+
+
+class FakeRedis:
+    """The few hash commands the publisher uses, in memory."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field.encode()] = value.encode()
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def expire(self, key, seconds):
+        pass
+
+
+def _result(is_anomaly, attack_type, risk_level):
+    return {
+        "is_anomaly": is_anomaly,
+        "classification": {"attack_type": attack_type},
+        "risk_level": risk_level,
+    }
+
+
+def _worker_snapshot(*results):
+    stats = MLWindowStats(window_size=10)
+    stats.record(list(results))
+    return stats.snapshot()
+
+
+def test_window_counts_follow_evictions():
+    """Counts cover only the last window_size results."""
+    stats = MLWindowStats(window_size=3)
+    stats.record([_result(True, "ddos", "high")] * 2)
+    stats.record([_result(False, None, "low")] * 2)
+    snapshot = stats.snapshot()
+    assert snapshot["events_in_window"] == 3
+    assert snapshot["anomalies_in_window"] == 1
+    assert snapshot["attack_types"] == {"ddos": 1, "unknown": 2}
+    assert snapshot["risk_levels"] == {"high": 1, "low": 2}
+    assert snapshot["events_processed"] == 4
+
+
+def test_load_merges_live_workers():
+    """Snapshots of every live worker are merged; stale ones are dropped."""
+    redis = FakeRedis()
+    publisher = SnapshotPublisher()
+    publisher._redis = redis
+
+    publisher.publish(_worker_snapshot(_result(True, "ddos", "high")), force=True)
+    other = {
+        **_worker_snapshot(_result(False, None, "low"), _result(True, "ddos", "high")),
+        "published_at": time.time(),
+    }
+    gone = {
+        **_worker_snapshot(_result(True, "malware", "critical")),
+        "published_at": time.time() - SNAPSHOT_TTL_SECONDS - 1,
+    }
+    redis.hset(SNAPSHOTS_KEY, "other:1", json.dumps(other))
+    redis.hset(SNAPSHOTS_KEY, "gone:1", json.dumps(gone))
+
+    merged = publisher.load()
+    assert merged["workers"] == 2
+    assert merged["events_in_window"] == 3
+    assert merged["anomalies_in_window"] == 2
+    assert abs(merged["anomaly_rate"] - 2 / 3) < 1e-9
+    assert merged["attack_types"] == {"ddos": 2, "unknown": 1}
+    assert "published_at" not in merged
+    assert b"gone:1" not in redis.hashes[SNAPSHOTS_KEY]
+
+
+def test_load_without_snapshots():
+    """Nothing published means no snapshot."""
+    publisher = SnapshotPublisher()
+    publisher._redis = FakeRedis()
+    assert publisher.load() is None
+
+
+if __name__ == "__main__":
+    tests = [
+        test_window_counts_follow_evictions,
+        test_load_merges_live_workers,
+        test_load_without_snapshots,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
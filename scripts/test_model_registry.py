@@ -0,0 +1,109 @@
+"""Tests for the versioned model store and cache in ml.registry.
+
+Run directly or with pytest:
+    python scripts/test_model_registry.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ml.registry import ModelRegistry
+
+
+def _model_path():
+    return os.path.join(tempfile.mkdtemp(), "model.pkl")
+
+
+def _wait_for_reload(registry, path, timeout=5.0):
+    """Wait until no reload of ``path`` is running."""
+    deadline = time.monotonic() + timeout
+    while path in registry._reloading and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_store_writes_version_and_metadata():
+    """store publishes the model, a version and its metadata."""
+    path = _model_path()
+    registry = ModelRegistry(check_interval=0)
+    entry = registry.store(path, {"model": 1}, {"samples": 10})
+
+    assert entry.data == {"model": 1}
+    assert entry.metadata["samples"] == 10
+    assert entry.metadata["name"] == "model"
+    assert registry.get(path) is entry
+    assert registry.list_versions(path) == [entry.metadata]
+
+    # A fresh process loads the file with the metadata of its version
+    loaded = ModelRegistry(check_interval=0).get(path)
+    assert loaded.data == {"model": 1}
+    assert loaded.metadata == entry.metadata
+
+
+def test_prune_keeps_newest_versions():
+    """Only the newest keep_versions versions stay on disk."""
+    path = _model_path()
+    registry = ModelRegistry(keep_versions=2)
+    stored = [registry.store(path, {"model": i}) for i in range(4)]
+
+    versions = registry.list_versions(path)
+    assert [v["version"] for v in versions] == [
+        stored[3].metadata["version"],
+        stored[2].metadata["version"],
+    ]
+    files = os.listdir(os.path.join(os.path.dirname(path), "versions", "model"))
+    assert len(files) == 4
+
+
+def test_reload_picks_up_changed_file():
+    """A file changed by another process is reloaded with its metadata."""
+    path = _model_path()
+    reader = ModelRegistry(check_interval=0)
+    ModelRegistry().store(path, {"model": "old"})
+    assert reader.get(path).data == {"model": "old"}
+
+    stored = ModelRegistry().store(path, {"model": "new", "pad": "x" * 10})
+    assert reader.get(path).data == {"model": "old"}  # served while loading
+    _wait_for_reload(reader, path)
+
+    entry = reader.get(path)
+    assert entry.data["model"] == "new"
+    assert entry.metadata == stored.metadata
+
+
+def test_reload_does_not_replace_newer_store():
+    """A reload finishing after a store keeps the stored entry."""
+    path = _model_path()
+    registry = ModelRegistry(check_interval=0)
+    first = registry.store(path, {"model": 1})
+    # The reload read the file before the second store replaced it
+    stale = registry._load(path)
+    second = registry.store(path, {"model": 2, "pad": "x" * 10})
+
+    registry._load = lambda path: stale
+    registry._reloading.add(path)
+    registry._reload(path, first.version)
+    assert registry.get(path) is second
+
+
+if __name__ == "__main__":
+    tests = [
+        test_store_writes_version_and_metadata,
+        test_prune_keeps_newest_versions,
+        test_reload_picks_up_changed_file,
+        test_reload_does_not_replace_newer_store,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,100 @@
+"""Tests for cursor pagination of the list endpoints.
+
+The events router runs on its own app against a temporary database.
+
+Run directly or with pytest:
+    python scripts/test_pagination.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from fastapi import HTTPException
+
+from api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from models.event import Event, EventSource, EventType
+from scripts.events_app import events_client
+
+CREATED = datetime(2024, 1, 1)
+
+
+def _client(n):
+    """Client for the events routes over ``n`` events, several per instant."""
+    return events_client(
+        Event(
+            source=EventSource.CUSTOM,
+            event_type=EventType.OTHER,
+            raw_data={},
+            timestamp=CREATED.isoformat(),
+            description=f"event {i}",
+            created_at=CREATED + timedelta(seconds=i // 3),
+        )
+        for i in range(n)
+    )
+
+
+def test_cursor_round_trip():
+    """A cursor decodes to the position it was made from."""
+    cursor = encode_cursor(CREATED, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (CREATED, 42)
+    try:
+        decode_cursor("not a cursor")
+        assert False, "malformed cursor accepted"
+    except HTTPException as e:
+        assert e.status_code == 400
+
+
+def test_pages_follow_the_header():
+    """Following X-Next-Cursor visits every row once, newest first."""
+    seen, cursor, pages = [], None, 0
+    with _client(10) as client:
+        while True:
+            params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/events/", params=params)
+            assert response.status_code == 200
+            seen += [event["id"] for event in response.json()]
+            pages += 1
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+    assert pages == 3
+    assert seen == list(range(10, 0, -1))
+
+
+def test_no_header_on_last_page():
+    """A page holding the last rows sets no cursor."""
+    with _client(4) as client:
+        response = client.get("/events/", params={"limit": 4})
+    assert len(response.json()) == 4
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_limit_must_be_positive():
+    """limit=0 is rejected as invalid input instead of failing the request."""
+    with _client(1) as client:
+        assert client.get("/events/", params={"limit": 0}).status_code == 422
+        assert client.get("/events/", params={"limit": -1}).status_code == 422
+
+
+if __name__ == "__main__":
+    tests = [
+        test_cursor_round_trip,
+        test_pages_follow_the_header,
+        test_no_header_on_last_page,
+        test_limit_must_be_positive,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,189 @@
+"""Tests that batch intelligent scoring matches the per-event scoring.
+
+``_reference_score`` is the per-event scoring AlertPrioritizer used before
+scores were computed for a whole feature matrix at once.
+
+Run directly or with pytest:
+    python scripts/test_priority_scoring.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from alerts.prioritizer import AlertPrioritizer
+from models.event import Event, EventSource, EventType
+
+
+def _reference_score(row) -> float:
+    """Intelligent score of one feature row, one branch at a time."""
+    (
+        event_type_severity,
+        severity_score_raw,
+        source_ip_freq,
+        dest_ip_freq,
+        user_freq,
+        has_malware,
+        has_suspicious,
+        has_exploit,
+        has_privilege,
+        network_anomaly,
+        time_score,
+        source_reliability,
+    ) = row
+
+    if severity_score_raw > 1.0:
+        severity_score = min(1.0, severity_score_raw / 10.0)
+    elif severity_score_raw <= 0:
+        severity_score = event_type_severity
+    else:
+        severity_score = severity_score_raw
+
+    base_score = event_type_severity * 0.40
+    base_score += severity_score * 0.30
+
+    keyword_multiplier = 1.0
+    if has_malware:
+        keyword_multiplier += 0.25
+    if has_exploit:
+        keyword_multiplier += 0.20
+    if has_privilege:
+        keyword_multiplier += 0.15
+    if has_suspicious:
+        keyword_multiplier += 0.10
+    keyword_multiplier = min(1.6, keyword_multiplier)
+    base_score = base_score * keyword_multiplier
+
+    base_score += network_anomaly * 0.15
+
+    avg_freq_log = (source_ip_freq + dest_ip_freq + user_freq) / 3.0
+    if avg_freq_log > 2.8:
+        freq_contrib = 0.10
+    elif avg_freq_log > 2.2:
+        freq_contrib = 0.07
+    elif avg_freq_log > 1.5:
+        freq_contrib = 0.04
+    elif avg_freq_log > 0.7:
+        freq_contrib = 0.02
+    else:
+        freq_contrib = 0.0
+    base_score += freq_contrib
+
+    base_score += (time_score - 0.4) * 0.05
+    base_score += (source_reliability - 0.65) * 0.02
+
+    if base_score > 0.90:
+        base_score = 0.90 + (base_score - 0.90) * 0.33
+    elif base_score > 0.85:
+        base_score = 0.85 + (base_score - 0.85) * 0.50
+
+    min_score = max(0.10, event_type_severity * 0.5)
+    max_score = min(0.95, event_type_severity * 1.2)
+    return max(min_score, min(max_score, base_score))
+
+
+def _prioritizer():
+    """Untrained prioritizer, so priorities come from intelligent scoring."""
+    return AlertPrioritizer(os.path.join(tempfile.mkdtemp(), "prioritizer.pkl"))
+
+
+def _feature_batch():
+    """Fixed feature rows covering every branch of the scoring."""
+    rng = np.random.RandomState(7)
+    n = 2000
+    severity = rng.choice([0.1, 0.3, 0.5, 0.7, 0.9, 1.0], n)
+    features = np.column_stack(
+        [
+            severity,
+            rng.choice([0.0, -1.0, 0.4, 1.0, 7.5, 15.0], n),
+            np.log1p(rng.randint(0, 40, (n, 3))),
+            rng.randint(0, 2, (n, 4)),
+            rng.choice([0.0, 0.3, 0.6, 0.9], n),
+            rng.choice([0.3, 0.4, 0.5, 0.7], n),
+            rng.choice([0.5, 0.65, 0.7, 0.8, 0.85], n),
+        ]
+    )
+    # Rows on the branch thresholds, and one clamped to its lower bound
+    edges = np.array(
+        [
+            [0.7, 1.0, 2.8, 2.8, 2.8, 0, 0, 0, 0, 0.0, 0.4, 0.65],
+            [0.7, 0.0, 2.2, 2.2, 2.2, 0, 0, 0, 0, 0.0, 0.4, 0.65],
+            [0.7, 10.0, 1.5, 1.5, 1.5, 1, 1, 1, 1, 0.0, 0.4, 0.65],
+            [0.7, 0.5, 0.7, 0.7, 0.7, 1, 0, 1, 0, 0.3, 0.4, 0.65],
+            [0.9, 0.1, 0.0, 0.0, 0.0, 0, 0, 0, 0, 0.0, 0.3, 0.5],
+        ]
+    )
+    return np.vstack([features, edges])
+
+
+def test_batch_scores_match_per_event_scores():
+    """Scores of a fixed feature batch equal the per-event scores."""
+    features = _feature_batch()
+    batch = _prioritizer()._calculate_intelligent_scores(features)
+    reference = np.array([_reference_score(row) for row in features])
+    assert np.allclose(batch, reference, rtol=0, atol=1e-12)
+    # The batch reaches both compression bands and both clamp bounds
+    lower = np.maximum(0.10, features[:, 0] * 0.5)
+    upper = np.minimum(0.95, features[:, 0] * 1.2)
+    assert (reference > 0.90).any()
+    assert ((reference > 0.85) & (reference <= 0.90)).any()
+    assert (reference == lower).any() and (reference == upper).any()
+
+
+def test_batch_priorities_match_per_event_priorities():
+    """predict_priorities on events agrees with scoring them one by one."""
+    prioritizer = _prioritizer()
+    descriptions = [
+        "Malware detected on host",
+        "exploit attempt with privilege escalation",
+        "suspicious login",
+        "routine heartbeat",
+        None,
+    ]
+    events, contexts = [], []
+    for i in range(60):
+        events.append(
+            Event(
+                source=list(EventSource)[i % len(EventSource)],
+                event_type=list(EventType)[i % len(EventType)],
+                raw_data={},
+                timestamp=f"2024-01-01T{i % 24:02d}:30:00",
+                description=descriptions[i % len(descriptions)],
+                severity_score=[None, "3", "8.5", "55", "bad"][i % 5],
+            )
+        )
+        contexts.append(
+            {
+                "source_ip_count": i % 30,
+                "destination_ip_count": (i * 7) % 20,
+                "user_count": i % 4,
+            }
+        )
+
+    predictions = prioritizer.predict_priorities(events, contexts)
+    for event, context, (priority, score) in zip(events, contexts, predictions):
+        expected = _reference_score(prioritizer.extract_features(event, context)[0])
+        assert abs(score - expected) < 1e-12
+        assert priority == prioritizer._intelligent_priority_mapping(expected)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_batch_scores_match_per_event_scores,
+        test_batch_priorities_match_per_event_priorities,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
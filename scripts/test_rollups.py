@@ -0,0 +1,197 @@
+"""Tests for the event and alert count rollups in pipeline.rollups.
+
+Run directly or with pytest:
+    python scripts/test_rollups.py
+"""
+
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  (registers every table)
+from models.alert import Alert, AlertPriority
+from models.base import Base
+from models.event import Event, EventSource, EventType
+from models.rollup import AlertCountHour, EventCountHour, EventCountMinute
+from pipeline.rollups import (
+    backfill_rollups,
+    event_type_counts,
+    prune_rollups,
+    record_alert_counts,
+    record_event_counts,
+)
+from pipeline.writer import insert_events
+
+NOW = datetime(2024, 1, 3, 12, 30, 15)
+SOURCES = [EventSource.SPLUNK, EventSource.ELASTIC]
+TYPES = [EventType.LOGIN_FAILURE, EventType.PHISHING, EventType.DDoS]
+
+
+def _session():
+    """Session on a fresh in-memory database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _rows(db, table):
+    """Rollup rows of a table as {key: count}."""
+    keys = [column for column in table.__table__.primary_key]
+    return {tuple(row[:-1]): row[-1] for row in db.execute(select(*keys, table.count))}
+
+
+def _event_rows(n=200, seed=0):
+    """Event column values spread over the two days before NOW."""
+    rng = random.Random(seed)
+    return [
+        {
+            "source": rng.choice(SOURCES),
+            "event_type": rng.choice(TYPES),
+            "raw_data": {},
+            "timestamp": NOW.isoformat(),
+            "created_at": NOW - timedelta(seconds=rng.randrange(2 * 24 * 3600)),
+        }
+        for _ in range(n)
+    ]
+
+
+def _expected(rows, resolution):
+    """Counts of event rows per (bucket, source, event_type)."""
+    return Counter(
+        (
+            row["created_at"] - (row["created_at"] - datetime.min) % resolution,
+            row["source"],
+            row["event_type"],
+        )
+        for row in rows
+    )
+
+
+def test_record_adds_to_existing_counts():
+    """Recording the same keys again adds to the rows already there."""
+    db = _session()
+    keys = [
+        (NOW, EventSource.SPLUNK, EventType.PHISHING),
+        (NOW + timedelta(seconds=20), EventSource.SPLUNK, EventType.PHISHING),
+        (NOW + timedelta(minutes=1), EventSource.SPLUNK, EventType.PHISHING),
+    ]
+    record_event_counts(db, keys)
+    record_event_counts(db, keys[:1])
+    db.commit()
+
+    minute = NOW.replace(second=0)
+    hour = NOW.replace(minute=0, second=0)
+    key = (EventSource.SPLUNK, EventType.PHISHING)
+    assert _rows(db, EventCountMinute) == {
+        (minute, *key): 3,
+        (minute + timedelta(minutes=1), *key): 1,
+    }
+    assert _rows(db, EventCountHour) == {(hour, *key): 4}
+
+    record_alert_counts(db, [(NOW, AlertPriority.HIGH)] * 2)
+    record_alert_counts(db, [(NOW, AlertPriority.HIGH), (NOW, AlertPriority.LOW)])
+    db.commit()
+    assert _rows(db, AlertCountHour) == {
+        (hour, AlertPriority.HIGH): 3,
+        (hour, AlertPriority.LOW): 1,
+    }
+
+
+def test_inserted_events_are_counted():
+    """insert_events keeps both event rollups equal to the raw events."""
+    db = _session()
+    rows = _event_rows()
+    for start in range(0, len(rows), 37):
+        insert_events(db, rows[start : start + 37])
+    db.commit()
+
+    assert _rows(db, EventCountMinute) == _expected(rows, timedelta(minutes=1))
+    assert _rows(db, EventCountHour) == _expected(rows, timedelta(hours=1))
+    assert event_type_counts(db, NOW - timedelta(hours=1)) == Counter(
+        row["event_type"]
+        for row in rows
+        if row["created_at"] >= (NOW - timedelta(hours=1)).replace(second=0)
+    )
+
+
+def test_backfill_rebuilds_from_raw_tables():
+    """A backfill replaces wrong or missing rollups with the raw counts."""
+    db = _session()
+    rows = _event_rows()
+    db.add_all(Event(**row) for row in rows)  # written without rollups
+    db.flush()
+    alert_times = [NOW - timedelta(hours=i % 30) for i in range(50)]
+    db.add_all(
+        Alert(
+            title="alert",
+            priority=AlertPriority.MEDIUM,
+            source="test",
+            created_at=created_at,
+        )
+        for created_at in alert_times
+    )
+    record_event_counts(db, [(NOW, EventSource.SPLUNK, EventType.DDoS)] * 5)
+    db.commit()
+
+    written = backfill_rollups(db)
+    db.commit()
+    expected_minutes = _expected(rows, timedelta(minutes=1))
+    assert _rows(db, EventCountMinute) == expected_minutes
+    assert _rows(db, EventCountHour) == _expected(rows, timedelta(hours=1))
+    assert written["event_counts_minute"] == len(expected_minutes)
+    assert sum(_rows(db, AlertCountHour).values()) == 50
+
+    # A partial backfill leaves older buckets alone
+    since = NOW - timedelta(hours=6)
+    db.execute(EventCountMinute.__table__.update().values(count=1000))
+    backfill_rollups(db, since=since)
+    db.commit()
+    for (bucket, *_), count in _rows(db, EventCountMinute).items():
+        if bucket >= since:
+            assert count < 1000
+        else:
+            assert count == 1000
+
+
+def test_prune_drops_old_minutes_only():
+    """Minute rows past the retention are deleted; hour rows are kept."""
+    db = _session()
+    rows = _event_rows()
+    insert_events(db, rows)
+    db.commit()
+    hours_before = _rows(db, EventCountHour)
+
+    deleted = prune_rollups(db, now=NOW + timedelta(hours=24))
+    db.commit()
+    kept = _rows(db, EventCountMinute)
+    assert deleted == len(_expected(rows, timedelta(minutes=1))) - len(kept)
+    assert deleted > 0 and kept
+    assert all(bucket >= NOW - timedelta(hours=24) for bucket, *_ in kept)
+    assert _rows(db, EventCountHour) == hours_before
+
+
+if __name__ == "__main__":
+    tests = [
+        test_record_adds_to_existing_counts,
+        test_inserted_events_are_counted,
+        test_backfill_rebuilds_from_raw_tables,
+        test_prune_drops_old_minutes_only,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
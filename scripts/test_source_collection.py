@@ -0,0 +1,394 @@
+"""Tests for collecting sources into the pipeline in pipeline.tasks.
+
+Sources are fake detectors and processors; checkpoints are stored in a
+temporary database.
+
+Run directly or with pytest:
+    python scripts/test_source_collection.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import settings
+from detection.base import BaseDetector
+from models.base import Base
+from models.checkpoint import CollectionCheckpoint
+from models.event import Event, EventSource
+from models.integration import Integration, IntegrationType
+from pipeline import tasks
+from pipeline.checkpoints import checkpoint_state, load_checkpoints
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _database(integrations=1):
+    """Point the tasks at a fresh database with integrations 1..n."""
+    # A file, so the sources collected in parallel get their own connections
+    path = os.path.join(tempfile.mkdtemp(), "collection.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Integration.__table__,
+            CollectionCheckpoint.__table__,
+            Event.__table__,
+        ],
+    )
+    tasks.SessionLocal = sessionmaker(bind=engine)
+    db = tasks.SessionLocal()
+    db.add_all(
+        Integration(
+            id=i,
+            name=f"es-{i}",
+            integration_type=IntegrationType.SIEM_ELASTIC,
+            config={},
+        )
+        for i in range(1, integrations + 1)
+    )
+    db.commit()
+    return db
+
+
+@contextmanager
+def _settings(**values):
+    """Override settings for the duration of a test."""
+    saved = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def _stored_checkpoint(db):
+    """Checkpoint state stored for the integration, or None."""
+    db.expire_all()
+    return checkpoint_state(load_checkpoints(db, [1]).get(1))
+
+
+def _state(seconds, *ids):
+    """Checkpoint state at START + ``seconds``."""
+    return {
+        "watermark": (START + timedelta(seconds=seconds)).isoformat(),
+        "boundary_ids": list(ids),
+    }
+
+
+class PagedDetector(BaseDetector):
+    """Detector returning fixed pages of events one second apart.
+
+    Event ``i`` is at START + ``i`` seconds; the first one is ``first``.
+    """
+
+    def __init__(self, page_sizes, page_seconds=0.0, reachable=True, first=0):
+        super().__init__({})
+        self.page_sizes = page_sizes
+        self.first = first
+        self.page_seconds = page_seconds
+        self.reachable = reachable
+        self.pages_fetched = 0
+
+    def get_source(self):
+        return EventSource.CUSTOM
+
+    def connect(self):
+        return self.reachable
+
+    def fetch_events(self, start_time=None, end_time=None):
+        return [event for page in self.fetch_event_pages() for event in page]
+
+    def fetch_event_pages(self, start_time=None, end_time=None):
+        position = self.first
+        for size in self.page_sizes:
+            time.sleep(self.page_seconds)
+            self.pages_fetched += 1
+            yield [
+                {"time": (START + timedelta(seconds=i)).isoformat(), "id": str(i)}
+                for i in range(position, position + size)
+            ]
+            position += size
+
+    def normalize_event(self, raw_event):
+        return {"timestamp": raw_event["time"], "description": raw_event["id"]}
+
+    def get_event_time(self, raw_event):
+        return raw_event["time"]
+
+    def get_event_id(self, raw_event):
+        return raw_event["id"]
+
+
+class FakeProcessor:
+    """Processor returning the given statuses, one page at a time."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.pages = []
+
+    def process_events(self, events):
+        self.pages.append(events)
+        status = self.statuses.pop(0) if self.statuses else "success"
+        written = {"success": len(events), "partial": 1, "failed": 0}[status]
+        return {
+            "processed": written,
+            "failed": len(events) - written,
+            "errors": [] if status == "success" else ["chunk failed"],
+            "status": status,
+        }
+
+
+class WritingProcessor:
+    """Processor storing events one by one, killed after ``kill_after``."""
+
+    def __init__(self, kill_after=None):
+        self.kill_after = kill_after
+
+    def process_events(self, events):
+        db = tasks.SessionLocal()
+        try:
+            for event in events:
+                if self.kill_after == 0:
+                    raise Killed()
+                db.add(event)
+                db.commit()
+                if self.kill_after is not None:
+                    self.kill_after -= 1
+        finally:
+            db.close()
+        return {"processed": len(events), "failed": 0, "status": "success"}
+
+
+class Killed(BaseException):
+    """The worker dies; nothing after it runs."""
+
+
+def _report():
+    return {"status": "success", "events": 0, "events_failed": 0}
+
+
+def _collect(processor, detector, stop=None):
+    """Collect integration 1 from its stored checkpoint and return the report."""
+    db = tasks.SessionLocal()
+    checkpoint = load_checkpoints(db, [1]).get(1)
+    db.close()
+    report = _report()
+    tasks._collect_source(
+        processor,
+        1,
+        detector,
+        checkpoint_state(checkpoint),
+        checkpoint and checkpoint.updated_at,
+        checkpoint and checkpoint.claimed_at,
+        stop or threading.Event(),
+        report,
+    )
+    return report
+
+
+def test_checkpoint_follows_pages():
+    """Every page is written and the checkpoint ends after the last one."""
+    db = _database()
+    processor = FakeProcessor()
+    report = _collect(processor, PagedDetector([2, 2, 1]))
+    assert report == {"status": "success", "events": 5, "events_failed": 0}
+    assert [len(page) for page in processor.pages] == [2, 2, 1]
+    assert _stored_checkpoint(db) == _state(4, "4")
+
+
+def test_partial_page_rewinds():
+    """A partly written page releases the checkpoint and stops the source."""
+    db = _database()
+    detector = PagedDetector([2, 2, 1])
+    report = _collect(FakeProcessor(["success", "partial"]), detector)
+    assert report["status"] == "partial"
+    assert report["events"] == 3 and report["events_failed"] == 1
+    assert detector.pages_fetched == 2
+    assert _stored_checkpoint(db) == _state(1, "1")
+    assert load_checkpoints(db, [1])[1].claimed_at is None
+
+
+def test_stop_between_pages():
+    """A stop request ends collection after the page being written."""
+    db = _database()
+    stop = threading.Event()
+    stop.set()
+    detector = PagedDetector([2, 2, 1])
+    report = _collect(FakeProcessor(), detector, stop)
+    assert report["events"] == 2
+    assert detector.pages_fetched == 1
+    assert _stored_checkpoint(db) == _state(1, "1")
+
+
+def test_superseded_run_writes_nothing():
+    """A run whose checkpoint version is stale stops before writing."""
+    db = _database()
+    _collect(FakeProcessor(), PagedDetector([1]))
+
+    processor, report = FakeProcessor(), _report()
+    tasks._collect_source(
+        processor,
+        1,
+        PagedDetector([3]),
+        None,
+        None,
+        None,
+        threading.Event(),
+        report,
+    )
+    assert report["status"] == "superseded"
+    assert processor.pages == []
+    assert _stored_checkpoint(db) == _state(0, "0")
+
+
+def test_killed_run_loses_no_events():
+    """A page whose writer died is fetched again once its claim expires."""
+    db = _database()
+    with _settings(COLLECTION_CLAIM_TIMEOUT_SECONDS=0.2):
+        try:
+            _collect(WritingProcessor(kill_after=3), PagedDetector([2, 2, 1]))
+            assert False, "the run was not killed"
+        except Killed:
+            pass
+        # Killed writing event 2: the checkpoint is still before its page
+        assert _stored_checkpoint(db) == _state(1, "1")
+
+        # The claim blocks other runs until it expires
+        processor = FakeProcessor()
+        report = _collect(processor, PagedDetector([2, 1], first=2))
+        assert report["status"] == "superseded"
+        assert processor.pages == []
+
+        time.sleep(0.3)
+        report = _collect(WritingProcessor(), PagedDetector([2, 1], first=2))
+
+    assert report["status"] == "success"
+    assert report["events"] == 2
+    assert _stored_checkpoint(db) == _state(4, "4")
+    stored = db.scalars(select(Event.description).order_by(Event.id)).all()
+    assert stored == ["0", "1", "2", "3", "4"]
+
+
+def _collector(integration_id, detector, processor=None):
+    """Collector of a detector, as collect_events_from_sources builds it."""
+    return partial(
+        tasks._collect_source,
+        processor or FakeProcessor(),
+        integration_id,
+        detector,
+        None,
+        None,
+        None,
+    )
+
+
+def test_parallel_reports():
+    """Fast, failing and slow sources each get their own report."""
+    _database(integrations=3)
+    slow = PagedDetector([1] * 100, page_seconds=0.05)
+    collectors = {
+        "fast": _collector(1, PagedDetector([2, 2, 1])),
+        "broken": _collector(2, PagedDetector([1], reachable=False)),
+        "slow": _collector(3, slow),
+    }
+    started = time.monotonic()
+    with _settings(
+        COLLECTION_MAX_WORKERS=3,
+        COLLECTION_SOURCE_TIMEOUT_SECONDS=0.5,
+        COLLECTION_STOP_GRACE_SECONDS=1.0,
+    ):
+        sources = tasks._collect_in_parallel(collectors)
+    elapsed = time.monotonic() - started
+
+    assert sources["fast"]["status"] == "success"
+    assert sources["fast"]["events"] == 5
+    assert sources["broken"]["status"] == "failed"
+    assert "Failed to connect" in sources["broken"]["error"]
+    assert sources["slow"]["status"] == "timeout"
+    assert 0 < sources["slow"]["events"] == slow.pages_fetched < 100
+    assert elapsed < 2.0, elapsed
+    assert all("duration_seconds" in report for report in sources.values())
+
+
+def test_queued_sources_skipped():
+    """Sources still queued at the run deadline are skipped, not waited for."""
+
+    def stuck(stop, report):
+        time.sleep(1.0)  # ignores the stop request
+
+    ran = []
+    collectors = {
+        "stuck": stuck,
+        "queued-1": lambda stop, report: ran.append(1),
+        "queued-2": lambda stop, report: ran.append(2),
+    }
+    started = time.monotonic()
+    with _settings(
+        COLLECTION_MAX_WORKERS=1,
+        COLLECTION_SOURCE_TIMEOUT_SECONDS=0.1,
+        COLLECTION_STOP_GRACE_SECONDS=0.1,
+    ):
+        sources = tasks._collect_in_parallel(collectors)
+    elapsed = time.monotonic() - started
+
+    assert sources["stuck"]["status"] == "timeout"
+    assert sources["queued-1"]["status"] == "skipped"
+    assert sources["queued-2"]["status"] == "skipped"
+    assert elapsed < 0.9, elapsed
+    time.sleep(1.0)
+    assert ran == []  # cancelled, not run once the worker freed up
+
+
+def test_timed_out_source_finishes_its_page():
+    """A timed out source gets the grace period to report its last page."""
+
+    def slow_page(stop, report):
+        while not stop.is_set():
+            time.sleep(0.01)
+        time.sleep(0.2)  # the page in flight
+        report["events"] += 10
+
+    with _settings(
+        COLLECTION_SOURCE_TIMEOUT_SECONDS=0.1, COLLECTION_STOP_GRACE_SECONDS=1.0
+    ):
+        sources = tasks._collect_in_parallel({"slow": slow_page})
+    assert sources["slow"]["status"] == "timeout"
+    assert sources["slow"]["events"] == 10
+    assert sources["slow"]["duration_seconds"] >= 0.3
+
+
+if __name__ == "__main__":
+    tests = [
+        test_checkpoint_follows_pages,
+        test_partial_page_rewinds,
+        test_stop_between_pages,
+        test_superseded_run_writes_nothing,
+        test_killed_run_loses_no_events,
+        test_parallel_reports,
+        test_queued_sources_skipped,
+        test_timed_out_source_finishes_its_page,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
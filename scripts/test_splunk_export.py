@@ -0,0 +1,225 @@
+"""Tests for streaming Splunk export collection in SplunkDetector.
+
+A fake service returns export responses as lazily produced JSON lines, so
+the tests can check how much of a response was read when a page comes out.
+
+Run directly or with pytest:
+    python scripts/test_splunk_export.py
+"""
+
+import io
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from detection.splunk_detector import SplunkDetector
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class LineStream(io.RawIOBase):
+    """Response body producing one JSON line per read, counting the lines read.
+
+    With ``fail_after`` the connection breaks after that many lines.
+    """
+
+    def __init__(self, lines, fail_after=None):
+        self.lines = iter(lines)
+        self.lines_read = 0
+        self.fail_after = fail_after
+        self.closed_by_reader = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.lines_read == self.fail_after:
+            raise ConnectionResetError("connection reset by peer")
+        line = next(self.lines, None)
+        if line is None:
+            return 0
+        self.lines_read += 1
+        data = (json.dumps(line) + "\n").encode()
+        # Lines here are far smaller than the reader's buffer
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        self.closed_by_reader = True
+        super().close()
+
+
+class FakeJobs:
+    """jobs.export returning a LineStream, filtered like earliest_time."""
+
+    def __init__(self, events, extra_lines=(), fail_after=None):
+        self.events = events
+        self.extra_lines = list(extra_lines)
+        self.fail_after = fail_after
+        self.exports = []
+        self.streams = []
+
+    def export(self, query, **params):
+        self.exports.append((query, params))
+        earliest = datetime.fromisoformat(params["earliest_time"])
+        lines = self.extra_lines + [
+            {"preview": False, "offset": i, "result": event}
+            for i, event in enumerate(self.events)
+            if datetime.fromisoformat(event["_time"]) >= earliest
+        ]
+        stream = LineStream(lines, self.fail_after)
+        self.streams.append(stream)
+        return stream
+
+
+class FakeSplunkDetector(SplunkDetector):
+    """SplunkDetector talking to FakeJobs instead of a Splunk server."""
+
+    def __init__(self, jobs, **config):
+        super().__init__(config)
+        self.splunk = type("Service", (), {"jobs": jobs})()
+
+    def connect(self):
+        return True
+
+
+def _events(n, seconds_apart=1):
+    """``n`` Splunk events, ``seconds_apart`` seconds apart."""
+    return [
+        {
+            "_time": (START + timedelta(seconds=i * seconds_apart)).isoformat(),
+            "_bkt": "main~1~ABC",
+            "_cd": f"1:{i}",
+            "_raw": f"event {i}",
+            "action": "login_failure",
+        }
+        for i in range(n)
+    ]
+
+
+WINDOW = {
+    "start_time": START.isoformat(),
+    "end_time": (START + timedelta(days=1)).isoformat(),
+}
+
+
+def test_pages_are_streamed():
+    """A page is yielded after reading only that page's lines."""
+    jobs = FakeJobs(_events(10_000))
+    detector = FakeSplunkDetector(jobs, page_size=100)
+    pages = detector.fetch_event_pages(**WINDOW)
+
+    first = next(pages)
+    assert len(first) == 100
+    assert jobs.streams[0].lines_read < 1000, jobs.streams[0].lines_read
+    assert sum(len(page) for page in pages) == 9_900
+    assert jobs.streams[0].closed_by_reader
+
+
+def test_export_parameters():
+    """The export runs oldest first over the window, in JSON, without previews."""
+    jobs = FakeJobs([])
+    list(FakeSplunkDetector(jobs).fetch_event_pages(**WINDOW))
+    query, params = jobs.exports[0]
+    assert "sort 0 _time" in query
+    assert params["output_mode"] == "json"
+    assert params["preview"] is False
+    assert params["earliest_time"] == WINDOW["start_time"]
+    assert params["latest_time"] == WINDOW["end_time"]
+
+
+def test_previews_and_messages_skipped():
+    """Preview results and diagnostic messages are not collected."""
+    extra_lines = [
+        {"preview": True, "offset": 0, "result": {"_raw": "preview"}},
+        {"messages": [{"type": "INFO", "text": "search started"}]},
+    ]
+    jobs = FakeJobs(_events(3), extra_lines=extra_lines)
+    events = FakeSplunkDetector(jobs).fetch_events(**WINDOW)
+    assert [event["_raw"] for event in events] == ["event 0", "event 1", "event 2"]
+
+
+def test_max_results():
+    """Streaming stops after max_results events and closes the response."""
+    jobs = FakeJobs(_events(50))
+    detector = FakeSplunkDetector(jobs, page_size=20, max_results=45)
+    pages = list(detector.fetch_event_pages(**WINDOW))
+    assert [len(page) for page in pages] == [20, 20, 5]
+    assert "| head 45" in jobs.exports[0][0]
+    assert jobs.streams[0].closed_by_reader
+
+
+def test_resume_from_checkpoint():
+    """The export starts at the watermark and skips what was collected."""
+    jobs = FakeJobs(_events(30))
+    detector = FakeSplunkDetector(jobs, page_size=10)
+    checkpoint = {
+        "watermark": (START + timedelta(seconds=9)).isoformat(),
+        "boundary_ids": ["main~1~ABC|1:9"],
+    }
+
+    pages = list(
+        detector.detect_event_pages(end_time=WINDOW["end_time"], checkpoint=checkpoint)
+    )
+    assert jobs.exports[0][1]["earliest_time"] == checkpoint["watermark"]
+    descriptions = [event.description for page in pages for event in page]
+    assert descriptions == [f"event {i}" for i in range(10, 30)]
+    assert detector.checkpoint == {
+        "watermark": (START + timedelta(seconds=29)).isoformat(),
+        "boundary_ids": ["main~1~ABC|1:29"],
+    }
+
+
+def _fetch_error(detector):
+    """The error fetching all pages raised, or None."""
+    try:
+        list(detector.fetch_event_pages(**WINDOW))
+    except Exception as e:
+        return e
+    return None
+
+
+def test_broken_stream_is_raised():
+    """A broken export raises instead of ending the events early."""
+    jobs = FakeJobs(_events(500), fail_after=150)
+    error = _fetch_error(FakeSplunkDetector(jobs, page_size=100))
+    assert isinstance(error, ConnectionResetError), error
+    assert jobs.streams[0].closed_by_reader
+
+
+def test_fatal_message_is_raised():
+    """A FATAL search message fails the fetch; an ERROR one does not."""
+    fatal = {"messages": [{"type": "FATAL", "text": "search was cancelled"}]}
+    error = _fetch_error(FakeSplunkDetector(FakeJobs(_events(3), [fatal])))
+    assert isinstance(error, RuntimeError), error
+    assert "search was cancelled" in str(error)
+
+    nonfatal = {"messages": [{"type": "ERROR", "text": "one indexer is down"}]}
+    jobs = FakeJobs(_events(3), [nonfatal])
+    assert len(FakeSplunkDetector(jobs).fetch_events(**WINDOW)) == 3
+
+
+if __name__ == "__main__":
+    tests = [
+        test_pages_are_streamed,
+        test_export_parameters,
+        test_previews_and_messages_skipped,
+        test_max_results,
+        test_resume_from_checkpoint,
+        test_broken_stream_is_raised,
+        test_fatal_message_is_raised,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
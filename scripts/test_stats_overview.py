@@ -0,0 +1,220 @@
+"""Tests for the dashboard counts served by GET /stats/overview.
+
+The stats and events routers run on their own app against a temporary
+database. Expected counts are tallied in Python from the stored rows.
+
+Run directly or with pytest:
+    python scripts/test_stats_overview.py
+"""
+
+import os
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from api.routes import events as events_routes
+from api.routes import stats as stats_routes
+from config.settings import settings
+from models.alert import Alert, AlertPriority, AlertStatus
+from models.event import Event, EventSource, EventType
+from models.incident import Incident, IncidentSeverity, IncidentStatus
+from models.rollup import AlertCountHour, EventCountHour
+from scripts.events_app import queued_alert_tasks, routes_client
+
+NOW = datetime.utcnow()
+
+
+@contextmanager
+def _settings(**values):
+    """Override settings, with an empty overview cache, for a test."""
+    saved = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    stats_routes._overview_cache.clear()
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        stats_routes._overview_cache.clear()
+
+
+def _rows(seed=0):
+    """Events, alerts and incidents spread over the last ten days."""
+    rng = random.Random(seed)
+
+    def created_at():
+        # Clear of the bucket edges, which move while a test runs
+        return NOW - timedelta(hours=rng.randrange(1, 240), minutes=rng.choice([0, 30]))
+
+    events = [
+        Event(
+            source=rng.choice(list(EventSource)),
+            event_type=rng.choice(list(EventType)),
+            raw_data={},
+            timestamp=NOW.isoformat(),
+            created_at=created_at(),
+        )
+        for _ in range(150)
+    ]
+    alerts = [
+        Alert(
+            title="alert",
+            status=rng.choice(list(AlertStatus)),
+            priority=rng.choice(list(AlertPriority)),
+            source="test",
+            created_at=created_at(),
+        )
+        for _ in range(80)
+    ]
+    incidents = [
+        Incident(
+            title="incident",
+            status=rng.choice(list(IncidentStatus)),
+            severity=rng.choice(list(IncidentSeverity)),
+        )
+        for _ in range(20)
+    ]
+    return events, alerts, incidents
+
+
+def _client(rows):
+    """Client for the stats and events routes over ``rows``."""
+    return routes_client(
+        {"/stats": stats_routes.router, "/events": events_routes.router}, rows
+    )
+
+
+def _tally(rows, attribute):
+    """Counts of the enum values of ``attribute`` over ``rows``."""
+    return dict(Counter(getattr(row, attribute).value for row in rows))
+
+
+def _histogram(rows, attribute, since, step):
+    """Expected histogram of ``rows`` created since ``since`` in ``step`` buckets."""
+    buckets = {}
+    for row in rows:
+        if row.created_at >= since:
+            start = since + (row.created_at - since) // step * step
+            buckets.setdefault(start, Counter())[getattr(row, attribute).value] += 1
+    return {start: dict(counts) for start, counts in buckets.items()}
+
+
+def _check_overview(overview, events, alerts, incidents, days, step):
+    """Assert an overview agrees with the stored rows."""
+    assert overview["alerts"]["total"] == len(alerts)
+    assert overview["alerts"]["by_status"] == _tally(alerts, "status")
+    assert overview["alerts"]["by_priority"] == _tally(alerts, "priority")
+    assert overview["incidents"]["total"] == len(incidents)
+    assert overview["incidents"]["by_status"] == _tally(incidents, "status")
+    assert overview["incidents"]["by_severity"] == _tally(incidents, "severity")
+    assert overview["events"]["total"] == len(events)
+    assert overview["events"]["by_source"] == _tally(events, "source")
+    assert overview["events"]["by_event_type"] == _tally(events, "event_type")
+
+    since = datetime.fromisoformat(overview["since"])
+    for name, rows, attribute in [
+        ("events", events, "source"),
+        ("alerts", alerts, "priority"),
+    ]:
+        histogram = overview["histograms"][name]
+        assert len(histogram) == timedelta(days=days) // step
+        expected = _histogram(rows, attribute, since, step)
+        for entry in histogram:
+            counts = expected.get(datetime.fromisoformat(entry["bucket"]), {})
+            assert entry["counts"] == counts
+            assert entry["total"] == sum(counts.values())
+
+
+def test_overview_counts_raw_tables():
+    """Counts and histograms from the raw tables match the stored rows."""
+    events, alerts, incidents = _rows()
+    with _settings(ANALYTICS_USE_ROLLUPS=False):
+        with _client(events + alerts + incidents) as client:
+            for days, bucket, step in [
+                (7, "day", timedelta(days=1)),
+                (2, "hour", timedelta(hours=1)),
+            ]:
+                response = client.get(f"/stats/overview?days={days}&bucket={bucket}")
+                assert response.status_code == 200
+                _check_overview(response.json(), events, alerts, incidents, days, step)
+
+
+def test_overview_counts_rollups():
+    """With ANALYTICS_USE_ROLLUPS the same overview comes from the rollups."""
+    events, alerts, incidents = _rows()
+    event_hours = Counter(
+        (
+            row.created_at.replace(minute=0, second=0, microsecond=0),
+            row.source,
+            row.event_type,
+        )
+        for row in events
+    )
+    alert_hours = Counter(
+        (row.created_at.replace(minute=0, second=0, microsecond=0), row.priority)
+        for row in alerts
+    )
+    rollups = [
+        EventCountHour(bucket=bucket, source=source, event_type=event_type, count=n)
+        for (bucket, source, event_type), n in event_hours.items()
+    ] + [
+        AlertCountHour(bucket=bucket, priority=priority, count=n)
+        for (bucket, priority), n in alert_hours.items()
+    ]
+    # Raw events the rollups do not count, so a raw read would be caught
+    extra = _rows(seed=1)[0]
+    with _settings(ANALYTICS_USE_ROLLUPS=True):
+        with _client(events + extra + alerts + incidents + rollups) as client:
+            overview = client.get("/stats/overview?days=7&bucket=day").json()
+    _check_overview(overview, events, alerts, incidents, 7, timedelta(days=1))
+
+
+def test_overview_cache_expires():
+    """A new event shows up once STATS_CACHE_TTL_SECONDS has passed."""
+    event = {"source": "custom", "event_type": "phishing", "raw_data": {}}
+    with _settings(ANALYTICS_USE_ROLLUPS=False, STATS_CACHE_TTL_SECONDS=0.5):
+        with queued_alert_tasks(), _client([]) as client:
+            assert client.get("/stats/overview").json()["events"]["total"] == 0
+            assert client.post("/events/bulk", json=[event]).status_code == 200
+
+            # Cached, per query
+            assert client.get("/stats/overview").json()["events"]["total"] == 0
+            other = client.get("/stats/overview?days=1&bucket=hour").json()
+            assert other["events"]["total"] == 1
+
+            time.sleep(0.6)
+            assert client.get("/stats/overview").json()["events"]["total"] == 1
+
+
+def test_overview_rejects_bad_parameters():
+    """Unknown buckets and out of range day counts are rejected with 400."""
+    with _settings(), _client([]) as client:
+        assert client.get("/stats/overview?bucket=week").status_code == 400
+        assert client.get("/stats/overview?days=0").status_code == 400
+        assert client.get("/stats/overview?days=91").status_code == 400
+
+
+if __name__ == "__main__":
+    tests = [
+        test_overview_counts_raw_tables,
+        test_overview_counts_rollups,
+        test_overview_cache_expires,
+        test_overview_rejects_bad_parameters,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,94 @@
+"""Tests for the streaming anomaly model in ml.streaming.
+
+Run directly or with pytest:
+    python scripts/test_streaming_model.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ml.streaming import HalfSpaceTrees, RunningScaler, StreamingAnomalyModel
+
+N_FEATURES = 4
+OUTLIER = np.full((1, N_FEATURES), 8.0)
+
+
+def _normal(n, seed=0):
+    """``n`` rows around the origin, one unit apart."""
+    return np.random.RandomState(seed).normal(size=(n, N_FEATURES))
+
+
+def test_running_scaler_matches_batch_statistics():
+    """Statistics folded in batches equal those of all rows at once."""
+    X = _normal(1000) * [1.0, 2.0, 5.0, 0.5] + [0.0, 3.0, -1.0, 10.0]
+    scaler = RunningScaler(N_FEATURES)
+    for batch in np.array_split(X, 7):
+        scaler.partial_fit(batch)
+
+    assert scaler.n_samples == 1000
+    assert np.allclose(scaler.mean_, X.mean(axis=0))
+    assert np.allclose(scaler.scale_, X.std(axis=0))
+    assert np.allclose(scaler.transform(X).std(axis=0), 1.0)
+
+
+def test_half_space_trees_separate_outlier():
+    """An outlier scores below every normal row once a window is complete."""
+    trees = HalfSpaceTrees(N_FEATURES, window_size=250)
+    trees.learn(_normal(249))
+    assert not trees.is_ready
+    trees.learn(_normal(1, seed=1))
+    assert trees.is_ready
+
+    normal_scores = trees.score_samples(_normal(200, seed=2))
+    outlier_score = trees.score_samples(OUTLIER)[0]
+    assert np.all((-1.0 <= normal_scores) & (normal_scores <= 0.0))
+    assert outlier_score < normal_scores.min()
+
+
+def test_model_ready_after_warm_up():
+    """The model is ready after one window plus the threshold's scores."""
+    model = StreamingAnomalyModel(N_FEATURES, window_size=250)
+    ready_at = None
+    for i, row in enumerate(_normal(400), start=1):
+        scores = model.score_and_learn(row)
+        assert (scores is None) == (i <= 250)
+        if ready_at is None and model.is_ready:
+            ready_at = i
+    assert ready_at == 250 + StreamingAnomalyModel.MIN_THRESHOLD_SCORES
+
+
+def test_model_flags_outlier():
+    """After warm-up an outlier falls below the threshold, most rows do not."""
+    model = StreamingAnomalyModel(N_FEATURES, contamination=0.1, window_size=250)
+    model.learn(_normal(250))
+    model.score_and_learn(_normal(250, seed=1))
+    assert model.is_ready
+
+    normal_flagged = model.score_and_learn(_normal(200, seed=2)) < model.offset_
+    outlier_score = model.score_and_learn(OUTLIER)[0]
+    assert outlier_score < model.offset_
+    assert normal_flagged.mean() < 0.25
+
+
+if __name__ == "__main__":
+    tests = [
+        test_running_scaler_matches_batch_statistics,
+        test_half_space_trees_separate_outlier,
+        test_model_ready_after_warm_up,
+        test_model_flags_outlier,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
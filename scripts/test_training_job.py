@@ -0,0 +1,223 @@
+"""Tests for the anomaly model training job and its API routes.
+
+The job runs in-process against a temporary database, with its progress
+updates recorded; the routes run on their own app with the job queue and
+result backend replaced by stand-ins.
+
+Run directly or with pytest:
+    python scripts/test_training_job.py
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.routes import ml as ml_routes
+from config.settings import settings
+from ml import tasks
+from ml.detector import RealTimeAnomalyDetector
+from models.base import Base
+from models.event import Event, EventSource, EventType
+from scripts.events_app import routes_client
+
+
+@contextmanager
+def _settings(**values):
+    """Override settings for the duration of a test."""
+    saved = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def _database(n):
+    """Point the job at a fresh database holding events 1..n."""
+    path = os.path.join(tempfile.mkdtemp(), "events.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    tasks.SessionLocal = sessionmaker(bind=engine)
+    db = tasks.SessionLocal()
+    db.add_all(
+        Event(
+            source=EventSource.CUSTOM,
+            event_type=list(EventType)[i % len(EventType)],
+            raw_data={},
+            timestamp=datetime(2024, 1, 1, i % 24).isoformat(),
+            source_ip=f"10.0.{i % 3}.{i % 50}",
+            user=f"user-{i % 4}",
+            description=f"event {i}",
+        )
+        for i in range(n)
+    )
+    db.commit()
+    db.close()
+
+
+@contextmanager
+def _job(mode="batch"):
+    """Run the job with its own detector, recording its progress updates."""
+    detector = RealTimeAnomalyDetector(
+        model_path=os.path.join(tempfile.mkdtemp(), "anomaly_detector.pkl"),
+        mode=mode,
+    )
+    updates = []
+    saved = tasks.get_ml_system
+    tasks.get_ml_system = lambda: SimpleNamespace(anomaly_detector=detector)
+    tasks.train_anomaly_model.update_state = lambda state, meta: updates.append(
+        (state, meta)
+    )
+    try:
+        yield detector, updates
+    finally:
+        tasks.get_ml_system = saved
+        del tasks.train_anomaly_model.update_state
+
+
+def test_job_trains_in_chunks():
+    """Progress is reported per chunk, then the fitted model is returned."""
+    _database(25)
+    with _settings(ML_TRAINING_CHUNK_SIZE=10), _job() as (detector, updates):
+        result = tasks.train_anomaly_model(list(range(1, 26)) + [5, 99])
+
+    assert result["status"] == "success"
+    assert (result["events_used"], result["events_missing"]) == (25, 1)
+    assert result["model"]["training_size"] == 25
+    assert set(result["timings"]) >= {"load_seconds", "fit_seconds", "total_seconds"}
+    assert detector.is_trained
+
+    assert all(state == "PROGRESS" for state, _ in updates)
+    assert [
+        (meta["stage"], meta["processed"], meta["total"]) for _, meta in updates
+    ] == [
+        ("loading", 10, 26),
+        ("loading", 20, 26),
+        ("loading", 25, 26),
+        ("fitting", 25, 26),
+    ]
+
+
+def test_job_needs_enough_events():
+    """Fewer stored events than MIN_TRAINING_EVENTS fail without a fit."""
+    _database(5)
+    with _job() as (detector, _):
+        result = tasks.train_anomaly_model(list(range(1, 20)))
+    assert result["status"] == "failed"
+    assert result["events_used"] == 5
+    assert not detector.is_trained
+
+
+def test_streaming_job_trains_nothing():
+    """In streaming mode the job says that nothing was trained."""
+    _database(20)
+    with _job(mode="streaming") as (detector, updates):
+        result = tasks.train_anomaly_model(list(range(1, 21)))
+    assert result["status"] == "failed"
+    assert "streaming" in result["error"]
+    assert "model" not in result and updates == []
+    assert detector.stream_model.scaler.n_samples == 0
+
+
+@contextmanager
+def _routes(job_states=None):
+    """Client for the ML routes, with a fake job queue and result backend."""
+    queued = []
+    saved = ml_routes.train_anomaly_model, ml_routes.AsyncResult
+
+    def delay(event_ids):
+        queued.append(event_ids)
+        return SimpleNamespace(id=f"job-{len(queued)}")
+
+    def async_result(job_id, app):
+        state, result = (job_states or {}).get(job_id, ("PENDING", None))
+        return SimpleNamespace(state=state, info=result, result=result)
+
+    ml_routes.train_anomaly_model = SimpleNamespace(delay=delay)
+    ml_routes.AsyncResult = async_result
+    try:
+        with routes_client({"/api/v1": ml_routes.router}) as client:
+            yield client, queued
+    finally:
+        ml_routes.train_anomaly_model, ml_routes.AsyncResult = saved
+
+
+def test_update_models_queues_a_job():
+    """Enough distinct event ids queue one job; too few are rejected."""
+    with _settings(ML_ANOMALY_MODE="batch"), _routes() as (client, queued):
+        response = client.post("/api/v1/ml/update-models", json=list(range(1, 13)))
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "job-1"
+        assert response.json()["events_requested"] == 12
+
+        response = client.post("/api/v1/ml/update-models", json=[1, 2, 2] * 4)
+        assert response.status_code == 400
+    assert queued == [list(range(1, 13))]
+
+
+def test_update_models_rejected_in_streaming_mode():
+    """Streaming mode has no model to train, so nothing is queued."""
+    with _settings(ML_ANOMALY_MODE="streaming"), _routes() as (client, queued):
+        response = client.post("/api/v1/ml/update-models", json=list(range(1, 13)))
+    assert response.status_code == 409
+    assert queued == []
+
+
+def test_job_states():
+    """Each job state carries its progress, result or error."""
+    progress = {"stage": "loading", "processed": 10, "total": 40}
+    result = {"status": "success", "events_used": 40}
+    states = {
+        "running": ("PROGRESS", progress),
+        "done": ("SUCCESS", result),
+        "crashed": ("FAILURE", RuntimeError("worker lost")),
+    }
+    with _routes(states) as (client, _):
+        jobs = {
+            job_id: client.get(f"/api/v1/ml/jobs/{job_id}").json()
+            for job_id in ["running", "done", "crashed", "unknown"]
+        }
+    assert jobs["running"] == {
+        "job_id": "running",
+        "state": "PROGRESS",
+        "progress": progress,
+    }
+    assert jobs["done"] == {"job_id": "done", "state": "SUCCESS", "result": result}
+    assert jobs["crashed"] == {
+        "job_id": "crashed",
+        "state": "FAILURE",
+        "error": "worker lost",
+    }
+    assert jobs["unknown"] == {"job_id": "unknown", "state": "PENDING"}
+
+
+if __name__ == "__main__":
+    tests = [
+        test_job_trains_in_chunks,
+        test_job_needs_enough_events,
+        test_streaming_job_trains_nothing,
+        test_update_models_queues_a_job,
+        test_update_models_rejected_in_streaming_mode,
+        test_job_states,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -8,7 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import json
 
 from alerts.prioritizer import AlertPrioritizer
-from alerts.tasks import _get_event_context
+from alerts.tasks import get_event_contexts
 from config.database import SessionLocal
 from models.alert import Alert
 from models.event import Event
@@ -29,11 +29,18 @@ def train_model():
         # Use existing alerts if available
         if alerts and len(alerts) > 10:
             print(f"Using {len(alerts)} existing alerts for training...")
+            event_ids = [alert.event_id for alert in alerts if alert.event_id]
+            alert_events = db.query(Event).filter(Event.id.in_(event_ids)).all()
+            events_by_id = {
+                event.id: (event, context)
+                for event, context in zip(
+                    alert_events, get_event_contexts(db, alert_events)
+                )
+            }
             for alert in alerts:
                 if alert.event_id:
-                    event = db.query(Event).filter(Event.id == alert.event_id).first()
+                    event, context = events_by_id.get(alert.event_id, (None, None))
                     if event:
-                        context = _get_event_context(db, event)
                         training_data.append(
                             {
                                 "event_type": event.event_type.value,
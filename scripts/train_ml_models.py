@@ -5,7 +5,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from alerts.tasks import _get_event_context
+from alerts.tasks import get_event_contexts
 from config.database import SessionLocal
 from ml.detector import RealTimeMLSystem
 from models.event import Event
@@ -68,12 +68,7 @@ def train_ml_models():
 
         # Get contexts for all events
         print("Preparing training data...")
-        contexts = []
-        for i, event in enumerate(events):
-            context = _get_event_context(db, event)
-            contexts.append(context)
-            if (i + 1) % 20 == 0:
-                print(f"  Processed {i + 1}/{len(events)} events...")
+        contexts = get_event_contexts(db, events)
 
         print(f"✅ Prepared {len(contexts)} event contexts")
         print()
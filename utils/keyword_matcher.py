@@ -0,0 +1,115 @@
+"""Multi-keyword matching shared by alert scoring and classification."""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """Counts keyword hits for many named keyword groups in one pass.
+
+    All groups are compiled into a single Aho-Corasick automaton, so a text is
+    scanned once no matter how many groups or keywords there are. Matching is
+    by substring, like ``keyword in text``. The automaton is rebuilt lazily
+    whenever a group changes, and recent results are cached so callers that
+    score the same text share one scan. Without pyahocorasick, each distinct
+    keyword is searched once with ``in``.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        """Initialize the matcher."""
+        self._groups: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._automaton = None
+        self._keyword_groups: Dict[str, list] = {}
+        self._group_names: tuple = ()
+        self._generation = 0
+        self._dirty = True
+        self._cache: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self.cache_size = cache_size
+
+    def set_group(self, name: str, keywords: Iterable[str]):
+        """Register or update a keyword group."""
+        keywords = tuple(keywords)
+        with self._lock:
+            if self._groups.get(name) != keywords:
+                self._groups[name] = keywords
+                self._dirty = True
+
+    def sync_groups(self, prefix: str, groups: Dict[str, Iterable[str]]):
+        """Make the groups under ``prefix`` exactly match ``groups``."""
+        wanted = {f"{prefix}{name}": tuple(kws) for name, kws in groups.items()}
+        with self._lock:
+            current = {n: k for n, k in self._groups.items() if n.startswith(prefix)}
+            if current != wanted:
+                for name in current:
+                    del self._groups[name]
+                self._groups.update(wanted)
+                self._dirty = True
+
+    def match(self, text: str) -> Dict[str, int]:
+        """Count the distinct keywords of every group found in ``text``."""
+        with self._lock:
+            if self._dirty:
+                self._build()
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return dict(cached)
+            automaton = self._automaton
+            keyword_groups = self._keyword_groups
+            counts = dict.fromkeys(self._group_names, 0)
+            generation = self._generation
+
+        if text:
+            if automaton is not None:
+                found = {keyword for _, keyword in automaton.iter(text)}
+            else:
+                found = {keyword for keyword in keyword_groups if keyword in text}
+            for keyword in found:
+                for name in keyword_groups[keyword]:
+                    counts[name] += 1
+
+        with self._lock:
+            if generation == self._generation:
+                self._cache[text] = counts
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return dict(counts)
+
+    def _build(self):
+        """Compile all groups. Caller must hold the lock."""
+        keyword_groups: Dict[str, list] = {}
+        for name, keywords in self._groups.items():
+            for keyword in dict.fromkeys(keywords):
+                keyword_groups.setdefault(keyword, []).append(name)
+
+        automaton = None
+        if AHOCORASICK_AVAILABLE and keyword_groups:
+            automaton = ahocorasick.Automaton()
+            for keyword in keyword_groups:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+
+        self._automaton = automaton
+        self._keyword_groups = keyword_groups
+        self._group_names = tuple(self._groups)
+        self._generation += 1
+        self._cache.clear()
+        self._dirty = False
+
+
+# Global shared instance
+_keyword_matcher = KeywordMatcher()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Get the process-wide keyword matcher."""
+    return _keyword_matcher